@@ -0,0 +1,203 @@
+from collections import OrderedDict, deque
+from io import BytesIO
+from urllib.parse import quote
+
+import requests
+from kivy.core.image import Image as CoreImage
+from kivy.graphics import ClearBuffers, ClearColor, Fbo, Rectangle
+from kivy.lang import Builder
+from kivy.properties import ListProperty, ObjectProperty, StringProperty
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+
+from app.ui.tasks import get_runtime, POOL_IO
+
+Builder.load_file('src/app/ui/kv/cover_grid.kv')
+
+ATLAS_SIZE = 2048
+ATLAS_PAGES = 4
+COVER_SIZE = (128, 192)
+MAX_COVER_DOWNLOADS = 4
+COVER_TIMEOUT = 10
+
+
+def cover_url(thumbnail_url: str) -> str:
+    return quote(thumbnail_url.split(' ')[0], safe=':/?=&') if thumbnail_url else ''
+
+
+def download_cover(url: str) -> bytes:
+    """Fetch the raw bytes of a cover image"""
+    response = requests.get(url, timeout=COVER_TIMEOUT)
+    response.raise_for_status()
+    return response.content
+
+
+def image_ext(data: bytes) -> str:
+    if data.startswith(b'\x89PNG'):
+        return 'png'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    if data.startswith(b'GIF'):
+        return 'gif'
+    return 'jpg'
+
+
+class CoverAtlas:
+    """Packs covers into a few large shared textures
+
+    Each cover is scaled into a fixed slot of an atlas page on the GPU and
+    shown as a region of that page, so visible cells share a handful of
+    textures instead of binding one each. The least recently used slot is
+    reused once every page is full.
+    """
+
+    def __init__(self, pages: int = ATLAS_PAGES, size: int = ATLAS_SIZE, cell=COVER_SIZE):
+        self.cell = cell
+        self.columns = size // cell[0]
+        self.pages = []
+        for _ in range(pages):
+            fbo = Fbo(size=(size, size))
+            with fbo:
+                ClearColor(0, 0, 0, 0)
+                ClearBuffers()
+            self.pages.append(fbo)
+        slots_per_page = self.columns * (size // cell[1])
+        self.free = deque((page, slot) for page in range(pages) for slot in range(slots_per_page))
+        self.slots = OrderedDict()
+
+    def __contains__(self, url):
+        return url in self.slots
+
+    def get(self, url):
+        """Region of the atlas holding a cover, marking it as recently used"""
+        entry = self.slots.get(url)
+        if entry is None:
+            return None
+        self.slots.move_to_end(url)
+        return entry[3]
+
+    def add(self, url, texture):
+        """Copy a cover into a free slot and return its region"""
+        if not self.free:
+            _, (page, slot, rect, _) = self.slots.popitem(last=False)
+            self.pages[page].remove(rect)
+            self.free.append((page, slot))
+
+        page, slot = self.free.popleft()
+        width, height = self.cell
+        x = (slot % self.columns) * width
+        y = (slot // self.columns) * height
+
+        fbo = self.pages[page]
+        rect = Rectangle(texture=texture, pos=(x, y), size=self.cell)
+        fbo.add(rect)
+        fbo.draw()
+
+        region = fbo.texture.get_region(x, y, width, height)
+        self.slots[url] = (page, slot, rect, region)
+        return region
+
+
+class CoverCell(RecycleDataViewBehavior, ButtonBehavior, BoxLayout):
+    title = StringProperty('')
+    thumbnail_url = StringProperty('')
+    status_color = ListProperty([0.3, 0.3, 0.3, 1])
+    cover = ObjectProperty(None, allownone=True)
+    card = ObjectProperty(None, allownone=True)
+
+    def refresh_view_attrs(self, rv, index, data):
+        super().refresh_view_attrs(rv, index, data)
+        self.cover = rv.request_cover(self)
+
+    def on_release(self):
+        if self.card:
+            self.card.open_details()
+
+
+class CoverGrid(RecycleView):
+    """Grid of covers where only the visible cells exist
+
+    Covers are downloaded a few at a time in the order cells come into
+    view, and requests for cells that scrolled away are dropped.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.atlas = CoverAtlas()
+        self.queue = deque()
+        self.waiting = {}
+        self.requested = {}
+        self.in_flight = set()
+        self.failed = set()
+
+    def set_cards(self, cards):
+        self.data = [
+            {
+                'title': card.title,
+                'thumbnail_url': cover_url(card.thumbnail_url),
+                'status_color': list(card.status_color),
+                'card': card
+            }
+            for card in cards
+        ]
+
+    def request_cover(self, cell):
+        """Cover texture for a cell, queueing a download if it is not loaded"""
+        previous = self.requested.pop(cell, None)
+        if previous in self.waiting:
+            self.waiting[previous].discard(cell)
+
+        url = cell.thumbnail_url
+        if not url or url in self.failed:
+            return None
+        region = self.atlas.get(url)
+        if region is not None:
+            return region
+
+        if url not in self.waiting and url not in self.in_flight:
+            self.queue.append(url)
+        self.waiting.setdefault(url, set()).add(cell)
+        self.requested[cell] = url
+        self._pump()
+        return None
+
+    def _pump(self):
+        while self.queue and len(self.in_flight) < MAX_COVER_DOWNLOADS:
+            url = self.queue.popleft()
+            if not self.waiting.get(url):
+                self.waiting.pop(url, None)
+                continue
+            self.in_flight.add(url)
+            get_runtime().run(
+                download_cover,
+                url,
+                pool=POOL_IO,
+                owner=self,
+                on_success=lambda data, url=url: self._loaded(url, data),
+                on_error=lambda error, url=url: self._failed(url, error)
+            )
+
+    def _loaded(self, url, data):
+        self.in_flight.discard(url)
+        cells = self.waiting.pop(url, set())
+        try:
+            texture = CoreImage(BytesIO(data), ext=image_ext(data)).texture
+            region = self.atlas.add(url, texture)
+        except Exception as e:
+            self._failed(url, e)
+            return
+
+        for cell in cells:
+            self.requested.pop(cell, None)
+            if cell.thumbnail_url == url:
+                cell.cover = region
+        self._pump()
+
+    def _failed(self, url, error):
+        print(f"Failed to load cover {url}: {str(error)}")
+        self.in_flight.discard(url)
+        self.waiting.pop(url, None)
+        self.failed.add(url)
+        self._pump()
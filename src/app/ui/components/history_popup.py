@@ -0,0 +1,58 @@
+import time
+from kivy.uix.popup import Popup
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.gridlayout import GridLayout
+from app.ui.tasks import get_runtime
+
+
+class HistoryPopup(Popup):
+    """Saved versions of the loaded backup, newest first"""
+
+    def __init__(self, history, on_restore, **kwargs):
+        super().__init__(**kwargs)
+        self.history = history
+        self.on_restore = on_restore
+        self.title = 'Backup History'
+        self.size_hint = (0.6, 0.8)
+
+        self.version_list = GridLayout(cols=1, spacing=5, size_hint_y=None)
+        self.version_list.bind(minimum_height=self.version_list.setter('height'))
+        scroll = ScrollView()
+        scroll.add_widget(self.version_list)
+
+        content = BoxLayout(orientation='vertical', spacing=10, padding=10)
+        content.add_widget(scroll)
+        close_btn = Button(text='Close', size_hint_y=None, height=40)
+        close_btn.bind(on_release=self.dismiss)
+        content.add_widget(close_btn)
+        self.content = content
+
+        self.version_list.add_widget(Label(text='Loading...', size_hint_y=None, height=40))
+        get_runtime().run(
+            history.versions,
+            owner=self,
+            on_success=self.show_versions,
+            on_error=lambda e: print(f"Failed to list backup versions: {str(e)}")
+        )
+
+    def show_versions(self, versions):
+        self.version_list.clear_widgets()
+        if not versions:
+            self.version_list.add_widget(Label(text='No saved versions', size_hint_y=None, height=40))
+            return
+
+        for version in versions:
+            row = BoxLayout(orientation='horizontal', size_hint_y=None, height=40, spacing=10)
+            created = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(version['created']))
+            row.add_widget(Label(text=f"{created}  ({version['size'] / 1024 / 1024:.1f} MB)", size_hint_x=0.75))
+            restore_btn = Button(text='Restore', size_hint_x=0.25)
+            restore_btn.bind(on_release=lambda btn, version_id=version['id']: self.restore(version_id))
+            row.add_widget(restore_btn)
+            self.version_list.add_widget(row)
+
+    def restore(self, version_id):
+        self.on_restore(version_id)
+        self.dismiss()
@@ -57,11 +57,14 @@ class MangaCard(BoxLayout):
 
     def on_touch_down(self, touch):
         if self.collide_point(*touch.pos):
-            popup = MangaDetailsPopup(self, self.tracker, self.mal_id)
-            popup.open()
+            self.open_details()
             return True
         return super().on_touch_down(touch)
 
+    def open_details(self):
+        popup = MangaDetailsPopup(self, self.tracker, self.mal_id)
+        popup.open()
+
     def preload_image(self):
         if self.thumbnail_url:
             clean_url = self.thumbnail_url.split(' ')[0]
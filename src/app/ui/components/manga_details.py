@@ -11,6 +11,9 @@ from kivy.properties import StringProperty
 from kivy.graphics import Color, Rectangle
 from kivy.uix.image import AsyncImage
 from kivy.uix.gridlayout import GridLayout
+from app.ui.tasks import get_runtime
+
+DETAILED_RESULTS = 3
 
 class MangaDetailsPopup(Popup):
     search_query = StringProperty('')
@@ -138,158 +141,169 @@ class MangaDetailsPopup(Popup):
         return cover_box
 
     def search_mal(self, query):
-        try:
-            self.search_query = query
-            results = self.tracker.search_manga(query)
-            self.results_list.clear_widgets()
-
-            if not results or 'data' not in results:
-                self.results_list.add_widget(
-                    Label(
-                        text='No results found',
-                        size_hint_y=None,
-                        height=40
-                    )
-                )
-                return
+        self.search_query = query
+        get_runtime().fetch(
+            self.tracker,
+            'search_manga',
+            query,
+            owner=self,
+            on_success=self.show_results,
+            on_error=self.show_search_error
+        )
 
-            for i, manga in enumerate(results['data']):
-                node = manga['node']
-                is_detailed = i < 3
+    def show_results(self, results):
+        self.results_list.clear_widgets()
 
-                result_box = BoxLayout(
-                    orientation='horizontal',
+        if not results.items:
+            self.results_list.add_widget(
+                Label(
+                    text='No results found',
                     size_hint_y=None,
-                    height=180 if is_detailed else 80,
-                    spacing=15,
-                    padding=[20, 10]
+                    height=40
                 )
+            )
+            return
+
+        for i, entry in enumerate(results.items):
+            node = entry.manga
+            is_detailed = i < DETAILED_RESULTS
+
+            result_box = BoxLayout(
+                orientation='horizontal',
+                size_hint_y=None,
+                height=180 if is_detailed else 80,
+                spacing=15,
+                padding=[20, 10]
+            )
 
-                with result_box.canvas.before:
-                    Color(0.15, 0.15, 0.15, 1)
-                    Rectangle(pos=result_box.pos, size=result_box.size)
+            with result_box.canvas.before:
+                Color(0.15, 0.15, 0.15, 1)
+                Rectangle(pos=result_box.pos, size=result_box.size)
 
-                content_box = BoxLayout(
-                    orientation='vertical',
-                    size_hint_x=0.85,
-                    spacing=5
-                )
-
-                title = node['title']
-                if len(title) > 60:
-                    title = title[:57] + '...'
+            content_box = BoxLayout(
+                orientation='vertical',
+                size_hint_x=0.85,
+                spacing=5
+            )
 
-                title_label = Label(
-                    text=title,
+            title = node.title
+            if len(title) > 60:
+                title = title[:57] + '...'
+
+            title_label = Label(
+                text=title,
+                size_hint_y=None,
+                height=30,
+                halign='left',
+                valign='middle',
+                bold=True,
+                font_size='16sp',
+                color=(0.95, 0.95, 0.95, 1),
+                text_size=(None, 30)
+            )
+            content_box.add_widget(title_label)
+
+            if is_detailed:
+                get_runtime().fetch(
+                    self.tracker,
+                    'get_manga_details',
+                    node.id,
+                    owner=self,
+                    on_success=lambda info, box=content_box: self.show_details(box, info),
+                    on_error=lambda e, manga_id=node.id: print(f"Failed to get details for manga {manga_id}: {e}")
+                )
+            else:
+                basic_info_label = Label(
+                    text="",
+                    color=(0.7, 0.7, 0.7, 1),
+                    font_size='14sp',
+                    halign='left',
                     size_hint_y=None,
                     height=30,
-                    halign='left',
-                    valign='middle',
-                    bold=True,
-                    font_size='16sp',
-                    color=(0.95, 0.95, 0.95, 1),
                     text_size=(None, 30)
                 )
-                content_box.add_widget(title_label)
-
-                if is_detailed:
-                    try:
-                        detailed_info = self.tracker.get_manga_details(node['id'])
-
-                        stats_box = BoxLayout(
-                            orientation='horizontal',
-                            size_hint_y=None,
-                            height=30,
-                            spacing=15
-                        )
-
-                        stats = [
-                            (f"Ch: {detailed_info.get('num_chapters', '?')}", (0.8, 0.8, 0.8, 1)),
-                            (f"Score: {detailed_info.get('mean', 'N/A')}", (1, 0.8, 0.2, 1)),
-                            (f"Year: {detailed_info.get('start_date', '')[:4] if detailed_info.get('start_date') else 'N/A'}", (0.8, 0.8, 0.8, 1)),
-                            (f"Status: {detailed_info.get('status', 'Unknown').replace('_', ' ').title()}", (0.6, 0.8, 1, 1))
-                        ]
-
-                        for text, color in stats:
-                            stat_label = Label(
-                                text=text,
-                                color=color,
-                                font_size='14sp',
-                                size_hint_x=0.25,
-                                halign='left',
-                                text_size=(None, 30)
-                            )
-                            stats_box.add_widget(stat_label)
-
-                        content_box.add_widget(stats_box)
-
-                        if detailed_info.get('synopsis'):
-                            synopsis = detailed_info['synopsis']
-                            if len(synopsis) > 150:
-                                synopsis = synopsis[:150] + '...'
-
-                            synopsis_label = Label(
-                                text=synopsis,
-                                size_hint_y=None,
-                                height=80,
-                                halign='left',
-                                valign='top',
-                                font_size='13sp',
-                                color=(0.7, 0.7, 0.7, 1),
-                                text_size=(800, 80)
-                            )
-                            content_box.add_widget(synopsis_label)
-
-                    except Exception as e:
-                        print(f"Failed to get details for manga {node['id']}: {e}")
-
-                else:
-                    basic_info_label = Label(
-                        text="",
-                        color=(0.7, 0.7, 0.7, 1),
-                        font_size='14sp',
-                        halign='left',
-                        size_hint_y=None,
-                        height=30,
-                        text_size=(None, 30)
-                    )
-                    content_box.add_widget(basic_info_label)
-
-                result_box.add_widget(content_box)
-
-                button_box = BoxLayout(
-                    orientation='vertical',
-                    size_hint_x=0.15,
-                    padding=[0, (result_box.height - 40) / 2]
-                )
+                content_box.add_widget(basic_info_label)
 
-                select_btn = Button(
-                    text='Select',
-                    size_hint_y=None,
-                    height=40,
-                    background_normal='',
-                    background_color=(0.2, 0.6, 0.9, 1),
-                    color=(1, 1, 1, 1),
-                    font_size='15sp'
-                )
-                select_btn.bind(
-                    on_release=lambda btn, m=node: self.select_manga(m)
-                )
-                button_box.add_widget(select_btn)
-                result_box.add_widget(button_box)
+            result_box.add_widget(content_box)
 
-                self.results_list.add_widget(result_box)
-                self.results_list.add_widget(Widget(size_hint_y=None, height=10))
+            button_box = BoxLayout(
+                orientation='vertical',
+                size_hint_x=0.15,
+                padding=[0, (result_box.height - 40) / 2]
+            )
 
-        except Exception as e:
-            self.results_list.clear_widgets()
-            self.results_list.add_widget(
-                Label(
-                    text=f'Search failed: {str(e)}',
-                    size_hint_y=None,
-                    height=40
-                )
+            select_btn = Button(
+                text='Select',
+                size_hint_y=None,
+                height=40,
+                background_normal='',
+                background_color=(0.2, 0.6, 0.9, 1),
+                color=(1, 1, 1, 1),
+                font_size='15sp'
+            )
+            select_btn.bind(
+                on_release=lambda btn, m=node: self.select_manga(m)
+            )
+            button_box.add_widget(select_btn)
+            result_box.add_widget(button_box)
+
+            self.results_list.add_widget(result_box)
+            self.results_list.add_widget(Widget(size_hint_y=None, height=10))
+
+    def show_details(self, content_box, detailed_info):
+        stats_box = BoxLayout(
+            orientation='horizontal',
+            size_hint_y=None,
+            height=30,
+            spacing=15
+        )
+
+        stats = [
+            (f"Ch: {detailed_info.num_chapters or '?'}", (0.8, 0.8, 0.8, 1)),
+            (f"Score: {detailed_info.mean or 'N/A'}", (1, 0.8, 0.2, 1)),
+            (f"Year: {detailed_info.start_date[:4] if detailed_info.start_date else 'N/A'}", (0.8, 0.8, 0.8, 1)),
+            (f"Status: {(detailed_info.status or 'Unknown').replace('_', ' ').title()}", (0.6, 0.8, 1, 1))
+        ]
+
+        for text, color in stats:
+            stat_label = Label(
+                text=text,
+                color=color,
+                font_size='14sp',
+                size_hint_x=0.25,
+                halign='left',
+                text_size=(None, 30)
+            )
+            stats_box.add_widget(stat_label)
+
+        content_box.add_widget(stats_box)
+
+        if detailed_info.synopsis:
+            synopsis = detailed_info.synopsis
+            if len(synopsis) > 150:
+                synopsis = synopsis[:150] + '...'
+
+            synopsis_label = Label(
+                text=synopsis,
+                size_hint_y=None,
+                height=80,
+                halign='left',
+                valign='top',
+                font_size='13sp',
+                color=(0.7, 0.7, 0.7, 1),
+                text_size=(800, 80)
             )
+            content_box.add_widget(synopsis_label)
+
+    def show_search_error(self, error):
+        self.results_list.clear_widgets()
+        self.results_list.add_widget(
+            Label(
+                text=f'Search failed: {str(error)}',
+                size_hint_y=None,
+                height=40
+            )
+        )
 
     def show_tracked_manga(self):
         content = BoxLayout(orientation='vertical', spacing=15, padding=[25, 25])
@@ -489,9 +503,9 @@ class MangaDetailsPopup(Popup):
 
     def select_manga(self, manga_data):
         try:
-            manga_id = manga_data['id']
+            manga_id = manga_data.id
             self.manga_id = manga_id
-            self.tracker.add_manga(manga_id)
+            App.get_running_app().root.outbox.add(manga_id)
             self.manga_card.tracking_status = "Plan to Read"
             self.manga_card.mal_id = manga_id
 
@@ -509,26 +523,32 @@ class MangaDetailsPopup(Popup):
 
     def save_changes(self, status, chapters, score):
         try:
-            manga_details = self.tracker.get_manga_details(self.manga_id)
-            total_chapters = manga_details.get('num_chapters', '?')
-
-            self.tracker.update_manga_list_status(
-                manga_id=self.manga_id,
+            tracker_importer = App.get_running_app().root
+            entries = tracker_importer.update_json_data(
+                self.manga_id,
+                status,
+                chapters,
+                score
+            )
+            tracker_importer.push_edit(
+                self.manga_id,
+                entries,
                 status=status.lower().replace(' ', '_'),
                 num_chapters_read=int(chapters) if chapters else None,
                 score=int(score) if score != 'Score' else None
             )
 
-            self.manga_card.tracking_status = status
-            self.manga_card.chapter_text = f"{chapters}/{total_chapters}"
-
-            app = App.get_running_app()
-            tracker_importer = app.root
-            tracker_importer.update_json_data(
+            manga_card = self.manga_card
+            manga_card.tracking_status = status
+            manga_card.chapter_text = f"{chapters}/{manga_card.chapter_text.split('/')[-1]}"
+            get_runtime().submit(
+                self.tracker,
+                self.tracker.get_manga_details,
                 self.manga_id,
-                status,
-                chapters,
-                score
+                owner=manga_card,
+                on_success=lambda details: setattr(
+                    manga_card, 'chapter_text', f"{chapters}/{details.num_chapters or '?'}"
+                )
             )
 
             self.dismiss()
@@ -10,18 +10,19 @@ from kivy.uix.progressbar import ProgressBar
 from kivy.uix.behaviors import ButtonBehavior
 from kivy.graphics import Color, Rectangle
 from kivy.app import App
-from concurrent.futures import ThreadPoolExecutor
-import asyncio
-from difflib import SequenceMatcher
 from typing import Dict
-from fuzzywuzzy import fuzz
-from fuzzywuzzy import process
 
+from core.library import (
+    find_duplicate_groups, get_tracking, read_chapters, BulkJob, item_key,
+    ITEM_PENDING, ITEM_DONE, ITEM_FAILED
+)
+from core.matching import QueryPlanner
+from core.library.sync import TrackRequest, plan_tracking, apply_tracking, fetch_remote_list
 from core.trackers.base import BaseTracker
-
-BATCH_SIZE = 1
-WORKER_COUNT = 1
-SCHEDULE_INTERVAL = 2
+from core.trackers.models import Manga
+from core.trackers.cache import get_request_cache
+from core.trackers.scheduler import PRIORITY_BULK
+from app.ui.tasks import get_runtime, POOL_BACKGROUND
 
 class MatchSearchPopup(Popup):
     def __init__(self, title, tracker, on_select, highlight_node=None, **kwargs):
@@ -58,44 +59,52 @@ class MatchSearchPopup(Popup):
         return content
 
     def search_mal(self, title):
-        try:
-            results = self.tracker.search_manga(title)
-            self.results_list.clear_widgets()
-
-            if not results or 'data' not in results or not results['data']:
-                self.results_list.add_widget(Label(
-                    text='No results found',
-                    size_hint_y=None,
-                    height=40
-                ))
-                return
-
-            for manga in results['data']:
-                node = manga['node']
-                is_highlighted = (self.highlight_node and
-                                self.highlight_node.get('id') == node.get('id'))
-
-                result_btn = Button(
-                    text=node['title'],
-                    size_hint_y=None,
-                    height=50,
-                    background_normal='',
-                    background_color=(0.6, 0.2, 0.8, 1) if is_highlighted else (0.2, 0.2, 0.2, 1),
-                    halign='left'
-                )
-                if is_highlighted:
-                    result_btn.text = f"✓ {node['title']} (Fuzzy Matched)"
+        get_runtime().fetch(
+            self.tracker,
+            'search_manga',
+            title,
+            owner=self,
+            on_success=self.show_results,
+            on_error=self.show_error
+        )
 
-                result_btn.bind(on_release=lambda btn, n=node: self.select_result(n))
-                self.results_list.add_widget(result_btn)
+    def show_results(self, results):
+        self.results_list.clear_widgets()
 
-        except Exception as e:
-            self.results_list.clear_widgets()
+        if not results.items:
             self.results_list.add_widget(Label(
-                text=f'Search failed: {str(e)}',
+                text='No results found',
                 size_hint_y=None,
                 height=40
             ))
+            return
+
+        for entry in results.items:
+            node = entry.manga
+            is_highlighted = (self.highlight_node and
+                            self.highlight_node.id == node.id)
+
+            result_btn = Button(
+                text=node.title,
+                size_hint_y=None,
+                height=50,
+                background_normal='',
+                background_color=(0.6, 0.2, 0.8, 1) if is_highlighted else (0.2, 0.2, 0.2, 1),
+                halign='left'
+            )
+            if is_highlighted:
+                result_btn.text = f"✓ {node.title} (Fuzzy Matched)"
+
+            result_btn.bind(on_release=lambda btn, n=node: self.select_result(n))
+            self.results_list.add_widget(result_btn)
+
+    def show_error(self, error):
+        self.results_list.clear_widgets()
+        self.results_list.add_widget(Label(
+            text=f'Search failed: {str(error)}',
+            size_hint_y=None,
+            height=40
+        ))
 
     def select_result(self, node):
         self.on_select(node)
@@ -129,10 +138,14 @@ class MangaMatchItem(ClickableMangaItem):
     selected = BooleanProperty(False)
     matched = BooleanProperty(False)
 
-    def __init__(self, title, main_popup, **kwargs):
+    def __init__(self, title, main_popup, entries=None, read_chapters=0, **kwargs):
         super().__init__(**kwargs)
         self.title = title
         self.main_popup = main_popup
+        self.entries = entries or []
+        self.read_chapters = read_chapters
+        self.linked = False
+        self.key = item_key(self.entries[0]) if self.entries else title
         self.orientation = 'horizontal'
         self.size_hint_y=None
         self.height = 40
@@ -144,7 +157,7 @@ class MangaMatchItem(ClickableMangaItem):
 
         self.add_widget(self.checkbox)
         title_label = Label(
-            text=self.title,
+            text=self.title if len(self.entries) < 2 else f"{self.title} (+{len(self.entries) - 1} duplicates)",
             shorten=True,
             shorten_from='right',
             size_hint_x=0.8,
@@ -170,6 +183,15 @@ class MangaMatchItem(ClickableMangaItem):
     def on_checkbox(self, instance, value):
         self.selected = value
 
+    def alternative_titles(self):
+        """Titles of the duplicate entries grouped under this item"""
+        titles = []
+        for manga in self.entries:
+            title = manga.get('title')
+            if title and title != self.title and title not in titles:
+                titles.append(title)
+        return titles
+
     def set_status(self, status, text=None):
         if text is None:
             text = status.replace('_', ' ').title()
@@ -200,29 +222,37 @@ class MangaMatchItem(ClickableMangaItem):
             )
         popup.open()
 
-    def on_result_selected(self, node):
+    def on_result_selected(self, node, select=True):
         try:
-            self.mal_id = node['id']
+            self.mal_id = node.id
             self.fuzzy_match_info = None
             self.set_status('matched', 'Matched')
             self.matched = True
-            self.checkbox.active = True
+            self.checkbox.active = select
         except Exception as e:
             print(f"Error selecting result: {e}")
             self.set_status('error', 'Error')
 
 class MangaMatchingPopup(Popup):
-    def __init__(self, tracker, manga_entries, **kwargs):
+    def __init__(self, tracker, manga_entries, source=None, candidates=None, **kwargs):
         super().__init__(**kwargs)
         self.tracker = tracker
         self.manga_entries = manga_entries
+        self.candidates = candidates
         self.title = 'Manga Matching'
         self.size_hint = (0.9, 0.9)
         self.manga_items = []
+        self.match_queue = []
         self.current_match_index = 0
-        self.executor = ThreadPoolExecutor(max_workers=WORKER_COUNT)
+        self.tracking = False
+
+        self.planner = QueryPlanner(self.search_title)
+        self.match_job = BulkJob('match', source or 'library')
+        self.track_job = BulkJob('track', source or 'library')
 
         self.content = self.build_content()
+        self.bind(on_dismiss=lambda *args: self.pause_jobs())
+        self.load_items()
 
     def build_content(self):
         content = BoxLayout(orientation='vertical', spacing=10, padding=10)
@@ -233,24 +263,51 @@ class MangaMatchingPopup(Popup):
             spacing=10
         )
 
-        match_btn = Button(
+        self.match_btn = Button(
             text='Auto Match',
-            size_hint_x=0.5,
+            size_hint_x=0.25,
             background_normal='',
             background_color=(0.2, 0.6, 0.9, 1)
         )
-        match_btn.bind(on_release=self.start_matching)
+        self.match_btn.bind(on_release=self.start_matching)
 
-        track_btn = Button(
+        self.track_btn = Button(
             text='Track Selected',
-            size_hint_x=0.5,
+            size_hint_x=0.25,
             background_normal='',
             background_color=(0.2, 0.8, 0.2, 1)
         )
-        track_btn.bind(on_release=self.track_selected)
+        self.track_btn.bind(on_release=self.track_selected)
 
-        buttons_box.add_widget(match_btn)
-        buttons_box.add_widget(track_btn)
+        pause_btn = Button(
+            text='Pause',
+            size_hint_x=0.15,
+            background_normal='',
+            background_color=(0.8, 0.6, 0.2, 1)
+        )
+        pause_btn.bind(on_release=lambda *args: self.pause_jobs())
+
+        cancel_btn = Button(
+            text='Cancel',
+            size_hint_x=0.15,
+            background_normal='',
+            background_color=(0.8, 0.2, 0.2, 1)
+        )
+        cancel_btn.bind(on_release=lambda *args: self.cancel_jobs())
+
+        export_btn = Button(
+            text='Export XML',
+            size_hint_x=0.2,
+            background_normal='',
+            background_color=(0.4, 0.4, 0.6, 1)
+        )
+        export_btn.bind(on_release=self.export_selected)
+
+        buttons_box.add_widget(self.match_btn)
+        buttons_box.add_widget(self.track_btn)
+        buttons_box.add_widget(export_btn)
+        buttons_box.add_widget(pause_btn)
+        buttons_box.add_widget(cancel_btn)
         content.add_widget(buttons_box)
 
         self.progress_box = BoxLayout(
@@ -287,109 +344,186 @@ class MangaMatchingPopup(Popup):
         )
         self.manga_list.bind(minimum_height=self.manga_list.setter('height'))
 
-        for manga in self.manga_entries.get('backupManga', []):
-            if not any(t.get('syncId') == 1 for t in manga.get('tracking', [])):
-                item = MangaMatchItem(
-                    title=manga.get('title', 'Unknown'),
-                    main_popup=self
-                )
-                self.manga_items.append(item)
-                self.manga_list.add_widget(item)
-
         scroll.add_widget(self.manga_list)
         content.add_widget(scroll)
 
         return content
 
-    async def match_manga_parallel(self, manga_items):
-        tasks = []
-        for item in manga_items:
-            task = asyncio.get_event_loop().run_in_executor(
-                self.executor,
-                self.tracker.search_manga,
-                item.title
-            )
-            tasks.append(task)
+    def load_items(self):
+        """Group duplicates on a worker, then list the untracked entries"""
+        self.match_btn.disabled = True
+        self.track_btn.disabled = True
+        self.progress_label.text = 'Finding duplicates...'
+        self.progress_box.opacity = 1
+        manga_list = self.manga_entries.get('backupManga', [])
+        get_runtime().run(
+            find_duplicate_groups,
+            manga_list,
+            pool=POOL_BACKGROUND,
+            owner=self,
+            on_success=lambda duplicate_groups: self.fill_items(manga_list, duplicate_groups),
+            on_error=lambda error: self.on_duplicates_error(manga_list, error)
+        )
+
+    def on_duplicates_error(self, manga_list, error):
+        print(f"Error finding duplicates: {str(error)}")
+        self.fill_items(manga_list, [])
+
+    def fill_items(self, manga_list, duplicate_groups):
+        """Add a match item per untracked entry, one per group of duplicates"""
+        groups = {}
+        for group in duplicate_groups:
+            for manga in group.entries:
+                groups[id(manga)] = group
 
-        results = await asyncio.gather(*tasks)
-        return results
+        seen_groups = set()
+        for manga in manga_list if self.candidates is None else self.candidates:
+            if get_tracking(manga):
+                continue
 
-    def match_manga_batch(self, dt):
-        batch_size = BATCH_SIZE
-        end_index = min(self.current_match_index + batch_size, len(self.manga_items))
-        batch_items = self.manga_items[self.current_match_index:end_index]
+            group = groups.get(id(manga))
+            if group is None:
+                item = MangaMatchItem(
+                    title=manga.get('title', 'Unknown'),
+                    main_popup=self,
+                    entries=[manga],
+                    read_chapters=read_chapters(manga)
+                )
+            elif id(group) not in seen_groups:
+                seen_groups.add(id(group))
+                item = MangaMatchItem(
+                    title=manga.get('title', 'Unknown'),
+                    main_popup=self,
+                    entries=[m for m in group.entries if not get_tracking(m)],
+                    read_chapters=group.read_chapters
+                )
+                tracking = get_tracking(group.primary)
+                if tracking and tracking.get('mediaId'):
+                    item.linked = True
+                    # Only a suggestion: the user checks it before anything is tracked
+                    item.on_result_selected(Manga(int(tracking.get('mediaId'))), select=False)
+                    item.set_status('fuzzy_matched', 'Duplicate?')
+                    item.update_canvas()
+            else:
+                continue
 
-        futures = []
-        for manga_item in batch_items:
-            manga_item.set_status('in_progress', 'Searching...')
-            future = self.executor.submit(self.process_single_manga, manga_item)
-            futures.append(future)
+            self.manga_items.append(item)
+            self.manga_list.add_widget(item)
 
-        for future in futures:
-            future.result()
+        self.progress_box.opacity = 0
+        self.match_btn.disabled = False
+        self.track_btn.disabled = False
+        self.restore_jobs()
 
-        progress = (end_index) / len(self.manga_items) * 100
-        self.progress_bar.value = progress
-        self.progress_label.text = f'Matching {end_index}/{len(self.manga_items)}'
+    def restore_jobs(self):
+        """Show the progress of runs left unfinished last time"""
+        for item in self.manga_items:
+            result = self.match_job.result(item.key)
+            if result and not item.linked:
+                self.update_manga_status(item, result['matched'], result['mal_id'], result['is_fuzzy'])
+                item.fuzzy_match_info = Manga.from_dict(result['fuzzy_node']) if result['fuzzy_node'] else None
 
-        self.current_match_index = end_index
-        if self.current_match_index >= len(self.manga_items):
+        pending = set(self.track_job.pending_keys())
+        for item in self.manga_items:
+            if item.key in pending:
+                item.on_result_selected(Manga(self.track_job.result(item.key)['mal_id']))
+
+        if self.match_job.resumable:
+            self.match_btn.text = 'Resume Matching'
+        if pending:
+            self.track_btn.text = 'Resume Tracking'
+
+    def pause_jobs(self):
+        """Stop work in progress, keeping finished items for a later resume"""
+        get_runtime().cancel_owner(self)
+        for item in self.match_queue:
+            if not self.match_job.is_done(item.key):
+                item.set_status('pending')
+        if self.match_queue:
+            self.match_job.pause()
+            self.planner.save()
+            self.match_queue = []
+            self.match_btn.text = 'Resume Matching'
             self.progress_box.opacity = 0
-            return False
-        return True
 
-    def process_single_manga(self, manga_item):
-        """Process a single manga item in a separate thread"""
-        try:
-            results = self.tracker.search_manga(manga_item.title, limit=5)
-            if results and 'data' in results and results['data']:
-                best_match = None
-                highest_ratio = 0
-
-                for result in results['data']:
-                    node = result['node']
-                    title = node['title']
-                    alt_titles = []
-
-                    if 'alternative_titles' in node:
-                        alt_titles.extend(node['alternative_titles'].get('synonyms', []))
-                        if node['alternative_titles'].get('en'):
-                            alt_titles.append(node['alternative_titles']['en'])
-                        if node['alternative_titles'].get('ja'):
-                            alt_titles.append(node['alternative_titles']['ja'])
-
-                    ratio = fuzz.ratio(manga_item.title.lower(), title.lower())
-                    if ratio > highest_ratio:
-                        highest_ratio = ratio
-                        best_match = node
-
-                    for alt_title in alt_titles:
-                        ratio = fuzz.ratio(manga_item.title.lower(), alt_title.lower())
-                        if ratio > highest_ratio:
-                            highest_ratio = ratio
-                            best_match = node
-
-                if highest_ratio == 100:
-                    matched = True
-                    is_fuzzy = False
-                elif highest_ratio >= 85:
-                    matched = True
-                    is_fuzzy = True
-                else:
-                    matched = False
-                    is_fuzzy = False
-
-                if is_fuzzy:
-                    manga_item.fuzzy_match_info = best_match
-
-                Clock.schedule_once(lambda dt: self.update_manga_status(
-                    manga_item, matched, best_match['id'] if matched else None, is_fuzzy
-                ))
+        if self.tracking:
+            self.tracking = False
+            self.track_job.pause()
+            self.track_btn.text = 'Resume Tracking'
+
+    def cancel_jobs(self):
+        """Stop work in progress and forget the progress of both runs"""
+        self.pause_jobs()
+        self.match_job.cancel()
+        self.track_job.cancel()
+        self.match_btn.text = 'Auto Match'
+        self.track_btn.text = 'Track Selected'
+
+    def on_match_done(self, *args):
+        """Advance the matching progress after one item finished"""
+        self.current_match_index += 1
+        total = len(self.match_queue)
+        self.progress_bar.value = self.current_match_index / total * 100
+        self.progress_label.text = f'Matching {self.current_match_index}/{total}'
+
+        if self.current_match_index >= total:
+            # Items whose searches failed stay in the job so Resume retries them
+            failed = [item for item in self.match_queue if not self.match_job.is_done(item.key)]
+            self.progress_box.opacity = 0
+            self.match_queue = []
+            self.planner.save()
+            if failed:
+                self.match_job.pause()
+                self.match_btn.text = 'Resume Matching'
             else:
-                Clock.schedule_once(lambda dt: manga_item.set_match_status(False))
-        except Exception as e:
-            print(f"Error matching {manga_item.title}: {e}")
-            Clock.schedule_once(lambda dt: manga_item.set_status('error', 'Error'))
+                self.match_job.finish()
+                self.match_btn.text = 'Auto Match'
+        else:
+            self.match_job.checkpoint()
+
+    def on_match_result(self, manga_item, result):
+        """Show and record the outcome of matching one item"""
+        self.update_manga_status(manga_item, result['matched'], result['mal_id'], result['is_fuzzy'])
+        manga_item.fuzzy_match_info = Manga.from_dict(result['fuzzy_node']) if result['fuzzy_node'] else None
+        self.match_job.record(manga_item.key, ITEM_DONE, result)
+        self.on_match_done()
+
+    def on_match_error(self, manga_item, error):
+        print(f"Error matching {manga_item.title}: {error}")
+        manga_item.set_status('error', 'Error')
+        self.match_job.record(manga_item.key, ITEM_FAILED)
+        self.on_match_done()
+
+    def search_title(self, query):
+        """Queue one planner query as bulk work, sharing cached and in-flight searches"""
+        return get_request_cache().fetch(
+            self.tracker,
+            'search_manga',
+            query,
+            priority=PRIORITY_BULK,
+            fields='alternative_titles'
+        )
+
+    def process_single_manga(self, manga_item):
+        """Match a single manga item with the query planner"""
+        get_runtime().watch(
+            self.planner.match(manga_item.title, manga_item.alternative_titles()),
+            owner=self,
+            on_success=lambda match, item=manga_item: self.on_match_result(item, self.match_record(match)),
+            on_error=lambda error, item=manga_item: self.on_match_error(item, error)
+        )
+
+    def match_record(self, match):
+        """Job record of a planner result"""
+        is_fuzzy = match.matched and not match.exact
+        return {
+            'matched': match.matched,
+            'mal_id': match.manga.id if match.matched else None,
+            'is_fuzzy': is_fuzzy,
+            'fuzzy_node': match.manga.to_dict() if is_fuzzy else None,
+            'strategy': match.strategy,
+            'queries': len(match.queries)
+        }
 
     def update_manga_status(self, manga_item, matched, mal_id=None, is_fuzzy=False):
         """Update manga item status on the main thread"""
@@ -405,121 +539,100 @@ class MangaMatchingPopup(Popup):
             manga_item.mal_id = mal_id
 
     def start_matching(self, *args):
+        if self.match_queue:
+            return
+        if not self.match_job.resumable:
+            self.match_job.cancel()
+
+        self.match_queue = [
+            item for item in self.manga_items
+            if not item.linked and not self.match_job.is_done(item.key)
+        ]
         self.current_match_index = 0
         self.progress_box.opacity = 1
         self.progress_bar.value = 0
-        self.progress_label.text = f'Matching 0/{len(self.manga_items)}'
+        self.progress_label.text = f'Matching 0/{len(self.match_queue)}'
 
-        for item in self.manga_items:
-            item.set_status('pending')
+        if not self.match_queue:
+            self.progress_box.opacity = 0
+            self.match_job.finish()
+            self.match_btn.text = 'Auto Match'
+            return
 
-        Clock.schedule_interval(self.match_manga_batch, SCHEDULE_INTERVAL)
+        self.match_job.start()
+        self.match_btn.text = 'Matching...'
+        for item in self.match_queue:
+            item.set_status('pending')
+            self.process_single_manga(item)
 
     def track_selected(self, *args):
+        if self.tracking:
+            return
         selected_items = [item for item in self.manga_items if item.selected and hasattr(item, 'mal_id')]
         if not selected_items:
             return
 
-        self.progress_box.opacity = 1
-        self.progress_bar.value = 0
-        self.progress_label.text = f'Tracking 0/{len(selected_items)}'
-
-        batch_size = 10
-        current_index = 0
-
-        def process_tracking_batch(dt):
-            nonlocal current_index
-
-            end_index = min(current_index + batch_size, len(selected_items))
-            batch_items = selected_items[current_index:end_index]
-
-            futures = []
-            for item in batch_items:
-                future = self.executor.submit(self.track_single_manga, item)
-                futures.append(future)
-
-            for future in futures:
-                try:
-                    future.result()
-                except Exception as e:
-                    print(f"Error in tracking batch: {e}")
-
-            progress = (end_index) / len(selected_items) * 100
-            self.progress_bar.value = progress
-            self.progress_label.text = f'Tracking {end_index}/{len(selected_items)}'
-
-            current_index = end_index
-            if current_index >= len(selected_items):
-                app = App.get_running_app()
-                app.root.save_manga_entries()
-                self.progress_box.opacity = 0
-                self.dismiss()
-                return False
-            return True
-
-        Clock.schedule_interval(process_tracking_batch, 0.8)
-
-    def track_single_manga(self, item):
-        """Track a single manga item in a separate thread"""
-        try:
-            self.tracker.add_manga(item.mal_id)
-
-            for manga in self.manga_entries.get('backupManga', []):
-                if manga.get('title') == item.title:
-                    if 'tracking' not in manga:
-                        manga['tracking'] = []
-                    manga['tracking'].append({
-                        'syncId': 1,
-                        'mediaId': item.mal_id,
-                        'status': 6,
-                        'score': 0,
-                        'lastChapterRead': 0
-                    })
-                    break
-
-            Clock.schedule_once(lambda dt: item.set_status('matched', 'Tracked'))
-
-        except Exception as e:
-            print(f"Error tracking {item.title}: {e}")
-            Clock.schedule_once(lambda dt: item.set_status('error', 'Track Error'))
-
-    def fuzzy_match_titles(self, title1, title2):
-        """Compare titles using various fuzzy matching techniques"""
-        clean1 = clean_title(title1)
-        clean2 = clean_title(title2)
-
-        ratio = fuzz.ratio(clean1, clean2)
-        partial_ratio = fuzz.partial_ratio(clean1, clean2)
-        token_sort_ratio = fuzz.token_sort_ratio(clean1, clean2)
-        token_set_ratio = fuzz.token_set_ratio(clean1, clean2)
-
-        return max(ratio, partial_ratio, token_sort_ratio, token_set_ratio)
-
-def titles_match(title1, title2, threshold=0.85):
-    clean_title1 = clean_title(title1)
-    clean_title2 = clean_title(title2)
-
-    if clean_title1.lower() == clean_title2.lower():
-        return True
-
-    ratio = SequenceMatcher(None, clean_title1.lower(), clean_title2.lower()).ratio()
-    return ratio >= threshold
-
-def clean_title(title):
-    """Clean title for better matching"""
-    import re
-
-    clean = title.lower()
-
-    common_words = ['the', 'a', 'an', 'to', 'no', 'wa', 'ga', 'wo', 'de', 'ni']
-    clean = re.sub(r'[^\w\s]', ' ', clean)
+        self.track_job.cancel()
+        for item in selected_items:
+            self.track_job.record(item.key, ITEM_PENDING, {'mal_id': item.mal_id})
+        self.track_job.start()
+
+        self.tracking = True
+        self.track_btn.text = 'Checking list...'
+        get_runtime().run(
+            fetch_remote_list,
+            self.tracker,
+            pool=POOL_BACKGROUND,
+            owner=self,
+            on_success=lambda remote_entries: self.commit_tracking(selected_items, remote_entries),
+            on_error=self.on_track_error
+        )
 
-    words = clean.split()
-    words = [w for w in words if w not in common_words]
+    def export_selected(self, *args):
+        """Export tracked and selected matched entries for MAL's list import"""
+        selected_items = [item for item in self.manga_items if item.selected and hasattr(item, 'mal_id')]
+        App.get_running_app().root.export_mal_xml(
+            TrackRequest(item.mal_id, item.entries, item.read_chapters) for item in selected_items
+        )
 
-    clean = ' '.join(words)
-    clean = re.sub(r'season \d+', '', clean)
-    clean = re.sub(r'part \d+', '', clean)
-    clean = re.sub(r'\s+', ' ', clean)
+    def commit_tracking(self, items, remote_entries):
+        """Push only what the remote list lacks, then write every record in one pass
+
+        Only called once the whole remote list was fetched; a failed fetch
+        aborts in on_track_error, since entries missing from a partial list
+        would be added again and have their status reset.
+        """
+        self.tracking = False
+        requests = [TrackRequest(item.mal_id, item.entries, item.read_chapters) for item in items]
+        updates = plan_tracking(requests, remote_entries)
+
+        root = App.get_running_app().root
+        with root.outbox.batch():
+            for update in updates:
+                if update.status:
+                    root.outbox.add(update.manga_id, update.status)
+                if update.chapters:
+                    root.outbox.update(update.manga_id, num_chapters_read=update.chapters)
+
+        apply_tracking(requests, remote_entries)
+        for item in items:
+            item.set_status('matched', 'Tracked')
+            self.track_job.record(item.key, ITEM_DONE, {'mal_id': item.mal_id})
+
+        root.save_manga_entries()
+        self.track_job.finish()
+        self.match_job.cancel()
+        root.refresh_entries(manga for item in items for manga in item.entries)
+        root.ids.welcome_label.text = (
+            f"Tracked {len(items)} entries, {len(updates)} list updates queued"
+        )
+        self.dismiss()
 
-    return clean.strip()
\ No newline at end of file
+    def on_track_error(self, error):
+        print(f"Failed to fetch tracker list: {str(error)}")
+        App.get_running_app().root.ids.welcome_label.text = (
+            f"Tracking aborted, could not fetch the tracker list: {str(error)}"
+        )
+        self.tracking = False
+        self.track_job.pause()
+        self.track_btn.text = 'Resume Tracking'
@@ -3,15 +3,33 @@ from kivy.lang import Builder
 from kivy.uix.button import Button
 from kivy.uix.filechooser import FileChooserListView
 from kivy.uix.popup import Popup
+from kivy.clock import Clock
 from typing import Dict, Optional
 from pathlib import Path
 import json
+import time
 from functools import partial
 from core.auth.mal_auth import MALAuth, MALAuthWebView
+from core.library import (
+    read_chapters, get_tracking, entry_key, build_indexes, load_backup, save_backup, LazyBackup,
+    SnapshotCache, BackupWatcher, LibraryDiff, LibraryStats, diff_library, summarize_entry,
+    write_mal_export, VersionStore, LibraryStore, BackupLoader, LoadCancelled
+)
+from core.library.lazy_json import LazyMangaList, iter_entries
+from core.library.snapshot import fingerprint
+from core.matching import TitleIndex
+from core.library.backup import MAL_SYNC_ID
+from core.library.sync import SyncPlanner, fetch_remote_list, apply_plan
 from core.trackers.mal_tracker import MALMangaTracker
+from core.trackers.outbox import TrackerOutbox
+from core.trackers.registry import TrackerRegistry
 from app.config import MAL_CLIENT_ID, MAL_CLIENT_SECRET, CONFIG_FILE
 from .manga_card import MangaCard
 from .matching_popup import MangaMatchingPopup
+from .cover_grid import CoverGrid
+from .history_popup import HistoryPopup
+from app.ui.tasks import get_runtime, POOL_BACKGROUND
+from app.ui.prefetch import SearchPrefetcher
 
 Builder.load_file('src/app/ui/kv/tracker_importer.kv')
 
@@ -21,20 +39,49 @@ class TrackerImporter(BoxLayout):
         self.current_tracker: Optional[str] = None
         self.manga_entries: Dict = {}
         self.tracker = None
+        self.outbox = None
+        self.registry = TrackerRegistry()
+        self.export_backup = None
+        self.indexes = {}
+        self.snapshots = SnapshotCache()
+        self.watcher = None
+        self.history = None
+        self.loader = None
+        self.watch_backup = False
+        self.use_store = False
+        self.store = None
+        self.store_ready = False
+        self.filter_generation = 0
+        self.sort_key = None
+        self.sort_reverse = False
+        self.auto_backup_dir = None
         self.manga_cards = []
+        self.cards_by_key = {}
+        self.stats = LibraryStats()
+        self.title_index = None
+        self.search_text = ''
         self.categories = {}
         self.config_file = CONFIG_FILE
         self.show_thumbnails = False
+        self.cover_grid = None
+        self.grid_view = False
 
         self.mal_auth = MALAuth(client_id=MAL_CLIENT_ID, client_secret=MAL_CLIENT_SECRET)
 
         if self.mal_auth.access_token:
             self.tracker = MALMangaTracker(self.mal_auth.access_token)
+            self.setup_outbox()
             self.ids.welcome_label.text = "Successfully logged in to MyAnimeList!"
+            self.show_dead_letters()
             self.ids.import_button.disabled = False
 
         self.setup_trackers()
         self.setup_sorting()
+        self.prefetcher = SearchPrefetcher(
+            self.ids.manga_list.parent,
+            self.ids.manga_list,
+            lambda: self.tracker
+        )
         self.load_config()
 
     def setup_trackers(self):
@@ -59,6 +106,28 @@ class TrackerImporter(BoxLayout):
             btn.bind(on_release=lambda x, k=key: self.select_tracker(k))
             self.ids.tracker_list.add_widget(btn)
 
+    def setup_outbox(self):
+        """Start the write outbox for the current tracker and register both"""
+        self.outbox = TrackerOutbox(
+            self.tracker,
+            on_dead_letter=lambda manga_id, dead: Clock.schedule_once(lambda dt: self.show_dead_letters())
+        )
+        self.registry.register(self.tracker, self.outbox)
+
+    def show_dead_letters(self):
+        """Tell the user about updates the tracker rejected or that kept failing"""
+        dead = self.outbox.dead_letters() if self.outbox else {}
+        if dead:
+            last_error = list(dead.values())[-1]['error']
+            self.ids.welcome_label.text = f"{len(dead)} update(s) could not be synced: {last_error}"
+
+    def shutdown(self):
+        """Stop background work before the app exits"""
+        self.cancel_loading()
+        get_runtime().cancel_owner(self)
+        self.registry.shutdown()
+        self.stop_watching()
+
     def setup_sorting(self):
         """Setup sorting controls"""
         self.sort_states = {
@@ -99,12 +168,26 @@ class TrackerImporter(BoxLayout):
             try:
                 with open(self.config_file, 'r') as f:
                     config = json.load(f)
+                    self.watch_backup = config.get('watch_backup', False)
+                    self.auto_backup_dir = config.get('auto_backup_dir')
+                    self.ids.live_reload.state = 'down' if self.watch_backup else 'normal'
+                    self.use_store = config.get('library_store', False)
+                    if self.use_store:
+                        self.store = LibraryStore()
+                    self.ids.library_store.state = 'down' if self.use_store else 'normal'
                     last_file = config.get('last_loaded_file')
                     if last_file and Path(last_file).exists():
-                        with open(last_file, 'r') as manga_file:
-                            self.manga_entries = json.load(manga_file)
-                            self.last_loaded_file = last_file
+                        self.last_loaded_file = last_file
+                        self.history = VersionStore(last_file)
+                        snapshot = self.snapshots.load(last_file)
+                        if snapshot:
+                            self.manga_entries = snapshot['backup']
+                            self.indexes = snapshot['indexes']
                             self.process_manga_entries()
+                            self.record_version()
+                            self.start_watching()
+                        else:
+                            self.start_loading(last_file)
             except Exception as e:
                 print(f"Error loading config: {e}")
 
@@ -112,8 +195,12 @@ class TrackerImporter(BoxLayout):
         """Save current configuration"""
         try:
             config = {
-                'last_loaded_file': str(file_path)
+                'last_loaded_file': str(file_path),
+                'watch_backup': self.watch_backup,
+                'library_store': self.use_store
             }
+            if self.auto_backup_dir:
+                config['auto_backup_dir'] = self.auto_backup_dir
             with open(self.config_file, 'w') as f:
                 json.dump(config, f)
         except Exception as e:
@@ -158,28 +245,18 @@ class TrackerImporter(BoxLayout):
         """Handle successful login"""
         if self.current_tracker == "mal":
             self.tracker = MALMangaTracker(token)
+            self.setup_outbox()
             self.ids.welcome_label.text = "Successfully logged in to MyAnimeList!"
+            self.show_dead_letters()
 
         self.ids.import_button.disabled = False
 
     def import_file(self):
         """Handle file import"""
         def load(selection):
+            popup.dismiss()
             if selection:
-                file_path = selection[0]
-                try:
-                    with open(file_path, 'r') as f:
-                        self.manga_entries = json.load(f)
-
-                    self.last_loaded_file = file_path
-                    self.save_config(file_path)
-                    self.process_manga_entries()
-
-                except Exception as e:
-                    print(f"Error loading file: {str(e)}")
-                    self.ids.welcome_label.text = f"Error loading file: {str(e)}"
-                finally:
-                    popup.dismiss()
+                self.start_loading(selection[0])
 
         file_chooser = FileChooserListView(
             filters=['*.tachibk', '*.json'],
@@ -194,7 +271,86 @@ class TrackerImporter(BoxLayout):
         )
         popup.open()
 
-    def process_manga_entries(self):
+    def start_loading(self, file_path):
+        """Parse a backup in the background, keeping the current library until it is ready"""
+        self.cancel_loading()
+        loader = BackupLoader(file_path)
+        self.loader = loader
+        cards = []
+        # With no library to keep usable, cards are shown as soon as they are built
+        show = not self.manga_cards
+        if show:
+            self.ids.manga_list.clear_widgets()
+
+        def add_chunk(entries):
+            if loader is not self.loader:
+                return
+            for manga in entries:
+                card = self.create_manga_card(manga)
+                cards.append(card)
+                if show and not self.grid_view:
+                    self.ids.manga_list.add_widget(card)
+
+        def report(progress):
+            if loader is self.loader:
+                self.ids.load_progress.value = progress.fraction
+                self.ids.welcome_label.text = progress.describe()
+
+        loader.on_chunk = lambda entries: Clock.schedule_once(lambda dt: add_chunk(entries))
+        loader.on_progress = lambda progress: Clock.schedule_once(lambda dt: report(progress))
+
+        def load():
+            backup = loader.run()
+            return backup, build_indexes(backup.get('backupManga', []))
+
+        def done(result):
+            if loader is not self.loader:
+                return
+            self.show_loading(None)
+            backup, indexes = result
+            manga_list = backup.get('backupManga', [])
+            # Chunks still queued behind this callback are built here instead
+            cards.extend(self.create_manga_card(manga) for manga in manga_list[len(cards):])
+
+            self.set_backup(backup)
+            self.indexes = indexes
+            self.last_loaded_file = file_path
+            self.history = VersionStore(file_path)
+            self.save_config(file_path)
+            self.process_manga_entries(cards)
+            self.save_snapshot()
+            self.record_version()
+            self.start_watching()
+            self.ids.welcome_label.text = f"Loaded {len(manga_list)} entries"
+
+        def fail(error):
+            if loader is not self.loader:
+                return
+            self.show_loading(None)
+            if show:
+                self.ids.manga_list.clear_widgets()
+            if isinstance(error, LoadCancelled):
+                self.ids.welcome_label.text = "Loading cancelled"
+                return
+            print(f"Error loading file: {str(error)}")
+            self.ids.welcome_label.text = f"Error loading file: {str(error)}"
+
+        self.show_loading(loader)
+        get_runtime().run(load, owner=self, on_success=done, on_error=fail)
+
+    def cancel_loading(self):
+        """Stop a backup load in progress, keeping the library that is shown"""
+        if self.loader:
+            self.loader.cancel()
+
+    def show_loading(self, loader):
+        self.loader = loader
+        frame = self.ids.load_frame
+        frame.opacity = 1 if loader else 0
+        frame.disabled = loader is None
+        self.ids.load_progress.value = 0
+
+    def process_manga_entries(self, cards=None):
         """Process loaded manga entries"""
         self.categories = {str(i): cat["name"]
             for i, cat in enumerate(self.manga_entries.get('backupCategories', []))}
@@ -210,49 +366,37 @@ class TrackerImporter(BoxLayout):
         )
         self.ids.category_filter.width = min(max(max_width + 50, 250), 500)
 
-        self.update_manga_list()
+        if not self.indexes:
+            self.indexes = build_indexes(self.manga_entries.get('backupManga', []))
+
+        self.stats.rebuild(self.manga_entries.get('backupManga', []))
+        self.update_stats_panel()
+        self.update_manga_list(cards)
+        self.load_store(reuse=True)
+
+    def update_stats_panel(self):
+        self.ids.stats_label.text = self.stats.summary() or ''
+
+    def refresh_entries(self, entries):
+        """Update stats and cards after entries were edited in place"""
+        diff = LibraryDiff()
+        diff.changed = list(entries)
+        self.stats.apply_diff(diff)
+        self.update_stats_panel()
+        self.update_changed_cards(diff)
+        self.update_store(diff.changed)
 
     def create_manga_card(self, manga):
         """Create a manga card from manga data"""
         self.selected_manga_title = manga.get("title", "Unknown Title")
 
-        tracking = manga.get("tracking", [])
-        mal_tracking = next((t for t in tracking if t.get("syncId") == 1), None)
+        tracking_status, mihon_status, chapters_read, total_chapters = summarize_entry(manga)
+        mal_tracking = get_tracking(manga)
+        tracking_id = mal_tracking.get("mediaId", 0) if mal_tracking else 0
 
         title = manga.get("title", "Unknown Title")
         thumbnail_url = manga.get("thumbnailUrl", "")
-
-        if mal_tracking:
-            total_chapters = mal_tracking.get("totalChapters", "?")
-            read_chapters = mal_tracking.get("lastChapterRead", 0)
-            tracking_id = mal_tracking.get("mediaId", 0)
-        else:
-            total_chapters = len(manga.get("chapters", []))
-            read_chapters = self.get_read_chapters(manga)
-            tracking_id = 0
-
-        if read_chapters == 0:
-            mihon_status = "Unread"
-        elif read_chapters == total_chapters and total_chapters != "?":
-            mihon_status = "Completed"
-        else:
-            mihon_status = "Started"
-
-        chapter_text = f"{read_chapters}/{total_chapters}"
-
-        if mal_tracking:
-            status_map = {
-                1: "Reading",
-                2: "Completed",
-                3: "On Hold",
-                4: "Dropped",
-                5: "Plan to Read",
-                6: "Plan to Read"
-            }
-            tracking_status = status_map.get(mal_tracking.get("status", 0), "Unknown")
-        else:
-            tracking_status = "Untracked"
-            tracking_id = 0
+        chapter_text = f"{chapters_read}/{total_chapters}"
 
         return MangaCard(
             title=title,
@@ -269,33 +413,140 @@ class TrackerImporter(BoxLayout):
             manga_data=manga
         )
 
-    def update_manga_list(self):
-        """Update manga list based on current filters"""
-        self.ids.manga_list.clear_widgets()
-        self.manga_cards = []
+    def update_manga_list(self, cards=None):
+        """Update manga list based on current filters, reusing cards already built for the entries"""
+        manga_list = self.manga_entries.get('backupManga', [])
+        if cards is None:
+            cards = [self.create_manga_card(manga) for manga in manga_list]
 
-        for manga in self.manga_entries.get('backupManga', []):
-            card = self.create_manga_card(manga)
-            self.manga_cards.append(card)
+        self.ids.manga_list.clear_widgets()
+        self.manga_cards = cards
+        self.cards_by_key = {}
+        for manga, card in zip(manga_list, cards):
+            self.cards_by_key[entry_key(manga)] = card
             if self.should_show_card(card):
                 self.ids.manga_list.add_widget(card)
 
+        if self.grid_view:
+            self.apply_filters()
+        self.build_title_index()
+
+    def build_title_index(self):
+        """Index card titles in the background for the search box"""
+        cards = list(self.manga_cards)
+
+        def ready(index):
+            if cards == self.manga_cards:
+                self.title_index = (index, cards)
+                if self.search_text:
+                    self.apply_filters()
+
+        get_runtime().run(
+            TitleIndex,
+            [card.title for card in cards],
+            owner=self,
+            on_success=ready,
+            on_error=lambda e: print(f"Error indexing titles: {str(e)}")
+        )
+
+    def on_search_text(self, text):
+        """Narrow the list to titles matching the search box"""
+        self.search_text = text.strip()
+        self.apply_filters()
+
+    def apply_filters(self):
+        """Show the existing cards that pass the search, NSFW and category filters"""
+        self.filter_generation += 1
+        if self.store_ready:
+            self.query_store()
+            return
+
+        cards = self.manga_cards
+        if self.search_text and self.title_index:
+            index, indexed_cards = self.title_index
+            cards = [indexed_cards[position] for position in index.search(self.search_text)]
+
+        self.show_cards([card for card in cards if self.should_show_card(card)])
+
+    def query_store(self):
+        """Filter and sort in the library store, then narrow to the search matches"""
+        generation = self.filter_generation
+        matches = None
+        if self.search_text and self.title_index:
+            index, indexed_cards = self.title_index
+            matches = {id(indexed_cards[position]) for position in index.search(self.search_text)}
+
+        def ready(keys):
+            if generation != self.filter_generation:
+                return
+            cards = (self.cards_by_key.get(key) for key in keys)
+            self.show_cards([
+                card for card in cards
+                if card is not None and (matches is None or id(card) in matches)
+            ])
+
+        get_runtime().run(
+            self.store.query,
+            hide_nsfw=self.ids.nsfw_filter.active,
+            category=self.selected_category(),
+            sort=self.sort_key,
+            reverse=self.sort_reverse,
+            owner=self,
+            on_success=ready,
+            on_error=lambda e: print(f"Error querying library store: {str(e)}")
+        )
+
+    def show_cards(self, cards):
+        if self.grid_view:
+            self.cover_grid.set_cards(cards)
+            return
+
+        manga_list = self.ids.manga_list
+        manga_list.clear_widgets()
+        for card in cards:
+            manga_list.add_widget(card)
+
+    def toggle_grid_view(self, active):
+        """Switch between the card list and the virtualized cover grid"""
+        if active == self.grid_view:
+            return
+        scroll = self.ids.manga_list.parent
+        if self.cover_grid is None:
+            self.cover_grid = CoverGrid()
+
+        old, new = (scroll, self.cover_grid) if active else (self.cover_grid, scroll)
+        container = old.parent
+        position = container.children.index(old)
+        container.remove_widget(old)
+        container.add_widget(new, index=position)
+
+        self.grid_view = active
+        self.apply_filters()
+
     def should_show_card(self, card):
         """Check if card should be shown based on current filters"""
         if card.is_nsfw and self.ids.nsfw_filter.active:
             return False
 
-        selected_category = self.ids.category_filter.text
-        if selected_category != self.categories['all']:
-            category_id = next(k for k, v in self.categories.items() if v == selected_category)
-            if category_id not in card.categories:
-                return False
+        category_id = self.selected_category()
+        if category_id is not None and category_id not in card.categories:
+            return False
 
         return True
 
+    def selected_category(self):
+        """Id of the category picked in the filter, None for all categories"""
+        selected_category = self.ids.category_filter.text
+        if selected_category == self.categories.get('all'):
+            return None
+        return next((k for k, v in self.categories.items() if v == selected_category), None)
+
     def sort_manga_list(self, key, button):
         """Sort manga list by given key"""
-        cards = list(self.ids.manga_list.children)
+        if self.grid_view:
+            cards = [cell['card'] for cell in reversed(self.cover_grid.data)]
+        else:
+            cards = list(self.ids.manga_list.children)
 
         self.sort_states[key] = not self.sort_states[key]
         reverse = self.sort_states[key]
@@ -303,6 +554,12 @@ class TrackerImporter(BoxLayout):
         arrow = '▲' if reverse else '▼'
         button.text = f'Sort by {key.replace("_", " ").title()} {arrow}'
 
+        self.sort_key = key
+        self.sort_reverse = reverse
+        if self.store_ready:
+            self.apply_filters()
+            return
+
         if key == 'title':
             cards.sort(key=lambda x: x.title.lower(), reverse=reverse)
         elif key == 'tracking_status':
@@ -310,91 +567,442 @@ class TrackerImporter(BoxLayout):
         elif key == 'mihon_status':
             cards.sort(key=lambda x: x.mihon_status, reverse=reverse)
 
+        if self.grid_view:
+            self.cover_grid.set_cards(list(reversed(cards)))
+            return
+
         self.ids.manga_list.clear_widgets()
         for card in reversed(cards):
             self.ids.manga_list.add_widget(card)
 
     def toggle_nsfw_filter(self, active):
         """Handle NSFW filter toggle"""
-        self.update_manga_list()
+        self.apply_filters()
 
     def on_category_selected(self, category):
         """Handle category selection"""
-        self.update_manga_list()
+        self.apply_filters()
 
     def get_read_chapters(self, manga):
         """Get number of read chapters"""
-        return sum(1 for chapter in manga.get("chapters", []) if chapter.get("read", False))
+        return read_chapters(manga)
 
     def update_json_data(self, mal_id, status, chapters, score):
-        """Update manga data in JSON"""
+        """Write an edit into the entry's records for every logged-in tracker"""
         if not self.manga_entries:
-            return
+            return []
 
         print(f"Updating JSON data for MAL ID: {mal_id}, Status: {status}, Chapters: {chapters}, Score: {score}")
 
-        for manga in self.manga_entries.get('backupManga', []):
-            tracking = manga.get('tracking', [])
-            mal_tracking = next((t for t in tracking if t.get('syncId') == 1), None)
-
-            if mal_tracking and int(mal_tracking.get('mediaId', 0)) == int(mal_id):
-                mal_tracking.update({
-                    'status': self._convert_status_to_mal(status),
+        entries = self.find_tracked_entries(mal_id)
+        status_key = status.lower().replace(' ', '_')
+        for manga in entries:
+            for tracker, tracking in self.registry.linked(manga):
+                tracking.update({
+                    'status': tracker.status_codes.get(status_key, tracking.get('status', 0)),
                     'lastChapterRead': int(chapters) if chapters else 0,
                     'score': int(score) if score != 'Score' else 0
                 })
-                self.save_manga_entries()
-                return True
-            elif not mal_tracking and manga.get('title') == self.selected_manga_title:
-                new_tracking = {
-                    'syncId': 1,
-                    'mediaId': int(mal_id),
-                    'status': self._convert_status_to_mal(status),
-                    'lastChapterRead': int(chapters) if chapters else 0,
-                    'score': int(score) if score != 'Score' else 0
-                }
-                manga['tracking'] = tracking + [new_tracking]
-                self.save_manga_entries()
-                return True
-            elif not mal_tracking and manga.get('url') == self.selected_manga_url:
-                new_tracking = {
-                    'syncId': 1,
-                    'mediaId': int(mal_id),
-                    'status': self._convert_status_to_mal(status),
-                    'lastChapterRead': int(chapters) if chapters else 0,
-                    'score': int(score) if score != 'Score' else 0
-                }
-                manga['tracking'] = tracking + [new_tracking]
-                self.save_manga_entries()
-                return True
-        return False
-
-    def _convert_status_to_mal(self, status):
-        """Convert status to MAL format"""
-        status_map = {
-            'Reading': 1,
-            'Completed': 2,
-            'On Hold': 3,
-            'Dropped': 4,
-            'Plan to Read': 6
-        }
-        return status_map.get(status, 6)
+            self.stats.update(manga)
+
+        if entries:
+            self.update_stats_panel()
+            self.save_manga_entries()
+            self.update_store(entries)
+        return entries
+
+    def find_tracked_entries(self, mal_id):
+        """Entries linked to a MAL id, linking the selected entry if none are"""
+        mal_id = int(mal_id)
+        manga_list = self.manga_entries.get('backupManga', [])
+        indexed = [
+            manga_list[position]
+            for position in self.indexes.get('by_media_id', {}).get(mal_id, [])
+            if position < len(manga_list)
+        ]
+        indexed = [
+            manga for manga in indexed
+            if get_tracking(manga) and int(get_tracking(manga).get('mediaId', 0)) == mal_id
+        ]
+        if indexed:
+            return indexed
+
+        for position, manga in enumerate(manga_list):
+            mal_tracking = get_tracking(manga)
+            if mal_tracking and int(mal_tracking.get('mediaId', 0)) == mal_id:
+                return [manga]
+            if not mal_tracking and (manga.get('title') == self.selected_manga_title
+                                     or manga.get('url') == self.selected_manga_url):
+                manga['tracking'] = manga.get('tracking', []) + [{'syncId': MAL_SYNC_ID, 'mediaId': mal_id}]
+                if 'by_media_id' in self.indexes:
+                    self.indexes['by_media_id'].setdefault(mal_id, []).append(position)
+                return [manga]
+        return []
+
+    def push_edit(self, mal_id, entries, **fields):
+        """Send one list edit to every logged-in tracker linked to the entries"""
+        targets = self.registry.targets(entries)
+        targets.add((self.tracker.sync_id, int(mal_id)))
+
+        def done(result):
+            if not result.ok:
+                status = "Saved with errors, retrying" if result.retrying else "Some updates failed"
+                self.ids.welcome_label.text = f"{status} - {result.summary()}"
+
+        get_runtime().watch(self.registry.fan_out(targets, **fields), on_success=done)
 
     def save_manga_entries(self):
         """Save manga entries to file"""
         if hasattr(self, 'last_loaded_file') and self.manga_entries:
             try:
-                with open(self.last_loaded_file, 'w') as f:
-                    json.dump(self.manga_entries, f, indent=2)
+                save_backup(self.manga_entries, self.last_loaded_file)
+                if self.watcher:
+                    self.watcher.mark_seen(self.last_loaded_file)
+                self.save_snapshot()
+                self.record_version()
             except Exception as e:
                 print(f"Failed to save JSON file: {str(e)}")
 
-    def show_matching_popup(self):
-        if self.tracker:
-            popup = MangaMatchingPopup(self.tracker, self.manga_entries)
-            popup.open()
+    def record_version(self):
+        """Add the backup as written on disk to its version history"""
+        if self.history:
+            get_runtime().run(
+                self.history.save_version,
+                pool=POOL_BACKGROUND,
+                on_error=lambda e: print(f"Failed to record backup version: {str(e)}")
+            )
+
+    def show_history(self):
+        if self.history:
+            HistoryPopup(self.history, self.restore_version).open()
+
+    def restore_version(self, version_id):
+        """Put a saved version back in place of the loaded backup"""
+        history = self.history
+        path = self.last_loaded_file
+        current = self.manga_entries
+        self.ids.welcome_label.text = "Restoring backup version..."
+
+        def restore():
+            # Keep the state being replaced so the restore can be undone
+            history.save_version()
+            # The file cannot be replaced while it is still mapped on Windows
+            if isinstance(current, LazyBackup):
+                current.close()
+            history.restore(version_id)
+            return load_backup(path)
+
+        def done(backup):
+            self.set_backup(backup)
+            self.indexes = {}
+            if self.watcher:
+                self.watcher.mark_seen(path)
+            self.process_manga_entries()
+            self.save_snapshot()
+            self.ids.welcome_label.text = "Backup version restored"
+
+        def fail(error):
+            print(f"Failed to restore backup version: {str(error)}")
+            self.ids.welcome_label.text = f"Restore failed: {str(error)}"
+
+        get_runtime().run(restore, owner=self, on_success=done, on_error=fail)
+
+    def set_backup(self, backup):
+        """Swap in a newly loaded backup and release the file of the one it replaces"""
+        old = self.manga_entries
+        self.manga_entries = backup
+        if isinstance(old, LazyBackup) and old is not backup:
+            old.close()
+
+    def backup_model(self):
+        """Shallow copy of the loaded backup that a worker can read while the UI edits
+
+        A lazily loaded manga list is shared instead of copied, since
+        copying would parse and keep every entry; workers read it through
+        iter_entries.
+        """
+        return {
+            key: value if isinstance(value, LazyMangaList) or key != 'backupManga' else list(value)
+            for key, value in self.manga_entries.items()
+        }
+
+    def save_snapshot(self):
+        """Cache the processed library so the next launch can skip parsing"""
+        backup = self.backup_model()
+        indexes = self.indexes
+
+        def save(path):
+            manga_list = list(iter_entries(backup.get('backupManga', [])))
+            self.snapshots.save(path, {'backup': {**backup, 'backupManga': manga_list}, 'indexes': indexes})
+
+        get_runtime().run(
+            save,
+            self.last_loaded_file,
+            pool=POOL_BACKGROUND,
+            on_error=lambda e: print(f"Failed to save snapshot: {str(e)}")
+        )
+
+    def toggle_library_store(self, active):
+        """Turn filtering and sorting through the SQLite library store on or off"""
+        if active == self.use_store:
+            return
+        self.use_store = active
+        self.store_ready = False
+        if active:
+            self.store = LibraryStore()
+            self.load_store()
         else:
+            self.store = None
+            self.apply_filters()
+        if hasattr(self, 'last_loaded_file'):
+            self.save_config(self.last_loaded_file)
+
+    def load_store(self, reuse=False):
+        """Copy the loaded backup into the library store in the background"""
+        if not self.store or not self.manga_entries or not hasattr(self, 'last_loaded_file'):
+            return
+
+        store = self.store
+        path = self.last_loaded_file
+        model = self.backup_model()
+        self.store_ready = False
+
+        def load():
+            # Right after a load from disk, a store built from the same file is still current
+            source = fingerprint(path)
+            if not reuse or store.source() != source:
+                store.load_backup(model, source)
+
+        def ready(_):
+            if store is self.store:
+                self.store_ready = True
+                self.apply_filters()
+
+        get_runtime().run(
+            load,
+            pool=POOL_BACKGROUND,
+            owner=self,
+            on_success=ready,
+            on_error=lambda e: print(f"Error loading library store: {str(e)}")
+        )
+
+    def update_store(self, entries):
+        """Rewrite edited entries in the library store"""
+        if not self.store:
+            return
+        get_runtime().run(
+            self.store.update_entries,
+            list(entries),
+            pool=POOL_BACKGROUND,
+            on_error=lambda e: print(f"Error updating library store: {str(e)}")
+        )
+
+    def toggle_live_reload(self, active):
+        """Turn watching the loaded backup for new writes on or off"""
+        self.watch_backup = active
+        if hasattr(self, 'last_loaded_file'):
+            self.save_config(self.last_loaded_file)
+        self.start_watching()
+
+    def start_watching(self):
+        """Watch the loaded backup, or the configured directory of JSON exports"""
+        self.stop_watching()
+        if not self.watch_backup or not hasattr(self, 'last_loaded_file'):
+            return
+
+        path = self.auto_backup_dir or self.last_loaded_file
+        try:
+            self.watcher = BackupWatcher(
+                path,
+                lambda changed: Clock.schedule_once(lambda dt: self.reload_backup(changed))
+            )
+            self.watcher.start()
+        except Exception as e:
+            self.watcher = None
+            print(f"Error watching backup: {str(e)}")
+
+    def stop_watching(self):
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+
+    def reload_backup(self, path):
+        """Parse a rewritten backup in the background and merge it in"""
+        get_runtime().run(
+            load_backup,
+            path,
+            lazy=False,
+            owner=self,
+            on_success=lambda backup: self.apply_backup_changes(path, backup),
+            on_error=lambda e: print(f"Error reloading backup: {str(e)}")
+        )
+
+    def apply_backup_changes(self, path, backup):
+        """Apply only the entries that changed on disk to the model and cards"""
+        old_categories = self.manga_entries.get('backupCategories', [])
+        diff = diff_library(self.manga_entries.get('backupManga', []), backup.get('backupManga', []))
+        backup['backupManga'] = diff.merged
+
+        self.set_backup(backup)
+        self.indexes = build_indexes(diff.merged)
+        if str(path) != str(self.last_loaded_file):
+            self.last_loaded_file = str(path)
+            self.history = VersionStore(path)
+            self.save_config(path)
+
+        if backup.get('backupCategories', []) != old_categories:
+            self.indexes = {}
+            self.process_manga_entries()
+        else:
+            self.stats.apply_diff(diff)
+            self.update_stats_panel()
+            self.update_changed_cards(diff)
+            if diff:
+                self.load_store()
+        self.save_snapshot()
+        self.record_version()
+
+        if diff:
+            self.ids.welcome_label.text = (
+                f"Backup reloaded: {len(diff.added)} added, "
+                f"{len(diff.changed)} changed, {len(diff.removed)} removed"
+            )
+
+    def update_changed_cards(self, diff):
+        """Add, replace and remove cards for a library diff"""
+        manga_list = self.ids.manga_list
+
+        # The title index still covers the old cards, so match the touched ones directly
+        touched = list(diff.changed) + list(diff.added)
+        matches = None
+        if self.search_text:
+            titles = TitleIndex([manga.get('title', 'Unknown Title') for manga in touched])
+            matches = {entry_key(touched[position]) for position in titles.search(self.search_text)}
+
+        def visible(manga, card):
+            return (matches is None or entry_key(manga) in matches) and self.should_show_card(card)
+
+        for manga in diff.removed:
+            card = self.cards_by_key.pop(entry_key(manga), None)
+            if card:
+                self.manga_cards.remove(card)
+                if card.parent:
+                    manga_list.remove_widget(card)
+
+        for manga in diff.changed:
+            key = entry_key(manga)
+            old_card = self.cards_by_key.get(key)
+            card = self.create_manga_card(manga)
+            self.cards_by_key[key] = card
+            if old_card is None:
+                self.manga_cards.append(card)
+                continue
+            self.manga_cards[self.manga_cards.index(old_card)] = card
+
+            position = manga_list.children.index(old_card) if old_card.parent else None
+            if position is not None:
+                manga_list.remove_widget(old_card)
+            if visible(manga, card):
+                manga_list.add_widget(card, index=position or 0)
+
+        for manga in diff.added:
+            card = self.create_manga_card(manga)
+            self.manga_cards.append(card)
+            self.cards_by_key[entry_key(manga)] = card
+            if visible(manga, card):
+                manga_list.add_widget(card)
+
+        if self.grid_view:
+            self.apply_filters()
+        self.build_title_index()
+
+    def show_matching_popup(self):
+        if not self.tracker:
             print("Please log in first")
+            return
+
+        source = getattr(self, 'last_loaded_file', None)
+        if not self.store_ready:
+            MangaMatchingPopup(self.tracker, self.manga_entries, source).open()
+            return
+
+        # The store lists untracked entries without walking every tracking record
+        manga_list = self.manga_entries.get('backupManga', [])
+        by_key = self.indexes.get('by_key', {})
+
+        def ready(keys):
+            candidates = [manga_list[by_key[key]] for key in keys if key in by_key]
+            MangaMatchingPopup(self.tracker, self.manga_entries, source, candidates=candidates).open()
+
+        get_runtime().run(
+            self.store.untracked,
+            owner=self,
+            on_success=ready,
+            on_error=lambda e: print(f"Error querying library store: {str(e)}")
+        )
+
+    def export_mal_xml(self, extra=()):
+        """Write tracked (and extra matched) entries as a MAL list import file"""
+        if not self.manga_entries:
+            return
+
+        path = Path.home() / '.mihontracker' / 'exports' / f"mal_export_{time.strftime('%Y%m%d_%H%M%S')}.xml"
+        self.ids.welcome_label.text = "Writing MAL export..."
+
+        def done(count):
+            self.ids.welcome_label.text = f"Exported {count} entries to {path}"
+
+        def fail(error):
+            print(f"Failed to write MAL export: {str(error)}")
+            self.ids.welcome_label.text = f"Export failed: {str(error)}"
+
+        get_runtime().run(
+            write_mal_export,
+            path,
+            self.manga_entries.get('backupManga', []),
+            list(extra),
+            pool=POOL_BACKGROUND,
+            on_success=done,
+            on_error=fail
+        )
+
+    def sync_progress(self, policy_label):
+        """Sync read progress between the backup and the tracker list"""
+        if not self.tracker or not self.manga_entries:
+            return
+
+        policies = {
+            'Max Wins': 'max',
+            'Local Wins': 'local',
+            'Remote Wins': 'remote'
+        }
+        planner = SyncPlanner(policies.get(policy_label, 'max'))
+        manga_list = self.manga_entries.get('backupManga', [])
+        self.ids.sync_button.disabled = True
+        self.ids.welcome_label.text = "Fetching tracker list..."
+
+        def finish(remote_entries):
+            plan = planner.plan(manga_list, remote_entries)
+            patched = apply_plan(plan, manga_list, self.outbox)
+            if patched:
+                self.save_manga_entries()
+                self.refresh_entries(patched)
+            self.ids.sync_button.disabled = False
+            self.ids.welcome_label.text = f"Synced: {len(plan.push)} pushed, {len(plan.pull)} pulled"
+
+        def fail(error):
+            print(f"Failed to fetch tracker list: {str(error)}")
+            self.ids.sync_button.disabled = False
+            self.ids.welcome_label.text = f"Sync failed: {str(error)}"
+
+        get_runtime().run(
+            fetch_remote_list,
+            self.tracker,
+            pool=POOL_BACKGROUND,
+            owner=self,
+            on_success=finish,
+            on_error=fail
+        )
 
     def toggle_thumbnails(self, *args):
         self.show_thumbnails = not self.show_thumbnails
@@ -404,11 +1012,9 @@ class TrackerImporter(BoxLayout):
     def get_manga_from_json(self, url):
         """Get manga data from JSON file using URL"""
         try:
-            with open('data/mihon_export.json', 'r') as f:
-                data = json.load(f)
-                for manga in data:
-                    if manga.get('url') == url:
-                        return manga
+            if self.export_backup is None:
+                self.export_backup = LazyBackup('data/mihon_export.json')
+            return self.export_backup['backupManga'].find('url', url)
         except Exception as e:
             print(f"Error reading JSON file: {str(e)}")
         return None
\ No newline at end of file
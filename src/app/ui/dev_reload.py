@@ -0,0 +1,119 @@
+import importlib
+import os
+import sys
+import threading
+import traceback
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.lang import Builder
+from kivy.lang import parser as kv_parser
+
+COMPONENTS_PACKAGE = 'app.ui.components'
+KV_DIR = 'app/ui/kv/'
+ROOT_MODULE = 'app.ui.components.tracker_importer'
+
+
+def component_modules():
+    """Loaded widget modules, each after the component modules it imports from"""
+    modules = {
+        name: module for name, module in sys.modules.items()
+        if name.startswith(COMPONENTS_PACKAGE + '.') and module is not None
+    }
+    depends = {
+        name: {
+            getattr(value, '__module__', None) for value in vars(module).values()
+        } & set(modules) - {name}
+        for name, module in modules.items()
+    }
+
+    ordered = []
+    visiting = set()
+
+    def visit(name):
+        if name in ordered or name in visiting:
+            return
+        visiting.add(name)
+        for dependency in sorted(depends[name]):
+            visit(dependency)
+        ordered.append(name)
+
+    for name in sorted(modules):
+        visit(name)
+    return [modules[name] for name in ordered]
+
+
+def restart() -> None:
+    """Replace the process with a fresh run of the app"""
+    print("Restarting the app")
+    sys.stdout.flush()
+    os.execv(sys.executable, [sys.executable] + sys.argv)
+
+
+def unload_kv_files():
+    """Unload the app's KV rules and return the files they came from"""
+    files = [filename for filename in Builder.files if KV_DIR in filename.replace('\\', '/')]
+    for filename in files:
+        Builder.unload_file(filename)
+    # Kivy skips #:include of files it has included before
+    includes = getattr(kv_parser, '__KV_INCLUDES__')
+    includes[:] = [ref for ref in includes if KV_DIR not in ref]
+    return files
+
+
+def restore_kv_files(files) -> None:
+    """Put back the KV rules the running UI was built from"""
+    try:
+        unload_kv_files()
+        # Kivy records included files before their parent, so load parents
+        # first and let them pull their includes back in
+        for filename in reversed(files):
+            if filename not in Builder.files:
+                Builder.load_file(filename)
+    except Exception:
+        traceback.print_exc()
+        print("Could not restore the KV rules, restart the app if widgets look wrong")
+
+
+def reload_ui() -> bool:
+    """Reload KV rules and widget modules, then rebuild the root widget
+
+    If the new code fails to import, the current UI stays up with its KV
+    rules restored and the next change retries the reload. If the new root cannot be built, the old
+    one is already gone, so the app restarts instead.
+    """
+    # Modules load their KV files on import, so the old rules have to go first
+    old_files = unload_kv_files()
+    try:
+        for module in component_modules():
+            importlib.reload(module)
+        root_class = sys.modules[ROOT_MODULE].TrackerImporter
+    except Exception:
+        traceback.print_exc()
+        restore_kv_files(old_files)
+        print("Reload failed, keeping the current UI until the next change")
+        return False
+
+    app = App.get_running_app()
+    old_root = app.root
+    try:
+        old_root.shutdown()
+        Window.remove_widget(old_root)
+        app.root = root_class()
+        Window.add_widget(app.root)
+    except Exception:
+        traceback.print_exc()
+        restart()
+    print("UI reloaded")
+    return True
+
+
+def listen_for_reloads() -> None:
+    """Reload the UI whenever the dev runner writes a line to stdin"""
+    def read():
+        for line in sys.stdin:
+            if line.strip() == 'reload':
+                Clock.schedule_once(lambda dt: reload_ui())
+
+    threading.Thread(target=read, name='dev-reload', daemon=True).start()
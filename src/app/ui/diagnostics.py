@@ -0,0 +1,177 @@
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+
+STALL_BUDGET_MS = float(os.getenv('MIHON_STALL_BUDGET_MS', '100'))
+STALL_MONITOR = os.getenv('MIHON_STALL_MONITOR', '1') != '0'
+PROFILE_ON_START = os.getenv('MIHON_PROFILE', '0') == '1'
+PROFILE_INTERVAL = 0.005
+PROFILE_HOTKEY = 293  # F12
+
+DIAGNOSTICS_DIR = Path.home() / '.mihontracker' / 'diagnostics'
+SOURCE_ROOT = str(Path(__file__).resolve().parents[2])
+
+
+def main_thread_frame():
+    return sys._current_frames().get(threading.main_thread().ident)
+
+
+def blame(stack: List[traceback.FrameSummary]) -> Optional[traceback.FrameSummary]:
+    """Innermost frame of the stack that belongs to this app"""
+    for frame in reversed(stack):
+        if frame.filename.startswith(SOURCE_ROOT) and not frame.filename.endswith('diagnostics.py'):
+            return frame
+    return stack[-1] if stack else None
+
+
+class StallMonitor:
+    """Flags main thread frames over budget and records what was running
+
+    The UI thread stamps a heartbeat every frame. A watchdog thread grabs
+    the main thread's stack as soon as a heartbeat is overdue, and the
+    stall is reported with that stack once the frame finally ends.
+    """
+
+    def __init__(self, budget_ms: float = STALL_BUDGET_MS):
+        self.budget = budget_ms / 1000
+        self.heartbeat = time.perf_counter()
+        self.captured = None
+        self.lock = threading.Lock()
+        self.running = False
+        self.event = None
+        self.thread = None
+        self.log_file = DIAGNOSTICS_DIR / 'stalls.log'
+
+    def start(self) -> None:
+        DIAGNOSTICS_DIR.mkdir(parents=True, exist_ok=True)
+        self.running = True
+        self.heartbeat = time.perf_counter()
+        self.event = Clock.schedule_interval(self._tick, 0)
+        self.thread = threading.Thread(target=self._watch, name='stall-monitor', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        if self.event:
+            self.event.cancel()
+
+    def _tick(self, dt):
+        now = time.perf_counter()
+        with self.lock:
+            elapsed = now - self.heartbeat
+            self.heartbeat = now
+            captured, self.captured = self.captured, None
+        if elapsed > self.budget and captured:
+            self.report(elapsed, captured)
+
+    def _watch(self):
+        while self.running:
+            time.sleep(self.budget / 4)
+            with self.lock:
+                overdue = time.perf_counter() - self.heartbeat > self.budget
+                if not overdue or self.captured:
+                    continue
+                frame = main_thread_frame()
+                if frame is not None:
+                    self.captured = traceback.extract_stack(frame)
+
+    def report(self, elapsed: float, stack: List[traceback.FrameSummary]) -> None:
+        culprit = blame(stack)
+        location = f"{culprit.filename}:{culprit.lineno} in {culprit.name}" if culprit else "unknown"
+        print(f"UI stall of {elapsed * 1000:.0f} ms at {location}")
+        try:
+            with open(self.log_file, 'a') as f:
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} stall {elapsed * 1000:.0f} ms at {location}\n")
+                f.write(''.join(traceback.format_list(stack)))
+                f.write('\n')
+        except Exception as e:
+            print(f"Failed to write stall log: {str(e)}")
+
+
+class SamplingProfiler:
+    """Samples the main thread's stack and writes collapsed stacks
+
+    The output has one line per distinct stack with its sample count,
+    which flamegraph tools read directly.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self.running = False
+        self.thread = None
+        self.started = 0.0
+
+    def start(self) -> None:
+        self.samples.clear()
+        self.running = True
+        self.started = time.time()
+        self.thread = threading.Thread(target=self._sample, name='profiler', daemon=True)
+        self.thread.start()
+        print("Profiling started")
+
+    def stop(self) -> Optional[Path]:
+        """Stop sampling and write the profile, returning its path"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1)
+        DIAGNOSTICS_DIR.mkdir(parents=True, exist_ok=True)
+        path = DIAGNOSTICS_DIR / f"profile_{time.strftime('%Y%m%d_%H%M%S', time.localtime(self.started))}.txt"
+        with open(path, 'w') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        print(f"Profile with {sum(self.samples.values())} samples written to {path}")
+        return path
+
+    def _sample(self):
+        while self.running:
+            frame = main_thread_frame()
+            if frame is not None:
+                stack = ';'.join(
+                    f"{Path(entry.filename).name}:{entry.name}:{entry.lineno}"
+                    for entry in traceback.extract_stack(frame)
+                )
+                self.samples[stack] += 1
+            time.sleep(self.interval)
+
+
+class Diagnostics:
+    """Stall monitor plus a profiler toggled with F12 or MIHON_PROFILE=1"""
+
+    def __init__(self):
+        self.monitor = StallMonitor() if STALL_MONITOR else None
+        self.profiler = SamplingProfiler()
+
+    def start(self) -> None:
+        if self.monitor:
+            self.monitor.start()
+        if PROFILE_ON_START:
+            self.profiler.start()
+        Window.bind(on_key_down=self._on_key_down)
+
+    def stop(self) -> None:
+        Window.unbind(on_key_down=self._on_key_down)
+        if self.monitor:
+            self.monitor.stop()
+        if self.profiler.running:
+            self.profiler.stop()
+
+    def toggle_profiler(self) -> None:
+        if self.profiler.running:
+            self.profiler.stop()
+        else:
+            self.profiler.start()
+
+    def _on_key_down(self, window, key, *args):
+        if key == PROFILE_HOTKEY:
+            self.toggle_profiler()
+            return True
+        return False
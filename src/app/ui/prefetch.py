@@ -0,0 +1,108 @@
+import threading
+from concurrent.futures import Future
+from typing import Dict, List
+
+from kivy.clock import Clock
+
+from core.trackers.cache import get_request_cache
+from core.trackers.scheduler import PRIORITY_PREFETCH
+from app.ui.components.manga_details import DETAILED_RESULTS
+
+PREFETCH_DELAY = 0.3
+LOOKAHEAD_SCREENS = 1
+# Titles whose search or detail requests may be outstanding at once
+MAX_OUTSTANDING = 8
+
+
+class SearchPrefetcher:
+    """Warms search and detail responses for untracked cards near the viewport
+
+    Each card has at most one set of requests in flight, and they are
+    cancelled when the card leaves the lookahead window, so a long scroll
+    never queues more than MAX_OUTSTANDING titles.
+    """
+
+    def __init__(self, scroll_view, manga_list, get_tracker):
+        self.scroll_view = scroll_view
+        self.manga_list = manga_list
+        self.get_tracker = get_tracker
+        self.pending: Dict[str, List[Future]] = {}
+        self.failed = set()
+        self.lock = threading.Lock()
+        self._trigger = Clock.create_trigger(self.prefetch_visible, PREFETCH_DELAY)
+
+        scroll_view.bind(scroll_y=self._trigger, height=self._trigger)
+        manga_list.bind(children=self._trigger)
+
+    def visible_cards(self):
+        """Cards on screen or within the lookahead margin, top first"""
+        view = self.scroll_view
+        bottom = view.to_local(view.x, view.y)[1]
+        margin = view.height * LOOKAHEAD_SCREENS
+        low, high = bottom - margin, bottom + view.height + margin
+
+        cards = [card for card in self.manga_list.children if card.top >= low and card.y <= high]
+        cards.sort(key=lambda card: -card.y)
+        return cards
+
+    @staticmethod
+    def card_key(card) -> str:
+        return card.url or card.title
+
+    def prefetch_visible(self, *args):
+        tracker = self.get_tracker()
+        if not tracker:
+            self.cancel_all()
+            return
+
+        cards = [card for card in self.visible_cards() if card.tracking_status == "Untracked"]
+        visible = {self.card_key(card) for card in cards}
+        stale = []
+        with self.lock:
+            for key in list(self.pending):
+                futures = self.pending[key]
+                if key not in visible or all(future.done() for future in futures):
+                    stale.extend(self.pending.pop(key))
+        # Cancelling runs done callbacks, which take the lock themselves
+        for future in stale:
+            future.cancel()
+
+        cache = get_request_cache()
+        for card in cards:
+            key = self.card_key(card)
+            with self.lock:
+                if len(self.pending) >= MAX_OUTSTANDING:
+                    break
+                if (key in self.pending or key in self.failed
+                        or cache.contains(tracker, 'search_manga', card.title)):
+                    continue
+                future = cache.fetch(tracker, 'search_manga', card.title, priority=PRIORITY_PREFETCH)
+                self.pending[key] = [future]
+            future.add_done_callback(lambda f, key=key: self._prefetch_details(tracker, key, f))
+
+    def cancel_all(self):
+        with self.lock:
+            pending = list(self.pending.values())
+            self.pending.clear()
+        for futures in pending:
+            for future in futures:
+                future.cancel()
+
+    def _prefetch_details(self, tracker, key, future):
+        if not future.cancelled() and future.exception() is not None:
+            # Failed searches are left to the details popup rather than retried here
+            with self.lock:
+                self.failed.add(key)
+        elif not future.cancelled():
+            cache = get_request_cache()
+            with self.lock:
+                futures = self.pending.get(key)
+                if futures is not None:
+                    futures.extend(
+                        cache.fetch(tracker, 'get_manga_details', entry.manga.id, priority=PRIORITY_PREFETCH)
+                        for entry in future.result().items[:DETAILED_RESULTS]
+                    )
+                    for detail in futures[1:]:
+                        detail.add_done_callback(lambda f: self._trigger())
+        # A finished search frees a slot for the next card
+        self._trigger()
@@ -0,0 +1,135 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from kivy.clock import Clock
+
+from core.trackers.base import BaseTracker
+from core.trackers.cache import get_request_cache
+from core.trackers.scheduler import get_scheduler, PRIORITY_INTERACTIVE
+
+POOL_UI = 'ui'
+POOL_BACKGROUND = 'background'
+POOL_IO = 'io'
+# Loads the user is waiting on, housekeeping and slow list fetches, and
+# downloads each get their own workers so one kind cannot starve another
+POOL_SIZES = {
+    POOL_UI: 2,
+    POOL_BACKGROUND: 2,
+    POOL_IO: 4
+}
+
+
+class TaskRuntime:
+    """Runs blocking work off the UI thread and reports back on it
+
+    Work can be owned by a widget. When an owning popup is dismissed its
+    queued work is cancelled and callbacks for running work are dropped.
+    """
+
+    def __init__(self, pool_sizes: Dict[str, int] = POOL_SIZES):
+        self.executors = {
+            pool: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'{pool}-task')
+            for pool, workers in pool_sizes.items()
+        }
+        self.owned: Dict[int, set] = {}
+        self.lock = threading.Lock()
+
+    def submit(self, tracker: BaseTracker, fn: Callable, *args,
+               priority: int = PRIORITY_INTERACTIVE, owner=None,
+               on_success: Optional[Callable] = None,
+               on_error: Optional[Callable] = None, **kwargs) -> Future:
+        """Run a tracker call through its scheduler"""
+        future = get_scheduler(tracker.name).submit(fn, *args, priority=priority, **kwargs)
+        return self._watch(future, owner, on_success, on_error)
+
+    def fetch(self, tracker: BaseTracker, method: str, *args,
+              priority: int = PRIORITY_INTERACTIVE, owner=None,
+              on_success: Optional[Callable] = None,
+              on_error: Optional[Callable] = None, **kwargs) -> Future:
+        """Run a read-only tracker call, joining cached or in-flight responses"""
+        future = get_request_cache().fetch(tracker, method, *args, priority=priority, **kwargs)
+        return self._watch(future, owner, on_success, on_error)
+
+    def run(self, fn: Callable, *args, pool: str = POOL_UI, owner=None,
+            on_success: Optional[Callable] = None,
+            on_error: Optional[Callable] = None, **kwargs) -> Future:
+        """Run any blocking function on a background thread of one pool"""
+        future = self.executors[pool].submit(fn, *args, **kwargs)
+        return self._watch(future, owner, on_success, on_error)
+
+    def watch(self, future: Future, owner=None,
+              on_success: Optional[Callable] = None,
+              on_error: Optional[Callable] = None) -> Future:
+        """Report the outcome of a future started elsewhere on the UI thread"""
+        return self._watch(future, owner, on_success, on_error)
+
+    def cancel_owner(self, owner) -> None:
+        """Cancel all outstanding work owned by a widget"""
+        with self.lock:
+            futures = self.owned.pop(id(owner), set())
+        for future in futures:
+            future.cancel()
+
+    def shutdown(self) -> None:
+        with self.lock:
+            owners = list(self.owned.values())
+            self.owned.clear()
+        for futures in owners:
+            for future in futures:
+                future.cancel()
+        for executor in self.executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _watch(self, future, owner, on_success, on_error):
+        key = None
+        if owner is not None:
+            key = id(owner)
+            with self.lock:
+                if key not in self.owned:
+                    self.owned[key] = set()
+                    if 'on_dismiss' in getattr(owner, 'events', lambda: [])():
+                        owner.fbind('on_dismiss', lambda *args: self.cancel_owner(owner))
+                self.owned[key].add(future)
+
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._deliver(f, key, on_success, on_error))
+        )
+        return future
+
+    def _deliver(self, future, key, on_success, on_error):
+        if key is not None:
+            with self.lock:
+                futures = self.owned.get(key)
+                if futures is None or future not in futures:
+                    return
+                futures.discard(future)
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                print(f"Background task failed: {str(error)}")
+        elif on_success:
+            on_success(future.result())
+
+
+_runtime: Optional[TaskRuntime] = None
+
+
+def get_runtime() -> TaskRuntime:
+    """Get the shared task runtime"""
+    global _runtime
+    if _runtime is None:
+        _runtime = TaskRuntime()
+    return _runtime
+
+
+def shutdown_runtime() -> None:
+    global _runtime
+    if _runtime is not None:
+        _runtime.shutdown()
+        _runtime = None
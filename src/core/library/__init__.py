@@ -0,0 +1,18 @@
+from .backup import read_chapters, get_tracking, entry_key, build_indexes, load_backup, save_backup
+from .lazy_json import LazyBackup
+from .snapshot import SnapshotCache
+from .duplicates import DuplicateGroup, find_duplicate_groups
+from .diff import LibraryDiff, diff_library
+from .watcher import BackupWatcher
+from .stats import LibraryStats, summarize_entry
+from .mal_export import write_mal_export
+from .history import VersionStore
+from .store import LibraryStore
+from .loader import BackupLoader, LoadCancelled, LoadProgress
+from .jobs import BulkJob, item_key, ITEM_PENDING, ITEM_DONE, ITEM_FAILED
+
+__all__ = ['read_chapters', 'get_tracking', 'entry_key', 'build_indexes', 'load_backup', 'save_backup', 'LazyBackup',
+           'DuplicateGroup', 'find_duplicate_groups', 'SnapshotCache',
+           'LibraryDiff', 'diff_library', 'BackupWatcher', 'LibraryStats', 'summarize_entry',
+           'write_mal_export', 'VersionStore', 'LibraryStore', 'BackupLoader', 'LoadCancelled', 'LoadProgress',
+           'BulkJob', 'item_key', 'ITEM_PENDING', 'ITEM_DONE', 'ITEM_FAILED']
\ No newline at end of file
@@ -0,0 +1,59 @@
+import json
+from typing import Dict, Optional
+
+from .lazy_json import LazyBackup
+
+MAL_SYNC_ID = 1
+
+# MAL list status names and the status codes Mihon stores for them
+MAL_STATUS_CODES = {
+    'reading': 1,
+    'completed': 2,
+    'on_hold': 3,
+    'dropped': 4,
+    'plan_to_read': 6
+}
+
+
+def read_chapters(manga: Dict) -> int:
+    """Get number of read chapters"""
+    return sum(1 for chapter in manga.get("chapters", []) if chapter.get("read", False))
+
+
+def get_tracking(manga: Dict, sync_id: int = MAL_SYNC_ID) -> Optional[Dict]:
+    """Get the tracking record of a manga for one tracker"""
+    return next((t for t in manga.get("tracking", []) if t.get("syncId") == sync_id), None)
+
+
+def entry_key(manga: Dict):
+    """Key that identifies a library entry across backups"""
+    return manga.get("source"), manga.get("url")
+
+
+def build_indexes(manga_list) -> Dict:
+    """Lookup tables from entry key and tracker id to list position"""
+    by_key = {}
+    by_media_id = {}
+    for position, manga in enumerate(manga_list):
+        by_key[entry_key(manga)] = position
+        tracking = get_tracking(manga)
+        if tracking and tracking.get("mediaId"):
+            by_media_id.setdefault(int(tracking["mediaId"]), []).append(position)
+    return {'by_key': by_key, 'by_media_id': by_media_id}
+
+
+def load_backup(path, lazy: bool = True):
+    """Open a backup file, indexing JSON backups lazily"""
+    if lazy and str(path).endswith('.json'):
+        return LazyBackup(path)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_backup(backup, path) -> None:
+    """Write a backup loaded with load_backup"""
+    if isinstance(backup, LazyBackup):
+        backup.dump(path)
+    else:
+        with open(path, 'w') as f:
+            json.dump(backup, f, indent=2)
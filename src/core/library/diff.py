@@ -0,0 +1,40 @@
+from typing import Dict, List
+
+from .backup import entry_key
+
+
+class LibraryDiff:
+    """Entries added, removed and changed between two versions of a library"""
+
+    def __init__(self):
+        self.added: List[Dict] = []
+        self.removed: List[Dict] = []
+        self.changed: List[Dict] = []
+        self.merged: List[Dict] = []
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+
+def diff_library(old_list, new_list) -> LibraryDiff:
+    """Compare two backupManga lists by (source, url)
+
+    The merged list follows the order of the new list and reuses the old
+    entry objects that did not change, so references held by the UI stay
+    valid.
+    """
+    diff = LibraryDiff()
+    old_entries = {entry_key(manga): manga for manga in old_list}
+
+    for manga in new_list:
+        old = old_entries.pop(entry_key(manga), None)
+        if old is None:
+            diff.added.append(manga)
+        elif old != manga:
+            diff.changed.append(manga)
+        else:
+            manga = old
+        diff.merged.append(manga)
+
+    diff.removed = list(old_entries.values())
+    return diff
@@ -0,0 +1,114 @@
+import random
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List
+
+from core.matching.titles import clean_title
+from .backup import read_chapters, get_tracking
+
+NUM_PERMUTATIONS = 32
+BANDS = 8
+ROWS = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.8
+
+# Hash functions are simulated by XOR-ing each shingle hash with a fixed random mask
+_rng = random.Random(1)
+HASH_MASKS = [_rng.getrandbits(32) for _ in range(NUM_PERMUTATIONS)]
+NOISE_PATTERN = re.compile(r'[\(\[\{][^\)\]\}]*[\)\]\}]')
+# Tokens that tell a sequel or spin-off apart from the series it continues
+NUMBER_TOKEN = re.compile(r'^\d+(?:st|nd|rd|th)?$')
+SERIES_MARKERS = {
+    're', 'season', 'part', 'arc', 'sequel', 'gaiden', 'side', 'spinoff', 'zero', 'final',
+    'next', 'shin', 'ii', 'iii', 'iv', 'v', 'vi', 'second', 'third', 'after', 'before', 'origins'
+}
+
+
+class DuplicateGroup:
+    """Library entries that refer to the same series"""
+
+    def __init__(self, entries: List[Dict]):
+        self.entries = entries
+        self.primary = next((m for m in entries if get_tracking(m)), entries[0])
+        self.read_chapters = max(read_chapters(m) for m in entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def shingles(title: str) -> set:
+    """Character trigrams of a normalized title without bracketed tags"""
+    text = f" {clean_title(NOISE_PATTERN.sub(' ', title))} "
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def title_tokens(title: str) -> set:
+    """Lowercase words of a title without bracketed tags, common words kept"""
+    return set(re.sub(r'[^\w\s]', ' ', NOISE_PATTERN.sub(' ', title).lower()).split())
+
+
+def distinct_series(title1: str, title2: str) -> bool:
+    """Whether two similar titles differ by a number or a sequel marker like season or :re"""
+    difference = title_tokens(title1) ^ title_tokens(title2)
+    return any(NUMBER_TOKEN.match(token) or token in SERIES_MARKERS for token in difference)
+
+
+def minhash(shingle_set: set) -> List[int]:
+    """MinHash signature of a shingle set"""
+    hashes = [zlib.crc32(s.encode('utf-8')) for s in shingle_set]
+    return [min(h ^ mask for h in hashes) for mask in HASH_MASKS]
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def find_duplicate_groups(manga_list: List[Dict],
+                          threshold: float = SIMILARITY_THRESHOLD) -> List[DuplicateGroup]:
+    """Group library entries with near-identical titles
+
+    Candidate pairs come from LSH buckets over MinHash signatures, so only
+    entries sharing a band are compared instead of every pair. Pairs
+    that differ by a number or a sequel marker are never grouped, since
+    sequels and spin-offs are tracked as their own series.
+    """
+    shingle_sets = [shingles(manga.get('title', '')) for manga in manga_list]
+
+    buckets = defaultdict(list)
+    for index, shingle_set in enumerate(shingle_sets):
+        signature = minhash(shingle_set)
+        for band in range(BANDS):
+            key = (band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+            buckets[key].append(index)
+
+    parents = list(range(len(manga_list)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    checked = set()
+    for members in buckets.values():
+        for i, first in enumerate(members):
+            for other in members[i + 1:]:
+                pair = (first, other)
+                if pair in checked or find(first) == find(other):
+                    continue
+                checked.add(pair)
+                if (jaccard(shingle_sets[first], shingle_sets[other]) >= threshold
+                        and not distinct_series(manga_list[first].get('title', ''),
+                                                manga_list[other].get('title', ''))):
+                    parents[find(other)] = find(first)
+
+    groups = defaultdict(list)
+    for index in range(len(manga_list)):
+        groups[find(index)].append(manga_list[index])
+
+    return [DuplicateGroup(entries) for entries in groups.values() if len(entries) > 1]
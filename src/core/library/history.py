@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Chunk boundaries may only fall after one of these, so edits resync quickly
+ANCHOR = re.compile(rb'\},|\n')
+WINDOW = 32
+BOUNDARY_MASK = 0x1F
+MIN_CHUNK = 4 * 1024
+MAX_CHUNK = 64 * 1024
+DIGEST_SIZE = 16
+# Chunk lists are grouped into index blocks after digests ending in this mask
+INDEX_MASK = 0x3F
+MAX_VERSIONS = 200
+
+
+def window_hash(window: bytes) -> int:
+    # crc32 is linear, so windows that differ only in a few digits can
+    # never reach some values; a real hash spreads them evenly
+    return int.from_bytes(hashlib.blake2b(window, digest_size=4).digest(), 'little')
+
+
+def chunk_boundaries(data: bytes) -> Iterator[int]:
+    """End offsets of content-defined chunks
+
+    A chunk ends after an anchor once it is at least MIN_CHUNK long and the
+    hash of the bytes just before the anchor hits the boundary mask. Since
+    cut points depend only on nearby content, an edit only changes the
+    chunks around it.
+    """
+    start = 0
+    size = len(data)
+    while start < size:
+        limit = min(start + MAX_CHUNK, size)
+        end = limit
+        match = ANCHOR.search(data, start + MIN_CHUNK, limit)
+        while match:
+            cut = match.end()
+            if window_hash(data[cut - WINDOW:cut]) & BOUNDARY_MASK == 0:
+                end = cut
+                break
+            match = ANCHOR.search(data, cut, limit)
+        yield end
+        start = end
+
+
+class VersionStore:
+    """Deduplicated history of the versions of one backup file
+
+    Each saved version is a manifest pointing at index blocks, which list
+    the hashes of its chunks. Chunks and index blocks are both stored
+    compressed under their hash, so a version only costs the chunks, and
+    the few index blocks, that changed since earlier ones.
+    """
+
+    def __init__(self, source, store_dir: Optional[Path] = None):
+        self.source = Path(source)
+        key = hashlib.blake2b(str(self.source.resolve()).encode('utf-8'), digest_size=8).hexdigest()
+        self.root = (store_dir or Path.home() / '.mihontracker' / 'history') / key
+        self.chunk_dir = self.root / 'chunks'
+        self.manifest_dir = self.root / 'manifests'
+        self.chunk_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+
+    def chunk_path(self, digest: str) -> Path:
+        return self.chunk_dir / digest[:2] / digest
+
+    def store(self, data: bytes) -> str:
+        """Store a blob under its hash unless it is already there"""
+        digest = hashlib.blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
+        path = self.chunk_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(zlib.compress(data, 1))
+            os.replace(tmp_path, path)
+        return digest
+
+    def fetch(self, digest: str) -> bytes:
+        with open(self.chunk_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def save_version(self) -> Optional[str]:
+        """Record the current contents of the source, unless identical to the latest"""
+        with self.lock:
+            with open(self.source, 'rb') as f:
+                data = f.read()
+
+            chunks = []
+            start = 0
+            for end in chunk_boundaries(data):
+                chunks.append(self.store(data[start:end]))
+                start = end
+
+            index = []
+            block = []
+            for digest in chunks:
+                block.append(digest)
+                if int(digest[-2:], 16) & INDEX_MASK == 0:
+                    index.append(self.store(''.join(block).encode('ascii')))
+                    block = []
+            if block:
+                index.append(self.store(''.join(block).encode('ascii')))
+
+            latest = self.versions()[:1]
+            if latest and self.load_manifest(latest[0]['id'])['index'] == index:
+                return None
+
+            version_id = str(time.time_ns())
+            manifest = {'created': time.time(), 'size': len(data), 'index': index}
+            tmp_path = self.manifest_dir / f'{version_id}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, self.manifest_dir / f'{version_id}.json')
+
+        self.prune()
+        return version_id
+
+    def chunk_list(self, manifest: Dict) -> List[str]:
+        width = DIGEST_SIZE * 2
+        chunks = []
+        for block in manifest['index']:
+            text = self.fetch(block).decode('ascii')
+            chunks.extend(text[i:i + width] for i in range(0, len(text), width))
+        return chunks
+
+    def load_manifest(self, version_id: str) -> Dict:
+        with open(self.manifest_dir / f'{version_id}.json', 'r') as f:
+            return json.load(f)
+
+    def versions(self) -> List[Dict]:
+        """Saved versions, newest first"""
+        versions = []
+        for path in self.manifest_dir.glob('*.json'):
+            try:
+                with open(path, 'r') as f:
+                    manifest = json.load(f)
+            except Exception as e:
+                print(f"Failed to read manifest {path.name}: {str(e)}")
+                continue
+            versions.append({'id': path.stem, 'created': manifest['created'], 'size': manifest['size']})
+        return sorted(versions, key=lambda version: int(version['id']), reverse=True)
+
+    def restore(self, version_id: str, target=None) -> Path:
+        """Write a saved version back to the source file, or to target"""
+        target = Path(target or self.source)
+        manifest = self.load_manifest(version_id)
+        tmp_path = target.with_suffix(target.suffix + '.restore')
+        with open(tmp_path, 'wb') as f:
+            for digest in self.chunk_list(manifest):
+                f.write(self.fetch(digest))
+        os.replace(tmp_path, target)
+        return target
+
+    def prune(self, keep: int = MAX_VERSIONS) -> None:
+        """Drop the oldest versions beyond keep and chunks nothing refers to"""
+        with self.lock:
+            versions = self.versions()
+            if len(versions) <= keep:
+                return
+            for version in versions[keep:]:
+                (self.manifest_dir / f"{version['id']}.json").unlink()
+
+            referenced = set()
+            for version in versions[:keep]:
+                manifest = self.load_manifest(version['id'])
+                referenced.update(manifest['index'])
+                referenced.update(self.chunk_list(manifest))
+            for path in self.chunk_dir.glob('*/*'):
+                if path.name not in referenced:
+                    path.unlink()
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .backup import entry_key
+
+JOB_RUNNING = 'running'
+JOB_PAUSED = 'paused'
+JOB_DONE = 'done'
+
+ITEM_PENDING = 'pending'
+ITEM_DONE = 'done'
+ITEM_FAILED = 'failed'
+
+CHECKPOINT_INTERVAL = 2.0
+
+
+def item_key(manga: Dict) -> str:
+    """Stable key for a library entry that can be stored as JSON"""
+    source, url = entry_key(manga)
+    return f"{source}:{url}"
+
+
+class BulkJob:
+    """Per-item progress of a bulk match or track run, checkpointed to disk
+
+    Items are recorded in memory as they complete and written out by
+    checkpoint, so a run that is closed, paused or crashes can resume with
+    only the items that never finished.
+    """
+
+    def __init__(self, kind: str, source, data_dir: Optional[Path] = None):
+        self.kind = kind
+        self.data_dir = data_dir or Path.home() / '.mihontracker' / 'jobs'
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        key = hashlib.blake2b(str(Path(source).resolve()).encode('utf-8'), digest_size=8).hexdigest()
+        self.job_file = self.data_dir / f'{kind}_{key}.json'
+
+        self.status = JOB_PAUSED
+        self.items: Dict[str, Dict] = {}
+        self.dirty = False
+        self.last_checkpoint = time.monotonic()
+        self.load()
+
+    def load(self) -> None:
+        """Load the state left by a previous run"""
+        try:
+            if self.job_file.exists():
+                with open(self.job_file, 'r') as f:
+                    state = json.load(f)
+                self.items = state.get('items', {})
+                self.status = state.get('status', JOB_PAUSED)
+        except Exception as e:
+            print(f"Failed to load {self.kind} job: {str(e)}")
+
+    @property
+    def checkpoint_due(self) -> bool:
+        return self.dirty and time.monotonic() - self.last_checkpoint >= CHECKPOINT_INTERVAL
+
+    def checkpoint(self, force: bool = False) -> None:
+        """Write progress to disk if it changed and the interval has passed"""
+        if not self.dirty or not (force or self.checkpoint_due):
+            return
+
+        tmp_file = self.job_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'status': self.status, 'items': self.items}, f)
+        os.replace(tmp_file, self.job_file)
+        self.dirty = False
+        self.last_checkpoint = time.monotonic()
+
+    @property
+    def resumable(self) -> bool:
+        """Whether an unfinished run was left behind"""
+        return bool(self.items) and self.status != JOB_DONE
+
+    def start(self) -> None:
+        self.status = JOB_RUNNING
+        self.dirty = True
+        self.checkpoint(force=True)
+
+    def pause(self) -> None:
+        self.status = JOB_PAUSED
+        self.dirty = True
+        self.checkpoint(force=True)
+
+    def cancel(self) -> None:
+        """Forget the run and its progress"""
+        self.items = {}
+        self.status = JOB_PAUSED
+        self.dirty = False
+        if self.job_file.exists():
+            self.job_file.unlink()
+
+    def finish(self) -> None:
+        """Mark the run complete; its results stay until the next run starts"""
+        self.status = JOB_DONE
+        self.dirty = True
+        self.checkpoint(force=True)
+
+    def record(self, key: str, state: str, result: Optional[Dict] = None) -> None:
+        """Record the state of one item; it is saved by the next checkpoint"""
+        self.items[key] = {'state': state, 'result': result}
+        self.dirty = True
+
+    def result(self, key: str) -> Optional[Dict]:
+        item = self.items.get(key)
+        return item['result'] if item else None
+
+    def pending_keys(self) -> List[str]:
+        return [key for key, item in self.items.items() if item['state'] != ITEM_DONE]
+
+    def is_done(self, key: str) -> bool:
+        item = self.items.get(key)
+        return bool(item) and item['state'] == ITEM_DONE
+
+    def remaining(self, keys: Iterable[str]) -> List[str]:
+        """Keys that still need to be processed, in the given order"""
+        return [key for key in keys if not self.is_done(key)]
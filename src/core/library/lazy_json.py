@@ -0,0 +1,444 @@
+import json
+import mmap
+import os
+import re
+import threading
+from collections.abc import Mapping, MutableSequence
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+MANGA_KEY = 'backupManga'
+
+KEY = re.compile(rb'"((?:[^"\\]|\\.)*)"\s*:\s*')
+SEPARATOR = re.compile(rb'[\s,]*')
+MIN_WINDOW = 4096
+STRING = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+# Containers nested deeper than this are measured by decoding them instead
+MAX_MATCH_DEPTH = 8
+
+
+def _container_pattern(depth: int):
+    """Regex matching an object or array nested at most depth levels"""
+    pattern = rb'[\[{](?:[^"\[\]{}]++|' + STRING + rb')*+[\]}]'
+    for _ in range(depth - 1):
+        pattern = rb'[\[{](?:[^"\[\]{}]++|' + STRING + rb'|' + pattern + rb')*+[\]}]'
+    return re.compile(pattern)
+
+
+CONTAINER = _container_pattern(MAX_MATCH_DEPTH)
+
+_decoder = json.JSONDecoder()
+
+
+def _decode_value(buffer, pos: int, window: int = MIN_WINDOW) -> Tuple[object, int]:
+    """Decode the JSON value starting at pos, returning it and where it ends
+
+    The value is decoded from a growing window of the map, so only the
+    value itself is ever copied out of it.
+    """
+    while True:
+        chunk = buffer[pos:pos + window]
+        try:
+            text = chunk.decode('utf-8')
+        except UnicodeDecodeError as e:
+            text = chunk[:e.start].decode('utf-8')
+        try:
+            value, end = _decoder.raw_decode(text)
+        except json.JSONDecodeError:
+            if pos + window >= len(buffer):
+                raise
+            window *= 4
+            continue
+
+        if text.isascii():
+            return value, pos + end
+        return value, pos + len(text[:end].encode('utf-8'))
+
+
+def _value_end(buffer, pos: int, window: int = MIN_WINDOW) -> int:
+    """Find where the JSON value starting at pos ends without building it
+
+    Objects and arrays are matched by a regex that skips over strings.
+    Other values, and containers nested too deep for it, are decoded and
+    thrown away.
+    """
+    match = CONTAINER.match(buffer, pos)
+    if match:
+        return match.end()
+    return _decode_value(buffer, pos, window)[1]
+
+
+def iter_entries(manga_list):
+    """Iterate a manga list, streaming a lazy one without keeping its entries parsed"""
+    return manga_list.stream() if isinstance(manga_list, LazyMangaList) else iter(manga_list)
+
+
+class RawEntry:
+    """Byte span of an entry that has not been parsed yet"""
+
+    __slots__ = ('start', 'end')
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+
+
+class LazyMangaList(MutableSequence):
+    """backupManga array that finds and parses each entry the first time it is used
+
+    Entries are located by scanning the map only as far as they have been
+    read, and reading an entry the scan has not reached yet decodes it once
+    to both find its end and return it. len() and changes to the list
+    scan to the end, skipping entries without building them. Every read of
+    the map happens under the backup's lock, so a worker iterating the
+    list never sees the map while a dump swaps it out.
+    """
+
+    def __init__(self, buffer, start: Optional[int], lock=None):
+        self.buffer = buffer
+        self.items = []
+        self.lock = lock or threading.RLock()
+        self.window = MIN_WINDOW
+        # Offset of the next entry to locate, just past the opening bracket
+        self.scan_offset = start + 1 if start is not None else 0
+        self.complete = start is None
+
+    def __len__(self):
+        with self.lock:
+            self._scan_to(None)
+            return len(self.items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        with self.lock:
+            if index < 0:
+                self._scan_to(None)
+            else:
+                self._scan_to(index, parse=True)
+            item = self.items[index]
+            if isinstance(item, RawEntry):
+                item = json.loads(self.buffer[item.start:item.end])
+                self.items[index] = item
+            return item
+
+    def __setitem__(self, index, value):
+        with self.lock:
+            self._scan_to(None)
+            self.items[index] = value
+
+    def __delitem__(self, index):
+        with self.lock:
+            self._scan_to(None)
+            del self.items[index]
+
+    def insert(self, index, value):
+        with self.lock:
+            self._scan_to(None)
+            self.items.insert(index, value)
+
+    def _scan_to(self, index: Optional[int], parse: bool = False) -> None:
+        """Locate entries until index exists, or all of them for None
+
+        With parse set, the entry at index, or every entry for None, is
+        decoded while it is located and kept parsed. The caller holds the
+        lock.
+        """
+        while not self.complete and (index is None or index >= len(self.items)):
+            keep = parse and (index is None or index == len(self.items))
+            value = self._scan_next(keep)
+            if keep and not self.complete:
+                self.items[-1] = value
+
+    def _scan_next(self, parse: bool):
+        """Locate the next entry, returning it decoded if parse is set"""
+        pos = SEPARATOR.match(self.buffer, self.scan_offset).end()
+        if self.buffer[pos:pos + 1] in (b']', b''):
+            self.scan_offset = pos + 1
+            self.complete = True
+            return None
+        if parse:
+            value, end = _decode_value(self.buffer, pos, self.window)
+        else:
+            value, end = None, _value_end(self.buffer, pos, self.window)
+        self.items.append(RawEntry(pos, end))
+        self.window = max(MIN_WINDOW, 2 * (end - pos))
+        self.scan_offset = end
+        return value
+
+    def find(self, key: str, value):
+        """First entry whose key equals value, parsing only likely candidates"""
+        # Backups may store non-ASCII text escaped or as raw UTF-8
+        needles = {json.dumps(value).encode('utf-8'), json.dumps(value, ensure_ascii=False).encode('utf-8')}
+        index = 0
+        while True:
+            with self.lock:
+                self._scan_to(index)
+                if index >= len(self.items):
+                    return None
+                item = self.items[index]
+                if isinstance(item, RawEntry):
+                    raw = self.buffer[item.start:item.end]
+                    if not any(needle in raw for needle in needles):
+                        index += 1
+                        continue
+                manga = self[index]
+            if manga.get(key) == value:
+                return manga
+            index += 1
+
+    def stream(self):
+        """Iterate over entries without keeping newly parsed ones in memory"""
+        index = 0
+        while True:
+            with self.lock:
+                if index >= len(self.items):
+                    if self.complete:
+                        return
+                    item = self._scan_next(parse=True)
+                    if self.complete:
+                        return
+                else:
+                    item = self.items[index]
+                    if isinstance(item, RawEntry):
+                        item = json.loads(self.buffer[item.start:item.end])
+            yield item
+            index += 1
+
+    def parsed_count(self) -> int:
+        """Number of entries parsed so far"""
+        with self.lock:
+            return sum(1 for item in self.items if not isinstance(item, RawEntry))
+
+    def raw(self, index) -> bytes:
+        """Original JSON text of an entry, or None once it has been parsed"""
+        with self.lock:
+            self._scan_to(None if index < 0 else index)
+            item = self.items[index]
+            if isinstance(item, RawEntry):
+                return self.buffer[item.start:item.end]
+            return None
+
+    def materialize(self) -> None:
+        """Parse every entry that has not been read yet"""
+        with self.lock:
+            self._scan_to(None, parse=True)
+            for index, item in enumerate(self.items):
+                if isinstance(item, RawEntry):
+                    self.items[index] = json.loads(self.buffer[item.start:item.end])
+
+    def rebind(self, buffer, spans: List[Tuple[int, int]]) -> None:
+        """Point unparsed entries at a rewritten copy of the same list"""
+        with self.lock:
+            self.buffer = buffer
+            for item, (start, end) in zip(self.items, spans):
+                if isinstance(item, RawEntry):
+                    item.start = start
+                    item.end = end
+
+
+class LazyBackup(Mapping):
+    """JSON backup memory-mapped and indexed as it is read, parsed on demand
+
+    Opening scans only the top-level keys up to backupManga. Its elements
+    are located as they are read, and keys after it are found once the
+    list has been scanned to its end. Other values and individual manga
+    are parsed when they are first read, so memory grows with the entries
+    actually touched.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.is_array = False
+        self.values: Dict = {}
+        self.lock = threading.RLock()
+        self._open()
+        self.spans: Dict[str, Tuple[int, int]] = {}
+        self.manga_start = None
+        self._scan_keys(SEPARATOR.match(self.buffer, 0).end(), first=True)
+        self.manga_list = LazyMangaList(self.buffer, self.manga_start, self.lock)
+        self.values[MANGA_KEY] = self.manga_list
+
+    def _open(self):
+        self.file = open(self.path, 'rb')
+        if os.fstat(self.file.fileno()).st_size:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.buffer = b''
+
+    def __getitem__(self, key):
+        with self.lock:
+            if key not in self.spans:
+                self._scan_rest()
+            if key not in self.values:
+                start, end = self.spans[key]
+                self.values[key] = json.loads(self.buffer[start:end])
+            return self.values[key]
+
+    def __iter__(self):
+        with self.lock:
+            self._scan_rest()
+        return iter(self.spans)
+
+    def __len__(self):
+        with self.lock:
+            self._scan_rest()
+        return len(self.spans)
+
+    def __setitem__(self, key, value):
+        with self.lock:
+            if key not in self.spans:
+                self._scan_rest()
+                self.spans[key] = (0, 0)
+            self.values[key] = value
+
+    def close(self) -> None:
+        """Parse whatever is still unread and release the file
+
+        The backup stays usable in memory, so workers still reading it are
+        unaffected and the file can be replaced or deleted.
+        """
+        with self.lock:
+            self._scan_rest()
+            manga_list = self.values.get(MANGA_KEY)
+            if isinstance(manga_list, LazyMangaList):
+                manga_list.materialize()
+            for key in self.spans:
+                self[key]
+            self._release()
+
+    def _release(self) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.buffer = b''
+        if not self.file.closed:
+            self.file.close()
+
+    def dump(self, path) -> None:
+        """Write the backup, copying untouched entries byte for byte
+
+        The file is written next to the target and moved into place, since
+        the source may be the file that is currently mapped. The offsets
+        written are kept, so the new file is never scanned again.
+        """
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with self.lock:
+            self._scan_rest()
+            with open(tmp_path, 'wb') as f:
+                writer = _OffsetWriter(f)
+                if self.is_array:
+                    manga_spans = self._dump_manga(writer)
+                    spans = {MANGA_KEY: (0, writer.offset)}
+                else:
+                    spans, manga_spans = self._dump_object(writer)
+
+            if path != self.path:
+                os.replace(tmp_path, path)
+                return
+
+            self._release()
+            os.replace(tmp_path, path)
+            self._open()
+            self.spans = spans
+
+            # The same list object is kept, so parsed entries and any
+            # worker iterating it stay valid
+            manga_list = self.values[MANGA_KEY]
+            if isinstance(manga_list, LazyMangaList):
+                manga_list.rebind(self.buffer, manga_spans)
+
+    def _dump_object(self, writer) -> Tuple[Dict[str, Tuple[int, int]], List[Tuple[int, int]]]:
+        spans = {}
+        manga_spans = []
+        writer.write(b'{')
+        for i, key in enumerate(self.spans):
+            if i:
+                writer.write(b',')
+            writer.write(json.dumps(key).encode('utf-8') + b':')
+            start = writer.offset
+            if key == MANGA_KEY:
+                manga_spans = self._dump_manga(writer)
+            elif key in self.values:
+                writer.write(json.dumps(self.values[key]).encode('utf-8'))
+            else:
+                value_start, value_end = self.spans[key]
+                writer.write(self.buffer[value_start:value_end])
+            spans[key] = (start, writer.offset)
+        writer.write(b'}')
+        return spans, manga_spans
+
+    def _dump_manga(self, writer) -> List[Tuple[int, int]]:
+        manga_list = self.values[MANGA_KEY]
+        spans = []
+        writer.write(b'[')
+        for i in range(len(manga_list)):
+            if i:
+                writer.write(b',')
+            raw = manga_list.raw(i) if isinstance(manga_list, LazyMangaList) else None
+            start = writer.offset
+            writer.write(raw if raw is not None else json.dumps(manga_list[i]).encode('utf-8'))
+            spans.append((start, writer.offset))
+        writer.write(b']')
+        return spans
+
+    def _scan_keys(self, pos: int, first: bool = False) -> None:
+        """Index top-level values from pos, stopping at the start of backupManga"""
+        buffer = self.buffer
+        if first:
+            if buffer[pos:pos + 1] == b'[':
+                self.is_array = True
+                self.manga_start = pos
+                self.spans[MANGA_KEY] = (pos, pos)
+                return
+            if buffer[pos:pos + 1] != b'{':
+                raise ValueError("Backup is not a JSON object or array")
+            pos += 1
+
+        while True:
+            pos = SEPARATOR.match(buffer, pos).end()
+            if buffer[pos:pos + 1] in (b'}', b''):
+                break
+            key_match = KEY.match(buffer, pos)
+            if not key_match:
+                raise ValueError(f"Invalid JSON at offset {pos}")
+            key = json.loads(b'"' + key_match.group(1) + b'"')
+            pos = key_match.end()
+
+            if key == MANGA_KEY and buffer[pos:pos + 1] == b'[':
+                # Placeholder keeping the key order; the end is found by the list
+                self.manga_start = pos
+                self.spans[key] = (pos, pos)
+                return
+            end = _value_end(buffer, pos)
+            self.spans[key] = (pos, end)
+            pos = end
+
+        if MANGA_KEY not in self.spans:
+            self.spans[MANGA_KEY] = (0, 0)
+
+    def _scan_rest(self) -> None:
+        """Scan backupManga to its end and index the keys after it; caller holds the lock"""
+        if self.manga_start is None:
+            return
+        self.manga_list._scan_to(None)
+        end = self.manga_list.scan_offset
+        self.spans[MANGA_KEY] = (self.manga_start, end)
+        self.manga_start = None
+        if not self.is_array:
+            self._scan_keys(end)
+
+
+class _OffsetWriter:
+    """File wrapper counting the bytes written through it"""
+
+    __slots__ = ('file', 'offset')
+
+    def __init__(self, file):
+        self.file = file
+        self.offset = 0
+
+    def write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.offset += len(data)
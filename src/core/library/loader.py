@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .lazy_json import LazyBackup
+
+MANGA_KEY = 'backupManga'
+CHUNK_SIZE = 200
+READ_BLOCK = 1 << 20
+
+
+class LoadCancelled(Exception):
+    """Raised by a backup load that was cancelled"""
+
+
+class LoadProgress:
+    __slots__ = ('bytes_read', 'total_bytes', 'entries')
+
+    def __init__(self, bytes_read: int, total_bytes: int, entries: int):
+        self.bytes_read = bytes_read
+        self.total_bytes = total_bytes
+        self.entries = entries
+
+    @property
+    def fraction(self) -> float:
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+
+    def describe(self) -> str:
+        return (f"Loading backup: {self.bytes_read / READ_BLOCK:.1f}/{self.total_bytes / READ_BLOCK:.1f} MB, "
+                f"{self.entries} entries")
+
+
+class BackupLoader:
+    """Parses a backup on a worker, handing out entries in chunks as it goes
+
+    JSON backups are opened lazily and read entry by entry in file order.
+    Each entry is located and decoded in one step, so nothing is parsed
+    twice, and the offset the read has reached is the progress from the
+    first entry on. Other files are read in blocks and decoded whole. A
+    cancelled load stops at the next block or entry and raises
+    LoadCancelled.
+    """
+
+    def __init__(self, path, on_chunk: Optional[Callable[[List[Dict]], None]] = None,
+                 on_progress: Optional[Callable[[LoadProgress], None]] = None,
+                 chunk_size: int = CHUNK_SIZE):
+        self.path = Path(path)
+        self.on_chunk = on_chunk
+        self.on_progress = on_progress
+        self.chunk_size = chunk_size
+        self.cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def run(self):
+        """Load the backup, returning it once every entry has been parsed"""
+        total_bytes = os.path.getsize(self.path)
+        if self.path.suffix != '.json':
+            return self._load_whole(total_bytes)
+
+        backup = LazyBackup(self.path)
+        try:
+            manga_list = backup[MANGA_KEY]
+            chunk = []
+            entries = 0
+            # Iterating never asks for len(), which would scan the whole list up front
+            for manga in manga_list:
+                chunk.append(manga)
+                entries += 1
+                if len(chunk) >= self.chunk_size:
+                    self._publish(chunk, manga_list.scan_offset, total_bytes, entries)
+                    chunk = []
+                self._check()
+            self._publish(chunk, total_bytes, total_bytes, entries)
+        except BaseException:
+            backup.close()
+            raise
+        return backup
+
+    def _load_whole(self, total_bytes: int):
+        data = bytearray()
+        with open(self.path, 'rb') as f:
+            for block in iter(lambda: f.read(READ_BLOCK), b''):
+                self._check()
+                data += block
+                self._report(len(data), total_bytes, 0)
+
+        backup = json.loads(data)
+        manga_list = backup.get(MANGA_KEY, [])
+        for start in range(0, len(manga_list), self.chunk_size):
+            self._check()
+            end = start + self.chunk_size
+            self._publish(manga_list[start:end], total_bytes, total_bytes, min(end, len(manga_list)))
+        return backup
+
+    def _check(self):
+        if self.cancelled.is_set():
+            raise LoadCancelled(f"Loading {self.path.name} was cancelled")
+
+    def _publish(self, chunk: List[Dict], bytes_read: int, total_bytes: int, entries: int):
+        if chunk and self.on_chunk:
+            self.on_chunk(chunk)
+        self._report(bytes_read, total_bytes, entries)
+
+    def _report(self, bytes_read: int, total_bytes: int, entries: int):
+        if self.on_progress:
+            self.on_progress(LoadProgress(bytes_read, total_bytes, entries))
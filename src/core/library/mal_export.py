@@ -0,0 +1,81 @@
+from pathlib import Path
+from typing import Dict, Iterable
+from xml.sax.saxutils import escape
+
+from .backup import MAL_SYNC_ID, get_tracking
+from .lazy_json import iter_entries
+
+# List status names used by MAL's XML export for Mihon status codes
+MAL_EXPORT_STATUS = {
+    1: 'Reading',
+    2: 'Completed',
+    3: 'On-Hold',
+    4: 'Dropped',
+    5: 'Plan to Read',
+    6: 'Plan to Read'
+}
+EXPORT_TYPE_MANGA = 2
+
+
+def export_entries(manga_list, extra: Iterable = (), sync_id: int = MAL_SYNC_ID) -> Dict[int, tuple]:
+    """Title, status, chapters and score per tracker id, merging duplicates
+
+    extra takes TrackRequests for matched entries that are not tracked yet.
+    """
+    entries = {}
+
+    def merge(manga_id, title, status, chapters, score):
+        current = entries.get(manga_id)
+        if current:
+            chapters = max(chapters, current[2])
+            score = score or current[3]
+            title, status = current[0], current[1]
+        entries[manga_id] = (title, status, chapters, score)
+
+    for manga in iter_entries(manga_list):
+        tracking = get_tracking(manga, sync_id)
+        if not tracking or not tracking.get('mediaId'):
+            continue
+        merge(
+            int(tracking['mediaId']),
+            manga.get('title', ''),
+            MAL_EXPORT_STATUS.get(tracking.get('status'), 'Plan to Read'),
+            int(tracking.get('lastChapterRead', 0)),
+            int(tracking.get('score', 0) or 0)
+        )
+
+    for request in extra:
+        title = request.entries[0].get('title', '') if request.entries else ''
+        merge(request.manga_id, title, 'Plan to Read', request.read_chapters, 0)
+    return entries
+
+
+def write_mal_export(path, manga_list, extra: Iterable = (), username: str = '') -> int:
+    """Write a MAL list import file, one entry at a time, and return the entry count"""
+    entries = export_entries(manga_list, extra)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8" ?>\n<myanimelist>\n')
+        f.write('\t<myinfo>\n')
+        f.write(f'\t\t<user_name>{escape(username)}</user_name>\n')
+        f.write(f'\t\t<user_export_type>{EXPORT_TYPE_MANGA}</user_export_type>\n')
+        f.write(f'\t\t<user_total_manga>{len(entries)}</user_total_manga>\n')
+        f.write('\t</myinfo>\n')
+
+        for manga_id, (title, status, chapters, score) in entries.items():
+            f.write(
+                '\t<manga>\n'
+                f'\t\t<manga_mangadb_id>{manga_id}</manga_mangadb_id>\n'
+                f'\t\t<manga_title>{escape(title)}</manga_title>\n'
+                '\t\t<my_read_volumes>0</my_read_volumes>\n'
+                f'\t\t<my_read_chapters>{chapters}</my_read_chapters>\n'
+                f'\t\t<my_score>{score}</my_score>\n'
+                f'\t\t<my_status>{status}</my_status>\n'
+                '\t\t<update_on_import>1</update_on_import>\n'
+                '\t</manga>\n'
+            )
+
+        f.write('</myanimelist>\n')
+    return len(entries)
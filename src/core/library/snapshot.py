@@ -0,0 +1,98 @@
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+SNAPSHOT_MAGIC = b'MTSNAP'
+SNAPSHOT_VERSION = 1
+HEADER_FORMAT = '<6sBBI'
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def fingerprint(path) -> Dict:
+    """Size, modification time and content hash of a source file"""
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if stat.st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                digest.update(buffer)
+    return {
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'hash': digest.hexdigest()
+    }
+
+
+class SnapshotCache:
+    """Binary snapshots of the processed library, keyed by source fingerprint
+
+    A snapshot is a small JSON header followed by a marshal payload. It is
+    read straight from a memory map, and any change to the source file's
+    size, mtime or content makes it miss.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = cache_dir or Path.home() / '.mihontracker' / 'cache'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def snapshot_path(self, source) -> Path:
+        key = hashlib.blake2b(str(Path(source).resolve()).encode('utf-8'), digest_size=8).hexdigest()
+        return self.cache_dir / f'{key}.snap'
+
+    def load(self, source) -> Optional[Dict]:
+        """Load the snapshot for a source file if it is still current"""
+        path = self.snapshot_path(source)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                header_size = struct.calcsize(HEADER_FORMAT)
+                magic, version, marshal_version, meta_size = struct.unpack_from(HEADER_FORMAT, buffer)
+                if (magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION
+                        or marshal_version != marshal.version):
+                    return None
+
+                meta = json.loads(buffer[header_size:header_size + meta_size])
+                stat = os.stat(source)
+                if meta['size'] != stat.st_size or meta['mtime'] != stat.st_mtime_ns:
+                    return None
+                if meta['hash'] != fingerprint(source)['hash']:
+                    return None
+
+                with memoryview(buffer) as view:
+                    return marshal.loads(view[header_size + meta_size:])
+        except Exception as e:
+            print(f"Failed to load snapshot for {source}: {str(e)}")
+            return None
+
+    def save(self, source, model: Dict) -> None:
+        """Write a snapshot of the processed library for a source file"""
+        meta = json.dumps(fingerprint(source)).encode('utf-8')
+        payload = marshal.dumps(model)
+
+        path = self.snapshot_path(source)
+        # Saves of the same source may overlap, so each writes its own temp file
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=path.stem, suffix='.tmp',
+                                         delete=False) as f:
+            tmp_path = f.name
+            try:
+                f.write(struct.pack(HEADER_FORMAT, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, marshal.version, len(meta)))
+                f.write(meta)
+                f.write(payload)
+            except BaseException:
+                f.close()
+                os.unlink(tmp_path)
+                raise
+        os.replace(tmp_path, path)
+
+    def invalidate(self, source) -> None:
+        path = self.snapshot_path(source)
+        if path.exists():
+            path.unlink()
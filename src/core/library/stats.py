@@ -0,0 +1,114 @@
+from collections import Counter
+from typing import Dict, Optional
+
+from .backup import entry_key, get_tracking, read_chapters
+
+# Tracking status names for the status codes Mihon stores
+TRACKING_STATUS_NAMES = {
+    1: "Reading",
+    2: "Completed",
+    3: "On Hold",
+    4: "Dropped",
+    5: "Plan to Read",
+    6: "Plan to Read"
+}
+UNTRACKED = "Untracked"
+
+
+def summarize_entry(manga: Dict):
+    """Tracking status, Mihon status, read and total chapters of an entry"""
+    tracking = get_tracking(manga)
+    if tracking:
+        total_chapters = tracking.get("totalChapters", "?")
+        chapters_read = tracking.get("lastChapterRead", 0)
+        tracking_status = TRACKING_STATUS_NAMES.get(tracking.get("status", 0), "Unknown")
+    else:
+        total_chapters = len(manga.get("chapters", []))
+        chapters_read = read_chapters(manga)
+        tracking_status = UNTRACKED
+
+    if chapters_read == 0:
+        mihon_status = "Unread"
+    elif chapters_read == total_chapters and total_chapters != "?":
+        mihon_status = "Completed"
+    else:
+        mihon_status = "Started"
+
+    return tracking_status, mihon_status, chapters_read, total_chapters
+
+
+class LibraryStats:
+    """Library totals built in one pass and kept current entry by entry
+
+    The contribution of every entry is remembered, so an edit only
+    subtracts the old contribution and adds the new one.
+    """
+
+    def __init__(self):
+        self.contributions: Dict = {}
+        self.clear()
+
+    def clear(self) -> None:
+        self.contributions.clear()
+        self.tracking_status = Counter()
+        self.mihon_status = Counter()
+        self.chapters_read = 0
+        self.chapters_total = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.contributions)
+
+    @property
+    def untracked(self) -> int:
+        return self.tracking_status[UNTRACKED]
+
+    @property
+    def tracked(self) -> int:
+        return self.total - self.untracked
+
+    def rebuild(self, manga_list) -> None:
+        """Recompute every total from scratch"""
+        self.clear()
+        for manga in manga_list:
+            self.update(manga)
+
+    def update(self, manga: Dict) -> None:
+        """Add an entry, or replace its previous contribution"""
+        self.remove(manga)
+        summary = summarize_entry(manga)
+        self.contributions[entry_key(manga)] = summary
+        self._apply(summary, 1)
+
+    def remove(self, manga: Dict) -> None:
+        summary = self.contributions.pop(entry_key(manga), None)
+        if summary:
+            self._apply(summary, -1)
+
+    def apply_diff(self, diff) -> None:
+        """Update the totals for a LibraryDiff"""
+        for manga in diff.removed:
+            self.remove(manga)
+        for manga in diff.changed + diff.added:
+            self.update(manga)
+
+    def _apply(self, summary, sign: int):
+        tracking_status, mihon_status, chapters_read, total_chapters = summary
+        self.tracking_status[tracking_status] += sign
+        self.mihon_status[mihon_status] += sign
+        self.chapters_read += sign * int(chapters_read or 0)
+        if isinstance(total_chapters, int):
+            self.chapters_total += sign * total_chapters
+
+    def summary(self) -> Optional[str]:
+        """Text for the stats panel"""
+        if not self.total:
+            return None
+        sections = [
+            [f"Entries: {self.total}", f"Tracked: {self.tracked}  Untracked: {self.untracked}"],
+            [f"{status}: {count}" for status, count in sorted(self.tracking_status.items())
+             if count and status != UNTRACKED],
+            [f"{status}: {count}" for status, count in sorted(self.mihon_status.items()) if count],
+            [f"Chapters: {self.chapters_read}/{self.chapters_total}"]
+        ]
+        return "\n\n".join("\n".join(lines) for lines in sections if lines)
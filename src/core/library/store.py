@@ -0,0 +1,208 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .backup import MAL_SYNC_ID, entry_key, read_chapters
+from .lazy_json import iter_entries
+from .stats import summarize_entry
+
+MANGA_KEY = 'backupManga'
+CATEGORIES_KEY = 'backupCategories'
+INSERT_BATCH = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS manga (
+    position INTEGER PRIMARY KEY,
+    source,
+    url TEXT,
+    title TEXT,
+    title_sort TEXT,
+    is_nsfw INTEGER NOT NULL DEFAULT 0,
+    tracking_status TEXT,
+    mihon_status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS manga_key ON manga (source, url);
+CREATE INDEX IF NOT EXISTS manga_title ON manga (title_sort);
+CREATE INDEX IF NOT EXISTS manga_tracking_status ON manga (tracking_status, title_sort);
+CREATE INDEX IF NOT EXISTS manga_mihon_status ON manga (mihon_status, title_sort);
+CREATE TABLE IF NOT EXISTS chapters (
+    position INTEGER PRIMARY KEY REFERENCES manga (position) ON DELETE CASCADE,
+    total INTEGER NOT NULL,
+    read INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS manga_categories (
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL REFERENCES manga (position) ON DELETE CASCADE,
+    PRIMARY KEY (category, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tracking (
+    position INTEGER NOT NULL REFERENCES manga (position) ON DELETE CASCADE,
+    sync_id INTEGER NOT NULL,
+    media_id INTEGER,
+    status INTEGER,
+    last_chapter_read REAL,
+    score REAL,
+    PRIMARY KEY (position, sync_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tracking_media ON tracking (sync_id, media_id);
+"""
+
+SORT_COLUMNS = {
+    'title': 'title_sort',
+    'tracking_status': 'tracking_status',
+    'mihon_status': 'mihon_status'
+}
+
+
+class LibraryStore:
+    """SQLite copy of a backup, indexed for the filters, sorts and lookups the UI runs
+
+    Rows are addressed by entry key, the (source, url) pair cards are
+    keyed by. The source column has no declared type, so sources come back
+    exactly as the backup stored them. Each thread gets its own connection
+    and the database runs in WAL mode, so a reload on a worker never blocks
+    queries from the UI.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or Path.home() / '.mihontracker' / 'library.db'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.local = threading.local()
+        self.write_lock = threading.Lock()
+        with self.connection() as db:
+            db.executescript(SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        db = getattr(self.local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('PRAGMA foreign_keys=ON')
+            self.local.db = db
+        return db
+
+    def close(self) -> None:
+        db = getattr(self.local, 'db', None)
+        if db is not None:
+            db.close()
+            self.local.db = None
+
+    def source(self) -> Optional[Dict]:
+        """Fingerprint of the backup the store was last loaded from"""
+        row = self.connection().execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def load_backup(self, backup, source: Optional[Dict] = None) -> int:
+        """Replace the store's contents with a backup in one transaction"""
+        manga_list = backup.get(MANGA_KEY, [])
+        other = {key: backup[key] for key in backup if key != MANGA_KEY}
+
+        with self.write_lock, self.connection() as db:
+            for table in ('tracking', 'manga_categories', 'chapters', 'manga', 'categories'):
+                db.execute(f'DELETE FROM {table}')
+            db.execute('DELETE FROM meta')
+            db.executemany(
+                'INSERT INTO categories (id, name) VALUES (?, ?)',
+                [(str(i), category.get('name', '')) for i, category in enumerate(other.get(CATEGORIES_KEY, []))]
+            )
+            db.executemany(
+                'INSERT INTO meta (key, value) VALUES (?, ?)',
+                [('backup', json.dumps(other)), ('source', json.dumps(source))]
+            )
+
+            batch = []
+            for position, manga in enumerate(iter_entries(manga_list)):
+                batch.append((position, manga))
+                if len(batch) >= INSERT_BATCH:
+                    self._insert(db, batch)
+                    batch = []
+            self._insert(db, batch)
+        return len(manga_list)
+
+    def update_entries(self, entries: Iterable[Dict]) -> None:
+        """Rewrite the rows of entries that were edited in place"""
+        with self.write_lock, self.connection() as db:
+            batch = []
+            for manga in entries:
+                source, url = entry_key(manga)
+                row = db.execute(
+                    'SELECT position FROM manga WHERE source IS ? AND url IS ?', (source, url)
+                ).fetchone()
+                if row:
+                    db.execute('DELETE FROM manga WHERE position = ?', row)
+                    batch.append((row[0], manga))
+            self._insert(db, batch)
+
+    def _insert(self, db: sqlite3.Connection, batch: List[Tuple[int, Dict]]) -> None:
+        manga_rows = []
+        chapter_rows = []
+        category_rows = []
+        tracking_rows = []
+        for position, manga in batch:
+            source, url = entry_key(manga)
+            title = manga.get('title', '')
+            tracking_status, mihon_status, _, _ = summarize_entry(manga)
+            manga_rows.append((
+                position, source, url, title, title.lower(), int(bool(manga.get('isNsfw'))),
+                tracking_status, mihon_status, json.dumps(manga)
+            ))
+            chapter_rows.append((position, len(manga.get('chapters', [])), read_chapters(manga)))
+            category_rows.extend((str(category), position) for category in set(manga.get('categories', [])))
+            tracking_rows.extend(
+                (position, tracking.get('syncId'), tracking.get('mediaId'), tracking.get('status'),
+                 tracking.get('lastChapterRead'), tracking.get('score'))
+                for tracking in manga.get('tracking', [])
+                if tracking.get('syncId') is not None
+            )
+
+        db.executemany('INSERT INTO manga VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', manga_rows)
+        db.executemany('INSERT INTO chapters VALUES (?, ?, ?)', chapter_rows)
+        db.executemany('INSERT INTO manga_categories VALUES (?, ?)', category_rows)
+        db.executemany('INSERT OR REPLACE INTO tracking VALUES (?, ?, ?, ?, ?, ?)', tracking_rows)
+
+    def query(self, hide_nsfw: bool = False, category: Optional[str] = None,
+              sort: Optional[str] = None, reverse: bool = False) -> List[Tuple]:
+        """Entry keys passing the filters, in backup order or sorted by one column"""
+        sql = 'SELECT source, url FROM manga'
+        where = []
+        params = []
+        if category is not None:
+            sql += ' JOIN manga_categories USING (position)'
+            where.append('manga_categories.category = ?')
+            params.append(category)
+        if hide_nsfw:
+            where.append('is_nsfw = 0')
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+
+        order = 'position'
+        if sort in SORT_COLUMNS:
+            direction = 'DESC' if reverse else 'ASC'
+            order = f'{SORT_COLUMNS[sort]} {direction}, position'
+        sql += f' ORDER BY {order}'
+        return self._keys(self.connection().execute(sql, params))
+
+    def untracked(self, sync_id: int = MAL_SYNC_ID) -> List[Tuple]:
+        """Entry keys with no tracking record for a tracker, in backup order"""
+        return self._keys(self.connection().execute(
+            'SELECT source, url FROM manga WHERE NOT EXISTS '
+            '(SELECT 1 FROM tracking WHERE tracking.position = manga.position AND sync_id = ?) '
+            'ORDER BY position',
+            (sync_id,)
+        ))
+
+    @staticmethod
+    def _keys(cursor) -> List[Tuple]:
+        return [(source, url) for source, url in cursor]
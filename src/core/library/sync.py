@@ -0,0 +1,187 @@
+from typing import Dict, List, Optional
+
+from core.trackers.base import BaseTracker
+from core.trackers.models import ListStatus
+from .backup import MAL_SYNC_ID, MAL_STATUS_CODES, read_chapters, get_tracking
+
+CONFLICT_MAX = 'max'
+CONFLICT_LOCAL = 'local'
+CONFLICT_REMOTE = 'remote'
+CONFLICT_POLICIES = (CONFLICT_MAX, CONFLICT_LOCAL, CONFLICT_REMOTE)
+
+PUSH = 'push'
+PULL = 'pull'
+
+
+class SyncUpdate:
+    """Progress change for one tracked manga"""
+
+    __slots__ = ('manga_id', 'direction', 'chapters', 'status', 'score')
+
+    def __init__(self, manga_id: int, direction: str, chapters: int,
+                 status: Optional[str] = None, score: Optional[int] = None):
+        self.manga_id = manga_id
+        self.direction = direction
+        self.chapters = chapters
+        self.status = status
+        self.score = score
+
+    def __repr__(self):
+        return f"SyncUpdate({self.manga_id}, {self.direction}, {self.chapters})"
+
+
+class SyncPlan:
+    """Updates needed to bring local and remote progress in line"""
+
+    def __init__(self):
+        self.push: List[SyncUpdate] = []
+        self.pull: List[SyncUpdate] = []
+
+    def __len__(self):
+        return len(self.push) + len(self.pull)
+
+
+class SyncPlanner:
+    """Compares Mihon read state with the tracker list in bulk"""
+
+    def __init__(self, policy: str = CONFLICT_MAX, sync_id: int = MAL_SYNC_ID):
+        if policy not in CONFLICT_POLICIES:
+            raise ValueError(f"Unknown conflict policy: {policy}")
+        self.policy = policy
+        self.sync_id = sync_id
+
+    def local_progress(self, manga_list: List[Dict]) -> Dict[int, int]:
+        """Chapters read per tracked manga id, from read flags or the tracking record
+
+        A pull only writes lastChapterRead, so it counts as progress too;
+        otherwise the same pull would be planned on every sync.
+        """
+        progress = {}
+        for manga in manga_list:
+            tracking = get_tracking(manga, self.sync_id)
+            if not tracking or not tracking.get('mediaId'):
+                continue
+            manga_id = int(tracking['mediaId'])
+            chapters = max(read_chapters(manga), int(tracking.get('lastChapterRead') or 0))
+            progress[manga_id] = max(progress.get(manga_id, 0), chapters)
+        return progress
+
+    def recorded_progress(self, manga_list: List[Dict]) -> Dict[int, int]:
+        """Lowest lastChapterRead per tracked manga id over its linked records"""
+        recorded = {}
+        for manga in manga_list:
+            tracking = get_tracking(manga, self.sync_id)
+            if not tracking or not tracking.get('mediaId'):
+                continue
+            manga_id = int(tracking['mediaId'])
+            chapters = int(tracking.get('lastChapterRead') or 0)
+            recorded[manga_id] = min(recorded.get(manga_id, chapters), chapters)
+        return recorded
+
+    def plan(self, manga_list: List[Dict], remote_entries: Dict[int, ListStatus]) -> SyncPlan:
+        """Compute the minimal set of updates in each direction"""
+        plan = SyncPlan()
+        recorded = self.recorded_progress(manga_list)
+        for manga_id, local in self.local_progress(manga_list).items():
+            list_status = remote_entries.get(manga_id)
+            remote = list_status.num_chapters_read if list_status else None
+
+            if remote is None:
+                if local and self.policy != CONFLICT_REMOTE:
+                    plan.push.append(SyncUpdate(manga_id, PUSH, local))
+                continue
+            if local == remote:
+                continue
+
+            if self.policy == CONFLICT_LOCAL or (self.policy == CONFLICT_MAX and local > remote):
+                plan.push.append(SyncUpdate(manga_id, PUSH, local))
+            elif recorded.get(manga_id) != remote:
+                plan.pull.append(SyncUpdate(
+                    manga_id,
+                    PULL,
+                    remote,
+                    status=list_status.status,
+                    score=list_status.score
+                ))
+        return plan
+
+
+class TrackRequest:
+    """Library entries to link to one tracker id"""
+
+    __slots__ = ('manga_id', 'entries', 'read_chapters')
+
+    def __init__(self, manga_id: int, entries: List[Dict], read_chapters: int = 0):
+        self.manga_id = int(manga_id)
+        self.entries = entries
+        self.read_chapters = read_chapters
+
+
+def plan_tracking(requests: List[TrackRequest], remote_entries: Dict[int, ListStatus]) -> List[SyncUpdate]:
+    """Updates needed for entries missing from the remote list or behind on it"""
+    local = {}
+    for request in requests:
+        local[request.manga_id] = max(local.get(request.manga_id, 0), request.read_chapters)
+
+    updates = []
+    for manga_id, chapters in local.items():
+        list_status = remote_entries.get(manga_id)
+        if list_status is None:
+            updates.append(SyncUpdate(manga_id, PUSH, chapters, status='plan_to_read'))
+        elif chapters > list_status.num_chapters_read:
+            updates.append(SyncUpdate(manga_id, PUSH, chapters))
+    return updates
+
+
+def apply_tracking(requests: List[TrackRequest], remote_entries: Dict[int, ListStatus],
+                   sync_id: int = MAL_SYNC_ID) -> int:
+    """Write tracking records for every request, reflecting the remote list"""
+    written = 0
+    for request in requests:
+        list_status = remote_entries.get(request.manga_id) or ListStatus()
+        record = {
+            'syncId': sync_id,
+            'mediaId': request.manga_id,
+            'status': MAL_STATUS_CODES.get(list_status.status, MAL_STATUS_CODES['plan_to_read']),
+            'score': list_status.score,
+            'lastChapterRead': max(request.read_chapters, list_status.num_chapters_read)
+        }
+        for manga in request.entries:
+            if get_tracking(manga, sync_id):
+                continue
+            manga.setdefault('tracking', []).append(dict(record))
+            written += 1
+    return written
+
+
+def fetch_remote_list(tracker: BaseTracker) -> Dict[int, ListStatus]:
+    """Fetch the list status of every entry on the user's list"""
+    return {
+        entry.manga.id: entry.list_status or ListStatus()
+        for entry in tracker.iter_user_manga_list(fields='list_status')
+    }
+
+
+def apply_plan(plan: SyncPlan, manga_list: List[Dict], outbox, sync_id: int = MAL_SYNC_ID) -> List[Dict]:
+    """Queue pushes on the outbox and patch tracking records, returning the patched entries"""
+    with outbox.batch():
+        for update in plan.push:
+            outbox.update(update.manga_id, num_chapters_read=update.chapters)
+
+    updates = {update.manga_id: update for update in plan.push + plan.pull}
+    patched = []
+    for manga in manga_list:
+        tracking = get_tracking(manga, sync_id)
+        if not tracking or not tracking.get('mediaId'):
+            continue
+        update = updates.get(int(tracking['mediaId']))
+        if update is None:
+            continue
+
+        tracking['lastChapterRead'] = update.chapters
+        if update.status in MAL_STATUS_CODES:
+            tracking['status'] = MAL_STATUS_CODES[update.status]
+        if update.score is not None:
+            tracking['score'] = update.score
+        patched.append(manga)
+    return patched
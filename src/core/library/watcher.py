@@ -0,0 +1,101 @@
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+WATCH_DEBOUNCE = 2.0
+# Mihon's own auto-backups are gzipped protobuf (.tachibk), which the loader
+# cannot read yet, so directory mode only picks up JSON exports
+BACKUP_SUFFIX = '.json'
+
+
+class BackupWatcher(FileSystemEventHandler):
+    """Watches a backup file, or a directory of JSON exports, for new writes
+
+    Bursts of events are debounced so the callback only fires once a write
+    has settled. Writes made by the app itself can be skipped with
+    mark_seen.
+    """
+
+    def __init__(self, path, on_change: Callable[[Path], None], debounce: float = WATCH_DEBOUNCE):
+        super().__init__()
+        self.path = Path(path)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.timer: Optional[threading.Timer] = None
+        self.lock = threading.Lock()
+        self.seen = {}
+        self.observer = None
+
+    def start(self) -> None:
+        self.mark_seen()
+        directory = self.path if self.path.is_dir() else self.path.parent
+        self.observer = Observer()
+        self.observer.schedule(self, str(directory), recursive=False)
+        self.observer.daemon = True
+        self.observer.start()
+
+    def stop(self) -> None:
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+        if self.observer:
+            self.observer.stop()
+            self.observer.join(timeout=1)
+            self.observer = None
+
+    def current_file(self) -> Optional[Path]:
+        """The backup that should be loaded, the newest one in directory mode"""
+        if not self.path.is_dir():
+            return self.path if self.path.exists() else None
+        backups = [p for p in self.path.iterdir() if p.suffix == BACKUP_SUFFIX]
+        return max(backups, key=lambda p: p.stat().st_mtime_ns, default=None)
+
+    def mark_seen(self, path=None) -> None:
+        """Remember the current state of a file so it does not trigger a reload"""
+        path = Path(path) if path else self.current_file()
+        if path and path.exists():
+            self.seen[str(path)] = self._signature(path)
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        paths = [event.src_path, getattr(event, 'dest_path', '')]
+        if not any(self._is_watched(p) for p in paths if p):
+            return
+
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.debounce, self._settled)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def _is_watched(self, path: str) -> bool:
+        if self.path.is_dir():
+            return path.endswith(BACKUP_SUFFIX)
+        return Path(path) == self.path
+
+    def _settled(self):
+        with self.lock:
+            self.timer = None
+        path = self.current_file()
+        if not path:
+            return
+        try:
+            signature = self._signature(path)
+        except OSError:
+            return
+        if self.seen.get(str(path)) == signature:
+            return
+        self.seen[str(path)] = signature
+        self.on_change(path)
+
+    @staticmethod
+    def _signature(path: Path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
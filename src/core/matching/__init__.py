@@ -0,0 +1,6 @@
+from .titles import clean_title, titles_match, strip_noise, main_title, title_score
+from .search import TitleIndex, normalize_query
+from .planner import QueryPlanner, MatchResult
+
+__all__ = ['clean_title', 'titles_match', 'strip_noise', 'main_title', 'title_score',
+           'TitleIndex', 'normalize_query', 'QueryPlanner', 'MatchResult']
@@ -0,0 +1,335 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from fuzzywuzzy import fuzz
+
+from core.trackers.mal_tracker import MALMangaTracker
+from core.trackers.models import AlternativeTitles, Entry, Manga, Page
+from .planner import MATCH_THRESHOLD, STRATEGY_RAW, MatchResult, QueryPlanner
+from .titles import clean_title, title_score
+
+# Searches from the app are capped by the tracker, so replay them the same way
+SEARCH_LIMIT = MALMangaTracker.search_page_size
+SEARCH_WORKERS = 4
+
+# Never written, since the benchmark does not save what the planner learns
+PLANNER_STATS = Path(tempfile.gettempdir()) / 'mt-bench-query-stats.json'
+
+# Word pools for the simulated dataset
+TITLE_WORDS = [
+    'shadow', 'tower', 'academy', 'sword', 'dragon', 'king', 'return', 'hunter', 'witch', 'garden',
+    'blade', 'empire', 'star', 'moon', 'hero', 'demon', 'lord', 'saint', 'knight', 'villainess',
+    'alchemist', 'summer', 'ghost', 'school', 'beast', 'crown', 'flower', 'cursed', 'silver', 'archmage',
+    'tale', 'legend', 'heaven', 'dungeon', 'spring', 'wolf', 'princess', 'castle', 'emperor', 'healer'
+]
+NOISE_TAGS = ['(Official)', '[Colored]', '(Webtoon)', '[Fan Colored]', '(Manhwa)']
+SUBTITLES = ['The Beginning', 'Another Story', 'Second Life', 'A New Dawn']
+
+
+class SimulatedTracker:
+    """Tracker search answered from recorded responses, or ranked over a catalog
+
+    Queries without a recorded response get the catalog entries sharing
+    the most title words with the query, like a keyword search would.
+    """
+
+    def __init__(self, catalog: List[Dict], responses: Optional[Dict[str, List[int]]] = None,
+                 latency: float = 0.0, limit: int = SEARCH_LIMIT):
+        self.catalog = {node['id']: node for node in catalog}
+        self.responses = responses or {}
+        self.latency = latency
+        self.limit = limit
+        self.words = {
+            node['id']: set(clean_title(' '.join([node['title'], *AlternativeTitles(
+                **node.get('alternative_titles', {})).all()])).split())
+            for node in catalog
+        }
+
+    def search(self, query: str) -> Page:
+        ids = self.responses.get(query)
+        if ids is None:
+            ids = self._rank(query)
+        if self.latency:
+            time.sleep(self.latency)
+        return Page([Entry(Manga.from_dict(self.catalog[i])) for i in ids if i in self.catalog])
+
+    def _rank(self, query: str) -> List[int]:
+        words = set(clean_title(query).split())
+        # Ties go to fewer extra words, then to the older entry
+        ranked = sorted(
+            (-len(words & node_words), len(node_words), node_id)
+            for node_id, node_words in self.words.items() if words & node_words
+        )
+        return [node_id for _, _, node_id in ranked[:self.limit]]
+
+
+def single_query_matcher(score: Callable[[str, Manga], int]):
+    """Matcher that sends the title once and keeps the best scored result"""
+    def build(search: Callable, threshold: int):
+        def match(title: str, alternatives: List[str]) -> MatchResult:
+            best = MatchResult(queries=[title])
+            for entry in search(title).result().items:
+                entry_score = score(title, entry.manga)
+                if entry_score > best.score:
+                    best = MatchResult(entry.manga, entry_score, STRATEGY_RAW, [title])
+            best.matched = best.score >= threshold
+            return best
+        return match
+    return build
+
+
+def sequence_score(title: str, manga: Manga) -> int:
+    # The measure titles_match thresholds at 0.85
+    clean1 = clean_title(title)
+    clean2 = clean_title(manga.title)
+    if clean1 == clean2:
+        return 100
+    return round(SequenceMatcher(None, clean1, clean2).ratio() * 100)
+
+
+def planner_matcher(search: Callable, threshold: int):
+    """The query planner the matching popup uses, starting with no learned stats"""
+    planner = QueryPlanner(search, stats_file=PLANNER_STATS, threshold=threshold)
+    return lambda title, alternatives: planner.match(title, alternatives).result()
+
+
+MATCHERS = {
+    'ratio': single_query_matcher(lambda title, manga: fuzz.ratio(title.lower(), manga.title.lower())),
+    'sequence': single_query_matcher(sequence_score),
+    'title_score': single_query_matcher(
+        lambda title, manga: max(title_score(title, candidate)
+                                 for candidate in (manga.title, *manga.alternative_titles.all()))
+    ),
+    'planner': planner_matcher
+}
+
+
+class Report:
+    """Accuracy and throughput of one matcher at one threshold"""
+
+    __slots__ = ('matcher', 'threshold', 'cases', 'labeled', 'accepted', 'correct',
+                 'review', 'queries', 'errors', 'elapsed')
+
+    def __init__(self, matcher: str, threshold: int):
+        self.matcher = matcher
+        self.threshold = threshold
+        self.cases = 0
+        self.labeled = 0
+        self.accepted = 0
+        self.correct = 0
+        self.review = 0
+        self.queries = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def add(self, case: Dict, result: Optional[MatchResult]) -> None:
+        expected = case.get('expected_id')
+        self.cases += 1
+        self.labeled += expected is not None
+        if result is None:
+            self.errors += 1
+            self.review += 1
+            return
+        self.queries += len(result.queries)
+        if not result.matched:
+            self.review += 1
+            return
+        self.accepted += 1
+        self.correct += expected is not None and result.manga.id == expected
+
+    @property
+    def precision(self) -> float:
+        return self.correct / self.accepted if self.accepted else 0.0
+
+    @property
+    def recall(self) -> float:
+        return self.correct / self.labeled if self.labeled else 0.0
+
+    @property
+    def review_rate(self) -> float:
+        """Share of titles left for the user to match by hand"""
+        return self.review / self.cases if self.cases else 0.0
+
+    @property
+    def titles_per_second(self) -> float:
+        return self.cases / self.elapsed if self.elapsed else 0.0
+
+    def row(self) -> str:
+        return (f"{self.matcher:<12} {self.threshold:>9} {self.precision:>9.3f} {self.recall:>7.3f} "
+                f"{self.review_rate:>7.3f} {self.titles_per_second:>9.1f} "
+                f"{self.queries / max(self.cases, 1):>8.2f} {self.errors:>6}")
+
+
+HEADER = (f"{'matcher':<12} {'threshold':>9} {'precision':>9} {'recall':>7} "
+          f"{'review':>7} {'titles/s':>9} {'queries':>8} {'errors':>6}")
+
+
+def run_matcher(name: str, dataset: Dict, threshold: int, latency: float = 0.0) -> Report:
+    """Match every case of a dataset with one matcher"""
+    tracker = SimulatedTracker(dataset['catalog'], dataset.get('responses'), latency)
+    report = Report(name, threshold)
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+        match = MATCHERS[name](lambda query: executor.submit(tracker.search, query), threshold)
+        start = time.perf_counter()
+        for case in dataset['cases']:
+            try:
+                result = match(case['title'], case.get('alternatives', []))
+            except Exception as e:
+                print(f"Error matching {case['title']}: {str(e)}")
+                result = None
+            report.add(case, result)
+        report.elapsed = time.perf_counter() - start
+    return report
+
+
+def simulated_dataset(size: int = 300, seed: int = 0) -> Dict:
+    """Labeled library titles with the noise real backups have, and a catalog with look-alikes
+
+    Library titles get source tags, volume numbers, subtitles, typos or an
+    English title where the catalog uses another one. About one in seven
+    titles has no catalog entry, and catalog titles get up to two sequels
+    or spin-offs that share most of their words.
+    """
+    rng = random.Random(seed)
+    catalog = []
+    cases = []
+    used = set()
+
+    def new_title():
+        while True:
+            words = rng.sample(TITLE_WORDS, rng.randint(2, 4))
+            if frozenset(words) not in used:
+                used.add(frozenset(words))
+                return ' '.join(words).title()
+
+    for _ in range(size):
+        title = new_title()
+        english = new_title() if rng.random() < 0.2 else ''
+        node_id = len(catalog) + 1
+        catalog.append({'id': node_id, 'title': title,
+                        'alternative_titles': {'synonyms': [], 'en': english, 'ja': ''}})
+        for suffix in rng.sample([' 2', ': Side Story', ' Season 2', ': Another Tale'], rng.randint(0, 2)):
+            catalog.append({'id': len(catalog) + 1, 'title': title + suffix})
+
+        if rng.random() < 0.15:
+            cases.append({'title': new_title(), 'expected_id': None})
+            continue
+
+        library_title = english or title
+        noise = rng.random()
+        if noise < 0.2:
+            library_title = f"{library_title} {rng.choice(NOISE_TAGS)}"
+        elif noise < 0.3:
+            library_title = f"{library_title} Vol. {rng.randint(1, 20)}"
+        elif noise < 0.4:
+            library_title = f"{library_title}: {rng.choice(SUBTITLES)}"
+        elif noise < 0.5 and len(library_title) > 6:
+            i = rng.randrange(1, len(library_title) - 2)
+            library_title = library_title[:i] + library_title[i + 1] + library_title[i] + library_title[i + 2:]
+        elif noise < 0.6:
+            library_title = library_title.lower()
+        cases.append({'title': library_title, 'expected_id': node_id})
+
+    rng.shuffle(cases)
+    return {'catalog': catalog, 'responses': {}, 'cases': cases}
+
+
+def record_dataset(backup_path, output, token: Optional[str] = None) -> Dict:
+    """Label a backup's tracked titles and record MAL's answers to every query the matchers send"""
+    from core.auth.mal_auth import MALAuth
+    from core.library import get_tracking, load_backup
+    from core.trackers.scheduler import get_scheduler
+
+    # Created before any query is sent, so a bad path cannot waste a recording
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    token = token or MALAuth(os.getenv('MAL_CLIENT_ID', ''), os.getenv('MAL_CLIENT_SECRET', '')).access_token
+    if not token:
+        raise ValueError("No MAL token found, log in through the app or pass --token")
+    tracker = MALMangaTracker(token)
+    scheduler = get_scheduler(tracker.name)
+    planner = QueryPlanner(lambda query: None, stats_file=PLANNER_STATS)
+
+    cases = []
+    for manga in load_backup(backup_path, lazy=False).get('backupManga', []):
+        tracking = get_tracking(manga)
+        if tracking and tracking.get('mediaId'):
+            cases.append({'title': manga.get('title', ''), 'expected_id': int(tracking['mediaId'])})
+
+    catalog = {}
+    responses = {}
+    for i, case in enumerate(cases):
+        for variant in planner.variants(case['title']):
+            if variant.query in responses:
+                continue
+            try:
+                page = scheduler.submit(
+                    tracker.search_manga, variant.query, limit=SEARCH_LIMIT, fields='alternative_titles'
+                ).result()
+            except Exception as e:
+                print(f"Error searching {variant.query}: {str(e)}")
+                continue
+            responses[variant.query] = [entry.manga.id for entry in page.items]
+            for entry in page.items:
+                alternatives = entry.manga.alternative_titles
+                catalog[entry.manga.id] = {
+                    'id': entry.manga.id,
+                    'title': entry.manga.title,
+                    'alternative_titles': {'synonyms': alternatives.synonyms,
+                                           'en': alternatives.en, 'ja': alternatives.ja}
+                }
+        print(f"Recorded {i + 1}/{len(cases)}: {case['title']}")
+
+    dataset = {'catalog': list(catalog.values()), 'responses': responses, 'cases': cases}
+    with open(output, 'w') as f:
+        json.dump(dataset, f, indent=2)
+    return dataset
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m core.matching.benchmark',
+        description='Compare title matchers on a labeled dataset of library titles and tracker ids'
+    )
+    parser.add_argument('--dataset', help='dataset JSON; a simulated one is generated when omitted')
+    parser.add_argument('--size', type=int, default=300, help='titles in the simulated dataset')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the simulated dataset')
+    parser.add_argument('--matcher', action='append', choices=sorted(MATCHERS),
+                        help='matcher to run, repeatable (default: all)')
+    parser.add_argument('--threshold', action='append', type=int,
+                        help=f'acceptance score, repeatable (default: {MATCH_THRESHOLD})')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated seconds per search')
+    parser.add_argument('--record', metavar='BACKUP',
+                        help='build a dataset from the tracked titles of a backup by querying MAL')
+    parser.add_argument('--output', default='matching_dataset.json', help='where --record writes the dataset')
+    parser.add_argument('--token', help='MAL access token for --record')
+    args = parser.parse_args(argv)
+
+    if args.record:
+        dataset = record_dataset(args.record, args.output, args.token)
+        print(f"Wrote {len(dataset['cases'])} cases and {len(dataset['responses'])} responses to {args.output}")
+        return
+
+    if args.dataset:
+        with open(args.dataset, 'r') as f:
+            dataset = json.load(f)
+    else:
+        dataset = simulated_dataset(args.size, args.seed)
+
+    print(f"{len(dataset['cases'])} titles, {len(dataset['catalog'])} catalog entries, "
+          f"{len(dataset.get('responses', {}))} recorded responses")
+    print(HEADER)
+    for threshold in args.threshold or [MATCH_THRESHOLD]:
+        for name in args.matcher or list(MATCHERS):
+            print(run_matcher(name, dataset, threshold, args.latency).row())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+import json
+import os
+import threading
+from concurrent.futures import CancelledError, Future, InvalidStateError
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .titles import clean_title, main_title, strip_noise, title_score
+
+STRATEGY_RAW = 'raw'
+STRATEGY_CLEAN = 'clean'
+STRATEGY_MAIN = 'main'
+STRATEGY_KEYWORDS = 'keywords'
+STRATEGY_ALTERNATIVE = 'alternative'
+
+MATCH_THRESHOLD = 85
+EXACT_SCORE = 100
+WAVE_SIZE = 2
+# A wave is a single query once its strategy finds the match this often
+CONFIDENT_RANK = 0.7
+MIN_QUERY_LENGTH = 3
+MAX_ALTERNATIVES = 2
+
+
+class QueryVariant:
+    __slots__ = ('strategy', 'query')
+
+    def __init__(self, strategy: str, query: str):
+        self.strategy = strategy
+        self.query = query
+
+    def __repr__(self):
+        return f"QueryVariant({self.strategy}, {self.query!r})"
+
+
+class MatchResult:
+    """Best candidate found for a title and the queries spent finding it"""
+
+    __slots__ = ('manga', 'score', 'strategy', 'queries', 'matched')
+
+    def __init__(self, manga=None, score: int = 0, strategy: Optional[str] = None,
+                 queries: Optional[List[str]] = None, matched: bool = False):
+        self.manga = manga
+        self.score = score
+        self.strategy = strategy
+        self.queries = queries or []
+        self.matched = matched
+
+    @property
+    def exact(self) -> bool:
+        return self.score >= EXACT_SCORE
+
+
+class QueryPlanner:
+    """Matches library titles by searching ordered query variants
+
+    Variants are sent in waves, best strategy first, and the searches of a
+    wave run in parallel. A wave shrinks to one query when its strategy has
+    proven reliable. An exact match cancels whatever is still queued,
+    and a match above the threshold stops further waves. How often each
+    strategy's queries produce the accepted match is learned and kept on
+    disk, so strategies that pay off are tried first.
+    """
+
+    def __init__(self, search: Callable[[str], Future], stats_file: Optional[Path] = None,
+                 threshold: int = MATCH_THRESHOLD, wave_size: int = WAVE_SIZE):
+        self.search = search
+        self.threshold = threshold
+        self.wave_size = wave_size
+        self.stats_file = stats_file or Path.home() / '.mihontracker' / 'query_stats.json'
+        self.stats: Dict[str, List[int]] = {}
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        try:
+            if self.stats_file.exists():
+                with open(self.stats_file, 'r') as f:
+                    self.stats = {strategy: list(counts) for strategy, counts in json.load(f).items()}
+        except Exception as e:
+            print(f"Failed to load query stats: {str(e)}")
+
+    def save(self) -> None:
+        """Write the learned strategy stats if they changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            stats = {strategy: list(counts) for strategy, counts in self.stats.items()}
+            self.dirty = False
+        self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.stats_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(stats, f)
+        os.replace(tmp_file, self.stats_file)
+
+    def rank(self, strategy: str) -> float:
+        """Smoothed share of a strategy's queries that found the accepted match"""
+        attempts, wins = self.stats.get(strategy, (0, 0))
+        return (wins + 1) / (attempts + 2)
+
+    def record(self, variants: List[QueryVariant], winner: Optional[str]) -> None:
+        with self.lock:
+            for variant in variants:
+                self.stats.setdefault(variant.strategy, [0, 0])[0] += 1
+            if winner:
+                self.stats.setdefault(winner, [0, 0])[1] += 1
+            self.dirty = True
+
+    def variants(self, title: str, alternatives: Sequence[str] = ()) -> List[QueryVariant]:
+        """Distinct queries for a title, best learned strategy first"""
+        candidates = [
+            (STRATEGY_RAW, title),
+            (STRATEGY_CLEAN, strip_noise(title)),
+            (STRATEGY_MAIN, main_title(title)),
+            (STRATEGY_KEYWORDS, clean_title(title))
+        ]
+        candidates += [(STRATEGY_ALTERNATIVE, strip_noise(alt)) for alt in alternatives[:MAX_ALTERNATIVES]]
+
+        with self.lock:
+            candidates.sort(key=lambda candidate: -self.rank(candidate[0]))
+
+        seen = set()
+        variants = []
+        for strategy, query in candidates:
+            key = ' '.join(query.lower().split())
+            if len(key) < MIN_QUERY_LENGTH or key in seen:
+                continue
+            seen.add(key)
+            variants.append(QueryVariant(strategy, query))
+        return variants
+
+    def match(self, title: str, alternatives: Sequence[str] = ()) -> Future:
+        """Future for the MatchResult of a title, or a search error if one failed before a match"""
+        titles = [title, *alternatives]
+        return MatchRun(self, titles, self.variants(title, alternatives)).start()
+
+
+class MatchRun:
+    """State of matching one title, advanced by search callbacks"""
+
+    def __init__(self, planner: QueryPlanner, titles: List[str], variants: List[QueryVariant]):
+        self.planner = planner
+        self.titles = titles
+        self.variants = variants
+        self.next_variant = 0
+        self.pending: Dict[Future, QueryVariant] = {}
+        self.sent: List[QueryVariant] = []
+        self.errors: List[BaseException] = []
+        self.best: Optional[MatchResult] = None
+        self.finishing = False
+        # Set while a claimed wave is being sent, so no other wave is claimed meanwhile
+        self.sending = False
+        self.lock = threading.Lock()
+        self.future = Future()
+        self.future.add_done_callback(self._on_done)
+
+    def start(self) -> Future:
+        if self.variants:
+            with self.lock:
+                wave = self._claim_wave()
+            self._send_wave(wave)
+        else:
+            self._finish()
+        return self.future
+
+    def _claim_wave(self) -> List[QueryVariant]:
+        """Take the next wave of variants; the caller holds the lock"""
+        size = self.planner.wave_size
+        if self.planner.rank(self.variants[self.next_variant].strategy) >= CONFIDENT_RANK:
+            size = 1
+        wave = self.variants[self.next_variant:self.next_variant + size]
+        self.next_variant += len(wave)
+        self.sending = True
+        return wave
+
+    def _send_wave(self, wave: List[QueryVariant]):
+        searches = []
+        for variant in wave:
+            try:
+                searches.append((self.planner.search(variant.query), variant))
+            except Exception as e:
+                self.errors.append(e)
+
+        # Register the whole wave before any callback can see it half sent
+        with self.lock:
+            for search, variant in searches:
+                self.pending[search] = variant
+                self.sent.append(variant)
+            self.sending = False
+        for search, _ in searches:
+            search.add_done_callback(self._on_search)
+        if not searches:
+            self._advance()
+
+    def _on_search(self, search: Future):
+        with self.lock:
+            variant = self.pending.pop(search, None)
+            if variant is None or self.future.done():
+                return
+            if search.cancelled():
+                self.errors.append(CancelledError(f"Search for {variant.query!r} was cancelled"))
+            elif search.exception() is not None:
+                self.errors.append(search.exception())
+            else:
+                self._score(search.result(), variant)
+        self._advance()
+
+    def _score(self, page, variant: QueryVariant):
+        for entry in page.items:
+            manga = entry.manga
+            score = max(
+                title_score(title, candidate)
+                for title in self.titles
+                for candidate in (manga.title, *manga.alternative_titles.all())
+            )
+            if self.best is None or score > self.best.score:
+                self.best = MatchResult(manga, score, variant.strategy)
+
+    def _advance(self):
+        with self.lock:
+            if self.finishing or self.future.done() or self.sending:
+                return
+            exact = self.best is not None and self.best.exact
+            if not exact and self.pending:
+                return
+            good_enough = self.best is not None and self.best.score >= self.planner.threshold
+            more = self.next_variant < len(self.variants)
+            self.finishing = exact or good_enough or not more
+            wave = None if self.finishing else self._claim_wave()
+        if wave is None:
+            self._finish()
+        else:
+            self._send_wave(wave)
+
+    def _finish(self):
+        with self.lock:
+            best = self.best
+            sent = list(self.sent)
+        # Without a match, a failed search may have been the one that would
+        # have found it, so the title is not reported as unmatched
+        if self.errors and (best is None or best.score < self.planner.threshold):
+            try:
+                self.future.set_exception(self.errors[-1])
+            except InvalidStateError:
+                pass
+            return
+
+        result = best or MatchResult()
+        result.matched = result.score >= self.planner.threshold
+        result.queries = [variant.query for variant in sent]
+        self.planner.record(sent, result.strategy if result.matched else None)
+        try:
+            self.future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def _on_done(self, future: Future):
+        # Searches still queued once the outcome is known are not worth sending
+        with self.lock:
+            pending = list(self.pending)
+            self.pending.clear()
+        for search in pending:
+            search.cancel()
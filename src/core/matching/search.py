@@ -0,0 +1,86 @@
+from typing import Dict, List, Optional, Set
+
+from .titles import clean_title
+
+NGRAM_SIZE = 3
+PREFIX_MARKER = '^'
+
+
+def normalize_query(text: str) -> str:
+    """Normalize typed text the same way indexed titles are"""
+    return clean_title(text)
+
+
+def index_keys(word: str) -> Set[str]:
+    """Trigrams of a word, or a word prefix marker for words too short for one"""
+    if len(word) < NGRAM_SIZE:
+        return {PREFIX_MARKER + word}
+    return {word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1)}
+
+
+class TitleIndex:
+    """Trigram index over normalized titles for search as you type
+
+    Every query word must appear in the title, and words shorter than a
+    trigram must start a word. Candidates come from the rarest key of the
+    query and are then checked directly against the normalized title.
+    Queries made only of common words, like "the", match nothing rather
+    than unrelated titles.
+    """
+
+    def __init__(self, titles: List[str]):
+        self.titles = [clean_title(title) for title in titles]
+        self.postings: Dict[str, List[int]] = {}
+        for position, title in enumerate(self.titles):
+            keys = set()
+            for word in title.split():
+                keys.update(index_keys(word))
+                keys.update(PREFIX_MARKER + word[:size] for size in range(1, NGRAM_SIZE))
+            for key in keys:
+                self.postings.setdefault(key, []).append(position)
+
+        by_length = sorted(range(len(self.titles)), key=lambda position: len(self.titles[position]))
+        self.length_rank = [0] * len(self.titles)
+        for rank, position in enumerate(by_length):
+            self.length_rank[position] = rank
+
+    def __len__(self):
+        return len(self.titles)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """Positions of matching titles, best matches first"""
+        if not query.strip():
+            return list(range(len(self.titles)))[:limit]
+        query = normalize_query(query)
+        if not query:
+            return []
+
+        words = query.split()
+        keys = set()
+        for word in words:
+            keys.update(index_keys(word))
+        rarest = min(keys, key=lambda key: len(self.postings.get(key, [])))
+        candidates = self.postings.get(rarest, [])
+
+        # A prefix key is exact, so the word it came from needs no check
+        titles = self.titles
+        long_words = [word for word in words if len(word) >= NGRAM_SIZE]
+        short_words = [
+            f' {word}' for word in words
+            if len(word) < NGRAM_SIZE and PREFIX_MARKER + word != rarest
+        ]
+        if long_words or short_words:
+            candidates = [
+                position for position in candidates
+                if all(word in titles[position] for word in long_words)
+                and all(word in f' {titles[position]}' for word in short_words)
+            ]
+
+        # Titles starting with the query first, then shorter titles first
+        leading = []
+        others = []
+        for position in candidates:
+            (leading if titles[position].startswith(query) else others).append(position)
+        leading.sort(key=self.length_rank.__getitem__)
+        others.sort(key=self.length_rank.__getitem__)
+        return (leading + others)[:limit]
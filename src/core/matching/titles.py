@@ -0,0 +1,64 @@
+import re
+from difflib import SequenceMatcher
+
+from fuzzywuzzy import fuzz
+
+COMMON_WORDS = {'the', 'a', 'an', 'to', 'no', 'wa', 'ga', 'wo', 'de', 'ni'}
+
+# Source-specific tags such as "(Official)", "[Colored]" or "Vol. 3"
+BRACKETED = re.compile(r'\([^)]*\)|\[[^\]]*\]|\{[^}]*\}|【[^】]*】')
+VOLUME_TAG = re.compile(r'\b(?:vol(?:ume)?|season|part)\.?\s*\d+(?:\s*-\s*\d+)?\b', re.IGNORECASE)
+SUBTITLE_SEPARATOR = re.compile(r'\s*(?::\s|\s[-–—~|]\s)\s*')
+
+
+def clean_title(title):
+    """Clean title for better matching"""
+    clean = title.lower()
+    clean = re.sub(r'[^\w\s]', ' ', clean)
+
+    words = clean.split()
+    words = [w for w in words if w not in COMMON_WORDS]
+
+    clean = ' '.join(words)
+    clean = re.sub(r'season \d+', '', clean)
+    clean = re.sub(r'part \d+', '', clean)
+    clean = re.sub(r'\s+', ' ', clean)
+
+    return clean.strip()
+
+
+def titles_match(title1, title2, threshold=0.85):
+    clean_title1 = clean_title(title1)
+    clean_title2 = clean_title(title2)
+
+    if clean_title1.lower() == clean_title2.lower():
+        return True
+
+    ratio = SequenceMatcher(None, clean_title1.lower(), clean_title2.lower()).ratio()
+    return ratio >= threshold
+
+
+def strip_noise(title):
+    """Title without bracketed tags and volume or season numbers"""
+    stripped = VOLUME_TAG.sub(' ', BRACKETED.sub(' ', title))
+    return ' '.join(stripped.split()).strip(' -:~|')
+
+
+def main_title(title):
+    """Noise-free title with any subtitle after a colon or dash removed"""
+    return SUBTITLE_SEPARATOR.split(strip_noise(title), 1)[0]
+
+
+def title_score(title1, title2):
+    """Similarity of two titles from 0 to 100, 100 meaning the cleaned titles are equal
+
+    Partial and token-set ratios are left out, since they score a short
+    title contained in a longer one as a perfect match.
+    """
+    title1 = strip_noise(title1)
+    title2 = strip_noise(title2)
+    clean1 = clean_title(title1)
+    clean2 = clean_title(title2)
+    if clean1 == clean2:
+        return 100 if clean1 else 0
+    return min(99, max(fuzz.ratio(title1.lower(), title2.lower()), fuzz.token_sort_ratio(clean1, clean2)))
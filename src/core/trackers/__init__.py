@@ -1,4 +1,7 @@
 from .base import BaseTracker
 from .mal_tracker import MALMangaTracker
+from .registry import TrackerRegistry, FanOutResult
+from .models import Manga, ListStatus, Entry, Page
 
-__all__ = ['BaseTracker', 'MALMangaTracker']
\ No newline at end of file
+__all__ = ['BaseTracker', 'MALMangaTracker', 'TrackerRegistry', 'FanOutResult',
+           'Manga', 'ListStatus', 'Entry', 'Page']
\ No newline at end of file
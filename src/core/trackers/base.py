@@ -1,21 +1,33 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List
+from typing import Dict, Iterator, Optional, List
+
+from .models import Entry, ListStatus, Page
+from .paging import iterate_pages
 
 class BaseTracker(ABC):
     """Base class for manga trackers"""
 
+    name: str = ""
+    # syncId Mihon stores in the tracking records of this tracker
+    sync_id: int = 0
+    # List status names and the status codes Mihon stores for them
+    status_codes: Dict[str, int] = {}
+    search_page_size: int = 100
+    list_page_size: int = 100
+    ranking_page_size: int = 100
+
     @abstractmethod
-    def search_manga(self, query: str, limit: int = 100, offset: int = 0) -> Dict:
+    def search_manga(self, query: str, limit: int = 100, offset: int = 0) -> Page:
         """Search for manga by title"""
         pass
 
     @abstractmethod
-    def add_manga(self, manga_id: int, status: str = "plan_to_read") -> Dict:
+    def add_manga(self, manga_id: int, status: str = "plan_to_read") -> ListStatus:
         """Add a manga to user's list"""
         pass
 
     @abstractmethod
-    def update_manga_list_status(self, manga_id: int, **kwargs) -> Dict:
+    def update_manga_list_status(self, manga_id: int, **kwargs) -> ListStatus:
         """Update the user's manga list status"""
         pass
 
@@ -25,6 +37,27 @@ class BaseTracker(ABC):
         pass
 
     @abstractmethod
-    def get_user_manga_list(self, **kwargs) -> Dict:
+    def get_user_manga_list(self, **kwargs) -> Page:
         """Get a user's manga list"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_manga_ranking(self, ranking_type: str, limit: int = 100, offset: int = 0, **kwargs) -> Page:
+        """Get manga rankings by different criteria"""
+        pass
+
+    def iter_user_manga_list(self, fields: Optional[str] = None, limit: Optional[int] = None,
+                             **kwargs) -> Iterator[Entry]:
+        """Stream a user's manga list, fetching the next page in the background"""
+        return iterate_pages(
+            self.name, self.get_user_manga_list, self.list_page_size,
+            limit=limit, fields=fields, **kwargs
+        )
+
+    def iter_manga_ranking(self, ranking_type: str = "all", fields: Optional[str] = None,
+                           limit: Optional[int] = None, **kwargs) -> Iterator[Entry]:
+        """Stream a manga ranking, fetching the next page in the background"""
+        return iterate_pages(
+            self.name, self.get_manga_ranking, self.ranking_page_size,
+            limit=limit, ranking_type=ranking_type, fields=fields, **kwargs
+        )
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, InvalidStateError
+from typing import Optional
+
+from .base import BaseTracker
+from .scheduler import get_scheduler, PRIORITY_INTERACTIVE
+
+CACHE_TTL = 600
+CACHE_SIZE = 500
+
+
+class RequestCache:
+    """Caches read-only tracker responses and joins identical in-flight requests
+
+    Every caller gets its own future, so cancelling one caller's request
+    never cancels the shared request other callers are waiting on. Once
+    every caller has cancelled, a shared request that is still queued is
+    cancelled too and never sent.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL, max_entries: int = CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.results = OrderedDict()
+        self.in_flight = {}
+        self.followers = {}
+        self.lock = threading.RLock()
+
+    def fetch(self, tracker: BaseTracker, method: str, *args,
+              priority: int = PRIORITY_INTERACTIVE, **kwargs) -> Future:
+        """Get a tracker response from the cache, an in-flight request or a new one"""
+        key = (tracker.name, method, args, tuple(sorted(kwargs.items())))
+        scheduler = get_scheduler(tracker.name)
+
+        with self.lock:
+            cached = self.results.get(key)
+            if cached and cached[0] > time.monotonic():
+                self.results.move_to_end(key)
+                future = Future()
+                future.set_result(cached[1])
+                return future
+
+            shared = self.in_flight.get(key)
+            if shared is None:
+                shared = scheduler.submit(getattr(tracker, method), *args, priority=priority, **kwargs)
+                self.in_flight[key] = shared
+                shared.add_done_callback(lambda f: self._store(key, f))
+            else:
+                scheduler.promote(shared, priority)
+
+            future = self._follow(shared)
+            self.followers.setdefault(key, set()).add(future)
+        future.add_done_callback(lambda f: self._release(key, shared, f))
+        return future
+
+    def contains(self, tracker: BaseTracker, method: str, *args, **kwargs) -> bool:
+        """Check whether a response is cached or already being fetched"""
+        key = (tracker.name, method, args, tuple(sorted(kwargs.items())))
+        with self.lock:
+            cached = self.results.get(key)
+            return key in self.in_flight or bool(cached and cached[0] > time.monotonic())
+
+    def clear(self) -> None:
+        with self.lock:
+            self.results.clear()
+
+    def _release(self, key, shared, future):
+        with self.lock:
+            followers = self.followers.get(key)
+            if followers is None or self.in_flight.get(key) is not shared:
+                return
+            followers.discard(future)
+            if followers or not future.cancelled():
+                return
+            del self.followers[key]
+            del self.in_flight[key]
+        shared.cancel()
+
+    def _store(self, key, future):
+        with self.lock:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+                self.followers.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+
+            self.results[key] = (time.monotonic() + self.ttl, future.result())
+            self.results.move_to_end(key)
+            while len(self.results) > self.max_entries:
+                self.results.popitem(last=False)
+
+    @staticmethod
+    def _follow(shared: Future) -> Future:
+        future = Future()
+
+        def copy(f):
+            try:
+                if f.cancelled():
+                    future.cancel()
+                elif f.exception() is not None:
+                    future.set_exception(f.exception())
+                else:
+                    future.set_result(f.result())
+            except InvalidStateError:
+                pass
+
+        shared.add_done_callback(copy)
+        return future
+
+
+_cache: Optional[RequestCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_request_cache() -> RequestCache:
+    """Get the process-wide tracker response cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RequestCache()
+        return _cache
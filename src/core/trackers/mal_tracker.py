@@ -1,20 +1,33 @@
 import requests
 from typing import Dict, Optional, List
 from .base import BaseTracker
+from .models import Manga, ListStatus, Page, decode
 
 class MALMangaTracker(BaseTracker):
     BASE_URL = "https://api.myanimelist.net/v2"
+    name = "mal"
+    sync_id = 1
+    status_codes = {
+        'reading': 1,
+        'completed': 2,
+        'on_hold': 3,
+        'dropped': 4,
+        'plan_to_read': 6
+    }
+    search_page_size = 15
+    list_page_size = 1000
+    ranking_page_size = 500
 
     def __init__(self, access_token: str):
         self.headers = {
             "Authorization": f"Bearer {access_token}"
         }
 
-    def search_manga(self, query: str, limit: int = 100, offset: int = 0, fields: str = None) -> Dict:
+    def search_manga(self, query: str, limit: int = 100, offset: int = 0, fields: str = None) -> Page:
         """Search for manga by title"""
         params = {
             "q": query,
-            "limit": min(limit, 15),
+            "limit": min(limit, self.search_page_size),
             "offset": offset
         }
         if fields:
@@ -25,8 +38,8 @@ class MALMangaTracker(BaseTracker):
             headers=self.headers,
             params=params
         )
-
-        return response.json()
+        response.raise_for_status()
+        return Page.from_dict(decode(response.content))
 
     def add_manga(self, manga_id, status="plan_to_read"):
         """Add a manga to user's list"""
@@ -37,21 +50,21 @@ class MALMangaTracker(BaseTracker):
 
         response = requests.patch(url, headers=self.headers, data=data)
         if response.status_code == 200:
-            return response.json()
+            return ListStatus.from_dict(decode(response.content))
         else:
-            raise Exception(f"Failed to add manga: {response.text}")
+            raise requests.HTTPError(f"Failed to add manga: {response.text}", response=response)
 
-    def get_manga_details(self, manga_id):
+    def get_manga_details(self, manga_id) -> Manga:
         """Get detailed information for a specific manga"""
         url = f"https://api.myanimelist.net/v2/manga/{manga_id}?fields=id,title,synopsis,num_chapters,status,mean,media_type,start_date,end_date,main_picture"
         headers = self.headers
 
         response = requests.get(url, headers=headers)
         response.raise_for_status()
-        return response.json()
+        return Manga.from_dict(decode(response.content))
 
     def get_manga_ranking(self, ranking_type: str, limit: int = 100,
-                         offset: int = 0, fields: str = None) -> Dict:
+                         offset: int = 0, fields: str = None) -> Page:
         """Get manga rankings by different criteria"""
         params = {
             "ranking_type": ranking_type,
@@ -66,14 +79,15 @@ class MALMangaTracker(BaseTracker):
             headers=self.headers,
             params=params
         )
-        return response.json()
+        response.raise_for_status()
+        return Page.from_dict(decode(response.content))
 
     def update_manga_list_status(self, manga_id: int,
                                status: Optional[str] = None,
                                score: Optional[int] = None,
                                num_volumes_read: Optional[int] = None,
                                num_chapters_read: Optional[int] = None,
-                               comments: Optional[str] = None) -> Dict:
+                               comments: Optional[str] = None) -> ListStatus:
         """Update the user's manga list status"""
         data = {}
         if status:
@@ -92,7 +106,10 @@ class MALMangaTracker(BaseTracker):
             headers=self.headers,
             data=data
         )
-        return response.json()
+        if response.status_code == 200:
+            return ListStatus.from_dict(decode(response.content))
+        else:
+            raise requests.HTTPError(f"Failed to update manga: {response.text}", response=response)
 
     def delete_manga_list_item(self, manga_id: int) -> bool:
         """Remove a manga from user's list"""
@@ -104,7 +121,7 @@ class MALMangaTracker(BaseTracker):
 
     def get_user_manga_list(self, username: str = "@me", status: Optional[str] = None,
                            sort: Optional[str] = None, limit: int = 100,
-                           offset: int = 0) -> Dict:
+                           offset: int = 0, fields: str = None) -> Page:
         """Get a user's manga list"""
         params = {
             "limit": min(limit, 1000),
@@ -114,10 +131,13 @@ class MALMangaTracker(BaseTracker):
             params["status"] = status
         if sort:
             params["sort"] = sort
+        if fields:
+            params["fields"] = fields
 
         response = requests.get(
             f"{self.BASE_URL}/users/{username}/mangalist",
             headers=self.headers,
             params=params
         )
-        return response.json()
\ No newline at end of file
+        response.raise_for_status()
+        return Page.from_dict(decode(response.content))
\ No newline at end of file
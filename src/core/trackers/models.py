@@ -0,0 +1,151 @@
+import json
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def decode(content: bytes):
+    """Decode a response body, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class Picture:
+    __slots__ = ('medium', 'large')
+
+    def __init__(self, medium: Optional[str] = None, large: Optional[str] = None):
+        self.medium = medium
+        self.large = large
+
+
+class AlternativeTitles:
+    __slots__ = ('synonyms', 'en', 'ja')
+
+    def __init__(self, synonyms: Optional[List[str]] = None, en: str = '', ja: str = ''):
+        self.synonyms = synonyms or []
+        self.en = en
+        self.ja = ja
+
+    def all(self) -> List[str]:
+        """Every non-empty alternative title"""
+        return [title for title in (*self.synonyms, self.en, self.ja) if title]
+
+
+class Manga:
+    """A manga as returned by any tracker endpoint, limited to the fields requested
+
+    Nested structures are kept as decoded and only wrapped when read.
+    """
+
+    __slots__ = ('id', 'title', 'num_chapters', 'mean', 'status', 'media_type',
+                 'start_date', 'end_date', 'synopsis', '_main_picture', '_alternative_titles')
+
+    def __init__(self, id: int, title: str = '', num_chapters: Optional[int] = None,
+                 mean: Optional[float] = None, status: Optional[str] = None,
+                 media_type: Optional[str] = None, start_date: Optional[str] = None,
+                 end_date: Optional[str] = None, synopsis: Optional[str] = None,
+                 main_picture=None, alternative_titles=None):
+        self.id = id
+        self.title = title
+        self.num_chapters = num_chapters
+        self.mean = mean
+        self.status = status
+        self.media_type = media_type
+        self.start_date = start_date
+        self.end_date = end_date
+        self.synopsis = synopsis
+        self._main_picture = main_picture
+        self._alternative_titles = alternative_titles
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Manga':
+        get = data.get
+        return cls(
+            data['id'], get('title', ''), get('num_chapters'), get('mean'), get('status'),
+            get('media_type'), get('start_date'), get('end_date'), get('synopsis'),
+            get('main_picture'), get('alternative_titles')
+        )
+
+    @property
+    def main_picture(self) -> Optional[Picture]:
+        if isinstance(self._main_picture, dict):
+            self._main_picture = Picture(**self._main_picture)
+        return self._main_picture
+
+    @property
+    def alternative_titles(self) -> AlternativeTitles:
+        if not isinstance(self._alternative_titles, AlternativeTitles):
+            self._alternative_titles = AlternativeTitles(**(self._alternative_titles or {}))
+        return self._alternative_titles
+
+    def to_dict(self) -> Dict:
+        """Plain fields for storing the manga as JSON"""
+        return {'id': self.id, 'title': self.title}
+
+
+class ListStatus:
+    """The user's list status for one manga"""
+
+    __slots__ = ('status', 'score', 'num_chapters_read', 'num_volumes_read', 'is_rereading')
+
+    def __init__(self, status: Optional[str] = None, score: int = 0, num_chapters_read: int = 0,
+                 num_volumes_read: int = 0, is_rereading: bool = False):
+        self.status = status
+        self.score = score
+        self.num_chapters_read = num_chapters_read
+        self.num_volumes_read = num_volumes_read
+        self.is_rereading = is_rereading
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ListStatus':
+        get = data.get
+        return cls(get('status'), get('score', 0), get('num_chapters_read', 0),
+                   get('num_volumes_read', 0), get('is_rereading', False))
+
+
+class Entry:
+    """One item of a search, ranking or list page"""
+
+    __slots__ = ('manga', 'list_status', 'rank')
+
+    def __init__(self, manga: Manga, list_status: Optional[ListStatus] = None, rank: Optional[int] = None):
+        self.manga = manga
+        self.list_status = list_status
+        self.rank = rank
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Entry':
+        list_status = data.get('list_status')
+        ranking = data.get('ranking')
+        return cls(
+            Manga.from_dict(data['node']),
+            ListStatus.from_dict(list_status) if list_status else None,
+            ranking.get('rank') if ranking else None
+        )
+
+
+class Page:
+    """One page of entries and whether another one follows"""
+
+    __slots__ = ('items', 'has_next')
+
+    def __init__(self, items: List[Entry], has_next: bool = False):
+        self.items = items
+        self.has_next = has_next
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Page':
+        return cls(
+            [Entry.from_dict(item) for item in data.get('data', [])],
+            bool(data.get('paging', {}).get('next'))
+        )
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
@@ -0,0 +1,281 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from .base import BaseTracker
+from .models import ListStatus
+from .scheduler import get_scheduler, PRIORITY_WRITE
+
+FLUSH_INTERVAL = 1.0
+RETRY_BASE_DELAY = 5.0
+RETRY_MAX_DELAY = 300.0
+MAX_ATTEMPTS = 8
+# Responses only mark the outbox dirty; it is written at most this often
+SAVE_INTERVAL = 2.0
+TRANSIENT_STATUS_CODES = {408, 429}
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed send may succeed if retried later"""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(error, 'response', None)
+    if response is None:
+        return True
+    return response.status_code in TRANSIENT_STATUS_CODES or response.status_code >= 500
+
+
+class TrackerOutbox:
+    """Durable queue of pending list updates, coalesced per manga
+
+    Every edit is written to disk before it is sent. Edits to the same
+    manga are merged, so only one PATCH with the latest fields goes out.
+    List status updates are absolute, which makes retrying them safe.
+
+    Queuing an update returns a future for its first send attempt. It
+    resolves with the response once the update, or a newer one merged into
+    it, has been sent, or with the error if that attempt failed. Updates
+    that failed with a network error, a rate limit or a server error are
+    retried in the background. Ones the tracker rejected, or that still
+    fail after MAX_ATTEMPTS, are moved to the dead letters instead.
+    """
+
+    def __init__(self, tracker: BaseTracker, data_dir: Optional[Path] = None,
+                 on_flushed: Optional[Callable[[int, ListStatus], None]] = None,
+                 on_dead_letter: Optional[Callable[[int, Dict], None]] = None):
+        self.tracker = tracker
+        self.on_flushed = on_flushed
+        self.on_dead_letter = on_dead_letter
+        self.data_dir = data_dir or Path.home() / '.mihontracker'
+        self.data_dir.mkdir(exist_ok=True)
+        self.outbox_file = self.data_dir / f'outbox_{tracker.name}.json'
+
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.pending: Dict[int, Dict] = {}
+        self.dead: Dict[int, Dict] = {}
+        self.in_flight = set()
+        self.waiters: Dict[int, List[Tuple[int, Future]]] = {}
+        self.batch_depth = 0
+        self.dirty = False
+        self.last_save = 0.0
+        self.load()
+
+        self.running = True
+        self.thread = threading.Thread(target=self._flush_loop, name=f'{tracker.name}-outbox', daemon=True)
+        self.thread.start()
+
+    def load(self) -> None:
+        """Load pending updates left over from a previous run"""
+        try:
+            if self.outbox_file.exists():
+                with open(self.outbox_file, 'r') as f:
+                    data = json.load(f)
+                # Older outboxes hold only the pending updates
+                entries = data.get('pending', {}) if 'pending' in data else data
+                self.pending = {
+                    int(manga_id): {**entry, 'attempts': 0, 'next_attempt': 0}
+                    for manga_id, entry in entries.items()
+                }
+                self.dead = {int(manga_id): entry for manga_id, entry in data.get('dead', {}).items()}
+        except Exception as e:
+            print(f"Failed to load outbox: {str(e)}")
+
+    def save(self) -> None:
+        """Persist pending updates and dead letters, replacing the file atomically"""
+        data = {
+            'pending': {
+                str(manga_id): {'fields': entry['fields'], 'revision': entry['revision']}
+                for manga_id, entry in self.pending.items()
+            },
+            'dead': {str(manga_id): entry for manga_id, entry in self.dead.items()}
+        }
+        tmp_file = self.outbox_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_file, self.outbox_file)
+        self.dirty = False
+        self.last_save = time.monotonic()
+
+    def update(self, manga_id: int, **fields) -> Future:
+        """Queue a list status update, merging it with pending ones"""
+        fields = {k: v for k, v in fields.items() if v is not None}
+        return self._enqueue(int(manga_id), fields, overwrite=True)
+
+    def add(self, manga_id: int, status: str = "plan_to_read") -> Future:
+        """Queue adding a manga to the list without downgrading a pending status"""
+        return self._enqueue(int(manga_id), {'status': status}, overwrite=False)
+
+    @contextmanager
+    def batch(self):
+        """Write the outbox to disk once for a group of updates"""
+        with self.lock:
+            self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.batch_depth -= 1
+                if not self.batch_depth:
+                    self.save()
+            self.wakeup.set()
+
+    def pending_count(self) -> int:
+        with self.lock:
+            return len(self.pending)
+
+    def dead_letters(self) -> Dict[int, Dict]:
+        """Updates that were given up on, with the fields and the last error"""
+        with self.lock:
+            return {manga_id: dict(entry) for manga_id, entry in self.dead.items()}
+
+    def retry_dead_letters(self) -> List[Future]:
+        """Queue every dead letter again"""
+        with self.lock:
+            dead = list(self.dead.items())
+        with self.batch():
+            return [self.update(manga_id, **entry['fields']) for manga_id, entry in dead]
+
+    def discard_dead_letters(self) -> None:
+        with self.lock:
+            self.dead.clear()
+            self.save()
+
+    def stop(self) -> None:
+        """Stop flushing; anything unsent stays on disk for the next run"""
+        self.running = False
+        self.wakeup.set()
+        self.thread.join(timeout=1)
+        with self.lock:
+            if self.dirty:
+                self._save_quietly()
+            waiters = [future for entries in self.waiters.values() for _, future in entries]
+            self.waiters.clear()
+        for future in waiters:
+            future.set_exception(RuntimeError("Outbox stopped before the update was sent"))
+
+    def _enqueue(self, manga_id: int, fields: Dict, overwrite: bool) -> Future:
+        future = Future()
+        # Only the outbox settles the future, so it cannot be cancelled
+        future.set_running_or_notify_cancel()
+        with self.lock:
+            # A newer edit supersedes one that was given up on
+            self.dead.pop(manga_id, None)
+            entry = self.pending.setdefault(
+                manga_id,
+                {'fields': {}, 'revision': 0, 'attempts': 0, 'next_attempt': 0}
+            )
+            if overwrite:
+                entry['fields'].update(fields)
+            else:
+                for key, value in fields.items():
+                    entry['fields'].setdefault(key, value)
+            entry['revision'] += 1
+            entry['attempts'] = 0
+            entry['next_attempt'] = 0
+            self.waiters.setdefault(manga_id, []).append((entry['revision'], future))
+            if self.batch_depth:
+                return future
+            self.save()
+        self.wakeup.set()
+        return future
+
+    def _flush_loop(self):
+        while self.running:
+            self.wakeup.wait(FLUSH_INTERVAL)
+            self.wakeup.clear()
+            if self.running:
+                self.flush()
+                with self.lock:
+                    if self.dirty and time.monotonic() - self.last_save >= SAVE_INTERVAL:
+                        self._save_quietly()
+
+    def _save_quietly(self):
+        try:
+            self.save()
+        except Exception as e:
+            print(f"Failed to save outbox: {str(e)}")
+
+    def flush(self) -> None:
+        """Send every pending update that is due"""
+        now = time.monotonic()
+        with self.lock:
+            due = [
+                (manga_id, dict(entry['fields']), entry['revision'])
+                for manga_id, entry in self.pending.items()
+                if manga_id not in self.in_flight and entry['next_attempt'] <= now
+            ]
+            self.in_flight.update(manga_id for manga_id, _, _ in due)
+
+        scheduler = get_scheduler(self.tracker.name)
+        for manga_id, fields, revision in due:
+            try:
+                future = scheduler.submit(
+                    self.tracker.update_manga_list_status,
+                    manga_id,
+                    priority=PRIORITY_WRITE,
+                    **fields
+                )
+            except RuntimeError:
+                with self.lock:
+                    self.in_flight.discard(manga_id)
+                continue
+            future.add_done_callback(
+                lambda f, m=manga_id, r=revision: self._on_sent(m, r, f)
+            )
+
+    def _on_sent(self, manga_id: int, revision: int, future):
+        response = None
+        dead = None
+        with self.lock:
+            self.in_flight.discard(manga_id)
+            entry = self.pending.get(manga_id)
+            if future.cancelled():
+                return
+
+            # Everything merged into the revision that was sent is settled by it
+            waiters = self.waiters.pop(manga_id, [])
+            settled = [waiter for waiter_revision, waiter in waiters if waiter_revision <= revision]
+            waiters = [(r, waiter) for r, waiter in waiters if r > revision]
+            if waiters:
+                self.waiters[manga_id] = waiters
+
+            error = future.exception()
+            if error is None:
+                response = future.result()
+                if entry and entry['revision'] == revision:
+                    del self.pending[manga_id]
+            elif entry and entry['revision'] != revision:
+                # A newer edit arrived while this one was in flight, send that instead
+                entry['attempts'] = 0
+            elif entry:
+                entry['attempts'] += 1
+                if is_transient(error) and entry['attempts'] < MAX_ATTEMPTS:
+                    delay = min(RETRY_BASE_DELAY * 2 ** (entry['attempts'] - 1), RETRY_MAX_DELAY)
+                    entry['next_attempt'] = time.monotonic() + delay
+                    print(f"Failed to sync manga {manga_id}, retrying in {delay:.0f}s: {error}")
+                else:
+                    del self.pending[manga_id]
+                    dead = {'fields': entry['fields'], 'attempts': entry['attempts'], 'error': str(error)}
+                    self.dead[manga_id] = dead
+                    print(f"Failed to sync manga {manga_id}, giving up: {error}")
+            self.dirty = True
+
+        for waiter in settled:
+            if error is None:
+                waiter.set_result(response)
+            else:
+                waiter.set_exception(error)
+        if entry and entry['revision'] != revision:
+            self.wakeup.set()
+        if response is not None and self.on_flushed:
+            self.on_flushed(manga_id, response)
+        if dead is not None and self.on_dead_letter:
+            self.on_dead_letter(manga_id, dead)
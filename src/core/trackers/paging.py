@@ -0,0 +1,49 @@
+from typing import Callable, Iterator, Optional
+
+from .models import Entry, Page
+from .scheduler import get_scheduler, PRIORITY_BULK
+
+
+def iterate_pages(scheduler_name: str, fetch_page: Callable[..., Page], page_size: int,
+                  limit: Optional[int] = None, priority: int = PRIORITY_BULK,
+                  **kwargs) -> Iterator[Entry]:
+    """Yield the items of an offset-paged endpoint as one stream
+
+    As soon as a page arrives the next one is queued on the tracker's
+    scheduler, so it downloads while the caller consumes the current page.
+    An empty page that claims more follow raises instead of ending the
+    stream, so callers never mistake a cut-short stream for the full one.
+    """
+    if limit is not None and limit <= 0:
+        return
+    scheduler = get_scheduler(scheduler_name)
+
+    def request(offset):
+        size = page_size if limit is None else min(page_size, limit - offset)
+        return scheduler.submit(fetch_page, limit=size, offset=offset, priority=priority, **kwargs)
+
+    offset = 0
+    yielded = 0
+    future = request(offset)
+    next_future = None
+    try:
+        while future is not None:
+            page = future.result()
+            items = page.items
+            offset += len(items)
+            if not items and page.has_next:
+                raise RuntimeError(f"{scheduler_name} returned an empty page at offset {offset}")
+
+            next_future = None
+            if items and page.has_next and (limit is None or offset < limit):
+                next_future = request(offset)
+
+            for item in items:
+                yield item
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+            future = next_future
+    finally:
+        if next_future is not None:
+            next_future.cancel()
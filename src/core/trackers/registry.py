@@ -0,0 +1,123 @@
+import threading
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .base import BaseTracker
+from .outbox import is_transient
+
+# (tracker name, media id) a fanned out update was sent to
+Target = Tuple[str, int]
+
+
+class FanOutResult:
+    """Outcome of one logical edit on every tracker entry it was sent to"""
+
+    __slots__ = ('results', 'errors')
+
+    def __init__(self):
+        self.results: Dict[Target, object] = {}
+        self.errors: Dict[Target, BaseException] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def retrying(self) -> bool:
+        """Whether every failed update will be retried by its outbox"""
+        return all(is_transient(error) for error in self.errors.values())
+
+    def summary(self) -> str:
+        parts = [f"{name} #{media_id}: saved" for name, media_id in self.results
+                 if (name, media_id) not in self.errors]
+        parts += [
+            f"{name} #{media_id}: {'retrying' if is_transient(error) else 'failed'} ({error})"
+            for (name, media_id), error in self.errors.items()
+        ]
+        return ", ".join(parts)
+
+
+def gather(futures: List[Tuple[Target, Future]]) -> Future:
+    """Future for a FanOutResult that resolves once every target has answered"""
+    combined = Future()
+    result = FanOutResult()
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def settle(target, future):
+        with lock:
+            error = future.exception() if not future.cancelled() else RuntimeError("Cancelled")
+            if error is None:
+                result.results[target] = future.result()
+            else:
+                result.results.setdefault(target, None)
+                result.errors[target] = error
+            remaining[0] -= 1
+            done = not remaining[0]
+        if done:
+            combined.set_result(result)
+
+    if not futures:
+        combined.set_result(result)
+    for target, future in futures:
+        future.add_done_callback(lambda f, t=target: settle(t, f))
+    return combined
+
+
+class TrackerRegistry:
+    """Logged-in trackers and their outboxes, keyed by Mihon's syncId"""
+
+    def __init__(self):
+        self.trackers: Dict[int, BaseTracker] = {}
+        self.outboxes: Dict[int, object] = {}
+        self.lock = threading.Lock()
+
+    def register(self, tracker: BaseTracker, outbox) -> None:
+        """Add a tracker, stopping the outbox of the one it replaces"""
+        with self.lock:
+            previous = self.outboxes.get(tracker.sync_id)
+            self.trackers[tracker.sync_id] = tracker
+            self.outboxes[tracker.sync_id] = outbox
+        if previous is not None and previous is not outbox:
+            previous.stop()
+
+    def get(self, sync_id: int) -> Optional[BaseTracker]:
+        return self.trackers.get(sync_id)
+
+    def linked(self, manga: Dict) -> List[Tuple[BaseTracker, Dict]]:
+        """Registered trackers an entry is linked to, with its tracking record on each"""
+        return [
+            (self.trackers[tracking.get('syncId')], tracking)
+            for tracking in manga.get('tracking', [])
+            if tracking.get('syncId') in self.trackers and tracking.get('mediaId')
+        ]
+
+    def targets(self, manga_list: Iterable[Dict]) -> Set[Tuple[int, int]]:
+        """(syncId, media id) pairs an edit to these entries should be sent to"""
+        return {
+            (tracker.sync_id, int(tracking['mediaId']))
+            for manga in manga_list
+            for tracker, tracking in self.linked(manga)
+        }
+
+    def fan_out(self, targets: Iterable[Tuple[int, int]], **fields) -> Future:
+        """Queue one edit on every target and gather the outcome per tracker entry
+
+        Each tracker's outbox sends through that tracker's own scheduler and
+        rate limit, so the edit takes as long as the slowest tracker rather
+        than the sum of all of them.
+        """
+        futures = []
+        for sync_id, media_id in sorted(set(targets)):
+            outbox = self.outboxes.get(sync_id)
+            if outbox is not None:
+                futures.append(((self.trackers[sync_id].name, media_id), outbox.update(media_id, **fields)))
+        return gather(futures)
+
+    def shutdown(self) -> None:
+        with self.lock:
+            outboxes = list(self.outboxes.values())
+            self.outboxes.clear()
+            self.trackers.clear()
+        for outbox in outboxes:
+            outbox.stop()
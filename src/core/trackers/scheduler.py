@@ -0,0 +1,199 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_WRITE = 1
+PRIORITY_BULK = 2
+PRIORITY_PREFETCH = 3
+
+# Share of the rate budget each class gets while all of them have work queued
+PRIORITY_WEIGHTS = {
+    PRIORITY_INTERACTIVE: 8,
+    PRIORITY_WRITE: 4,
+    PRIORITY_BULK: 1,
+    PRIORITY_PREFETCH: 1
+}
+
+# Requests per second and burst size for each tracker
+RATE_LIMITS = {
+    'mal': (2.0, 3)
+}
+DEFAULT_RATE_LIMIT = (1.0, 2)
+WORKER_COUNT = 4
+# How often a dispatcher waiting for a free worker checks for shutdown
+SLOT_POLL_INTERVAL = 0.5
+
+
+class RateLimiter:
+    """Token bucket shared by every request sent to one tracker"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may be sent"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RequestScheduler:
+    """Runs tracker requests by priority class under a single rate budget
+
+    Classes are served with stride scheduling, so interactive requests jump
+    ahead of queued bulk work while bulk work still gets a fair share. A
+    request leaves the queue only when a worker is free to run it, so
+    ordering, promotion and cancellation all happen in the stride queue
+    rather than in the executor's FIFO.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int = 1, workers: int = WORKER_COUNT):
+        self.name = name
+        self.limiter = RateLimiter(rate, burst)
+        self.queues = {priority: deque() for priority in PRIORITY_WEIGHTS}
+        self.passes = {priority: 0.0 for priority in PRIORITY_WEIGHTS}
+        self.virtual_time = 0.0
+        self.condition = threading.Condition()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'{name}-request')
+        self.slots = threading.Semaphore(workers)
+        self.running = True
+
+        self.dispatcher = threading.Thread(target=self._dispatch_loop, name=f'{name}-scheduler', daemon=True)
+        self.dispatcher.start()
+
+    def submit(self, fn: Callable, *args, priority: int = PRIORITY_BULK, **kwargs) -> Future:
+        """Queue a tracker call and return a future for its result"""
+        if priority not in self.queues:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        future = Future()
+        with self.condition:
+            if not self.running:
+                raise RuntimeError(f"Scheduler {self.name} has been shut down")
+            if not self.queues[priority]:
+                self.passes[priority] = max(self.passes[priority], self.virtual_time)
+            self.queues[priority].append((future, fn, args, kwargs))
+            self.condition.notify()
+        return future
+
+    def promote(self, future: Future, priority: int) -> bool:
+        """Move a queued request to a more urgent class"""
+        with self.condition:
+            for current, queue in self.queues.items():
+                if current <= priority:
+                    continue
+                for item in queue:
+                    if item[0] is future:
+                        queue.remove(item)
+                        if not self.queues[priority]:
+                            self.passes[priority] = max(self.passes[priority], self.virtual_time)
+                        self.queues[priority].append(item)
+                        self.condition.notify()
+                        return True
+        return False
+
+    def pending(self, priority: int = None) -> int:
+        """Number of queued requests, optionally for a single class"""
+        with self.condition:
+            if priority is not None:
+                return len(self.queues[priority])
+            return sum(len(queue) for queue in self.queues.values())
+
+    def shutdown(self, cancel_pending: bool = True) -> None:
+        """Stop dispatching and optionally cancel everything still queued"""
+        with self.condition:
+            self.running = False
+            if cancel_pending:
+                for queue in self.queues.values():
+                    while queue:
+                        queue.popleft()[0].cancel()
+            self.condition.notify_all()
+        self.dispatcher.join(timeout=1)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _has_work(self) -> bool:
+        return any(self.queues.values())
+
+    def _next_item(self):
+        """Pop the next live request, skipping cancelled ones"""
+        while self._has_work():
+            priority = min(
+                (p for p, queue in self.queues.items() if queue),
+                key=lambda p: (self.passes[p], p)
+            )
+            item = self.queues[priority].popleft()
+            if not item[0].set_running_or_notify_cancel():
+                continue
+
+            self.virtual_time = self.passes[priority]
+            self.passes[priority] += 1.0 / PRIORITY_WEIGHTS[priority]
+            return item
+        return None
+
+    def _dispatch_loop(self):
+        while True:
+            with self.condition:
+                while self.running and not self._has_work():
+                    self.condition.wait()
+                if not self.running:
+                    return
+
+            while not self.slots.acquire(timeout=SLOT_POLL_INTERVAL):
+                if not self.running:
+                    return
+            self.limiter.acquire()
+
+            with self.condition:
+                item = self._next_item()
+            if item:
+                self.executor.submit(self._run, *item)
+            else:
+                self.slots.release()
+
+    def _run(self, future, fn, args, kwargs):
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            self.slots.release()
+
+
+_schedulers: Dict[str, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(name: str) -> RequestScheduler:
+    """Get the process-wide scheduler for a tracker"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(name)
+        if scheduler is None:
+            rate, burst = RATE_LIMITS.get(name, DEFAULT_RATE_LIMIT)
+            scheduler = RequestScheduler(name, rate, burst)
+            _schedulers[name] = scheduler
+        return scheduler
+
+
+def shutdown_schedulers() -> None:
+    """Shut down every scheduler, cancelling queued requests"""
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+        _schedulers.clear()
+    for scheduler in schedulers:
+        scheduler.shutdown()
@@ -1,13 +1,24 @@
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import subprocess
+import threading
 import time
 import sys
 import os
 
+DEBOUNCE = 0.3
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WATCHED_SUFFIXES = ('.py', '.kv')
+IGNORED_DIRS = {'.git', '__pycache__', 'generated', '.mypy_cache', '.pytest_cache'}
+# Changes here are reloaded inside the running app, anything else restarts it
+HOT_RELOAD_DIRS = ('app/ui/components/', 'app/ui/kv/')
+
 class CodeChangeHandler(FileSystemEventHandler):
     def __init__(self):
         self.process = None
+        self.changed = set()
+        self.timer = None
+        self.lock = threading.Lock()
         self.restart_app()
 
     def restart_app(self):
@@ -15,17 +26,53 @@ class CodeChangeHandler(FileSystemEventHandler):
             self.process.terminate()
             self.process.wait()
 
-        self.process = subprocess.Popen([sys.executable, os.path.dirname(__file__) + "/main.py"])
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.join(BASE_DIR, "main.py")],
+            stdin=subprocess.PIPE,
+            text=True,
+            env={**os.environ, 'MIHON_DEV_RELOAD': '1'}
+        )
+
+    def is_watched(self, path):
+        relative = os.path.relpath(path, BASE_DIR).replace(os.sep, '/')
+        if relative.startswith('..') or not relative.endswith(WATCHED_SUFFIXES):
+            return False
+        return not IGNORED_DIRS.intersection(relative.split('/'))
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        paths = [p for p in (event.src_path, getattr(event, 'dest_path', '')) if p and self.is_watched(p)]
+        if not paths:
+            return
 
-    def on_modified(self, event):
-        if event.src_path.endswith('.py'):
-            print(f"Detected change in {event.src_path}")
-            self.restart_app()
+        with self.lock:
+            self.changed.update(os.path.relpath(p, BASE_DIR).replace(os.sep, '/') for p in paths)
+            if self.timer:
+                self.timer.cancel()
+            self.timer = threading.Timer(DEBOUNCE, self.apply_changes)
+            self.timer.start()
+
+    def apply_changes(self):
+        with self.lock:
+            changed, self.changed = self.changed, set()
+            self.timer = None
+        print(f"Detected change in {', '.join(sorted(changed))}")
+
+        hot = all(path.startswith(HOT_RELOAD_DIRS) for path in changed)
+        if hot and self.process.poll() is None:
+            try:
+                self.process.stdin.write('reload\n')
+                self.process.stdin.flush()
+                return
+            except (BrokenPipeError, OSError):
+                pass
+        self.restart_app()
 
 if __name__ == "__main__":
     event_handler = CodeChangeHandler()
     observer = Observer()
-    observer.schedule(event_handler, path='.', recursive=True)
+    observer.schedule(event_handler, path=BASE_DIR, recursive=True)
     observer.start()
 
     try:
@@ -35,4 +82,4 @@ if __name__ == "__main__":
         observer.stop()
         if event_handler.process:
             event_handler.process.terminate()
-    observer.join()
\ No newline at end of file
+    observer.join()
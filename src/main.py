@@ -1,12 +1,29 @@
+import os
 from kivy.app import App
 from kivy.core.window import Window
 from app.ui.components.tracker_importer import TrackerImporter
+from app.ui.tasks import shutdown_runtime
+from app.ui.diagnostics import Diagnostics
+from core.trackers.scheduler import shutdown_schedulers
 
 class MihonTrackerApp(App):
     def build(self):
         Window.size = (1000, 600)
+        self.diagnostics = Diagnostics()
         return TrackerImporter()
 
+    def on_start(self):
+        self.diagnostics.start()
+        if os.getenv('MIHON_DEV_RELOAD'):
+            from app.ui.dev_reload import listen_for_reloads
+            listen_for_reloads()
+
+    def on_stop(self):
+        self.diagnostics.stop()
+        self.root.shutdown()
+        shutdown_runtime()
+        shutdown_schedulers()
+
 def main():
     MihonTrackerApp().run()
 